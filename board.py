@@ -9,34 +9,153 @@ import random
 import constants as c
 import layouts
 from tile import Tile
+from topology import LayoutTopology, mask_to_present, present_to_mask, zobrist_key
+from deal_db import FACES, FACE_IDS
+
+# Topologies of the named layouts, shared by every board (they never change)
+_LAYOUT_TOPOLOGIES = {}
+
+class BoardSnapshot:
+    """
+    Immutable, compact copy of a board's state.
+    
+    The face tuple and position list are shared with the board: the board
+    replaces them on a shuffle or a load but never modifies them, so a
+    snapshot costs O(1) and consecutive snapshots share their faces.
+    
+    Attributes:
+        mask (int): Bit i is set while position i holds a tile.
+        faces (tuple): (suit, value) of every position.
+        positions (list): (x, y, z) of every position.
+        layout_mode (str): Layout of the board.
+        difficulty (str): Difficulty of the board.
+        seed (int): Board seed.
+        shuffle_count (int): Shuffles done when the snapshot was taken.
+        state_key (int): Zobrist hash of the state (see Board.state_key).
+        solution (list | None): Known winning line for these faces, if any.
+    """
+    
+    __slots__ = ("mask", "faces", "positions", "layout_mode", "difficulty",
+                 "seed", "shuffle_count", "state_key", "solution")
+    
+    def __init__(self, mask, faces, positions, layout_mode, difficulty,
+                 seed, shuffle_count, state_key, solution):
+        self.mask = mask
+        self.faces = faces
+        self.positions = positions
+        self.layout_mode = layout_mode
+        self.difficulty = difficulty
+        self.seed = seed
+        self.shuffle_count = shuffle_count
+        self.state_key = state_key
+        self.solution = solution
+    
+    def is_visible(self, i):
+        """Returns True if position i holds a tile."""
+        return bool(self.mask >> i & 1)
+    
+    def present(self):
+        """Returns a bytearray with 1 for every position that holds a tile."""
+        return mask_to_present(self.mask, len(self.faces))
+    
+    def __getstate__(self):
+        # Faces travel as one byte each when they are all standard faces
+        faces = self.faces
+        if all(face in FACE_IDS for face in faces):
+            faces = bytes(FACE_IDS[face] for face in faces)
+        return (self.mask, faces, self.positions, self.layout_mode, self.difficulty,
+                self.seed, self.shuffle_count, self.state_key, self.solution)
+    
+    def __setstate__(self, state):
+        (self.mask, faces, self.positions, self.layout_mode, self.difficulty,
+         self.seed, self.shuffle_count, self.state_key, self.solution) = state
+        self.faces = tuple(FACES[f] for f in faces) if isinstance(faces, bytes) else faces
+
 
 class Board:
     """
     Represents the Mahjong board state.
     Handles the deck generation, layout assignment, and move validation.
+    
+    Attributes:
+        state_key (int): 64-bit Zobrist hash of the tiles still on the board
+            and their faces, kept up to date by remove_tiles, restore_tiles
+            and the shuffles.
+        visible_mask (int): Bit i is set while tiles[i] is on the board.
+        faces (tuple): (suit, value) of every tile. Replaced, never modified,
+            when the faces change, so snapshots can share it.
     """
+    
+    # When True, every state_key update is checked against a full
+    # recomputation and against previously seen states (for tests)
+    check_state_keys = False
 
-    def __init__(self, layout_mode, difficulty):
+    def __init__(self, layout_mode, difficulty, positions=None, seed=None, solvable=False, faces=None):
         """
         Initializes the board with a specific layout and difficulty.
         
         Args:
             layout_mode (str): The shape of the map (TURTLE, BUTTERFLY, COLOSSEUM).
             difficulty (str): The complexity of the deck (EASY, MEDIUM, HARD).
+            positions (list | None): Explicit (x, y, z) coordinates, e.g. from
+                layouts.generate_pyramid_layout. Overrides layout_mode when given.
+            seed (int | None): Seed for the deal and every later shuffle.
+                A random one is drawn when None. Same seed, same board.
+            solvable (bool): If True, faces are dealt by reverse construction
+                so the board is guaranteed to be winnable.
+            faces (list | None): Explicit (suit, value) for every position,
+                e.g. from a deal database record. Skips dealing entirely.
         """
         self.tiles = []
+        self.layout_mode = layout_mode
+        self.difficulty = difficulty
+        self.reset_stats()
+        
+        # --- 0. RANDOMNESS ---
+        # Each board owns its generator so deals and reshuffles can be
+        # reproduced from the seed alone (saves, benchmarks, bug reports).
+        self.seed = seed if seed is not None else random.randrange(2 ** 32)
+        self.rng = random.Random(self.seed)
+        self.shuffle_count = 0
         
         # --- 1. LOAD LAYOUT POSITIONS ---
-        if layout_mode == "BUTTERFLY":
-            self.positions = layouts.get_butterfly_layout()
-        elif layout_mode == "COLOSSEUM":
-            self.positions = layouts.get_colosseum_layout()
+        if positions is not None:
+            self.positions = list(positions)
         else:
-            self.positions = layouts.get_turtle_layout()
+            self.positions = layouts.get_layout(layout_mode)
+        self._topology = _LAYOUT_TOPOLOGIES.get(layout_mode) if positions is None else None
+        self.solution = None
             
         # --- 2. GENERATE DECK & ASSIGN POSITIONS ---
-        self._generate_custom_deck(len(self.positions), difficulty)
+        if faces is not None:
+            self.tiles = [Tile(suit, value, i) for i, (suit, value) in enumerate(faces)]
+        else:
+            self._generate_custom_deck(len(self.positions), difficulty)
+            if solvable: self._deal_solvable()
         self._assign_positions()
+        self._reset_tracking()
+
+    @staticmethod
+    def from_deal_record(record):
+        """
+        Builds a board from a deal database record.
+
+        Args:
+            record (deal_db.DealRecord): Layout, difficulty, seed and faces.
+
+        Returns:
+            Board: The dealt board. Later shuffles follow the record's seed.
+        """
+        return Board(record.layout, record.difficulty, seed=record.seed, faces=record.faces())
+
+    @property
+    def topology(self):
+        """The LayoutTopology of this board's positions, built on first use."""
+        if self._topology is None:
+            self._topology = LayoutTopology(self.positions)
+            if self.positions == layouts.get_layout(self.layout_mode):
+                _LAYOUT_TOPOLOGIES[self.layout_mode] = self._topology
+        return self._topology
 
     def _generate_custom_deck(self, total_needed, difficulty):
         """
@@ -86,16 +205,44 @@ class Board:
         current_deck = []
         
         while len(current_deck) < total_needed:
-            stype = random.choice(available_types)
+            stype = self.rng.choice(available_types)
             # Add pairs to ensure solvability
             for _ in range(2):
                 if len(current_deck) < total_needed:
                     current_deck.append(Tile(stype[0], stype[1], tile_id))
                     tile_id += 1
         
-        random.shuffle(current_deck)
+        self.rng.shuffle(current_deck)
         self.tiles = current_deck
 
+    def _deal_solvable(self):
+        """
+        Redistributes the dealt faces so that the board can be cleared.
+        
+        The deck already comes in matching pairs; each pair is put on two
+        positions from a reverse-construction pairing, whose order is kept
+        in self.solution. The random deal is kept if no pairing is found.
+        """
+        order = self.topology.solvable_pairing(self.rng)
+        if order is None: return
+        
+        # Regroup the shuffled deck into identical pairs
+        groups = {}
+        for t in self.tiles:
+            groups.setdefault((t.suit, t.value), []).append(t)
+        pairs = []
+        for group in groups.values():
+            for k in range(0, len(group) - 1, 2):
+                pairs.append((group[k], group[k + 1]))
+        self.rng.shuffle(pairs)
+        
+        tiles = [None] * len(self.positions)
+        for (i, j), (a, b) in zip(order, pairs):
+            tiles[i] = Tile(a.suit, a.value, i)
+            tiles[j] = Tile(b.suit, b.value, j)
+        self.tiles = tiles
+        self.solution = order
+
     def _assign_positions(self):
         """Maps the logical 3D coordinates to the tile objects."""
         limit = min(len(self.tiles), len(self.positions))
@@ -110,6 +257,9 @@ class Board:
         Determines if a tile is 'free' to be selected.
         Rule: A tile is free if no tile is on top AND (left is free OR right is free).
         """
+        self.can_move_calls += 1
+        self.tiles_scanned += len(self.tiles)
+        
         left, right = tile.x, tile.x + c.TILE_WIDTH
         top, bottom = tile.y, tile.y + c.TILE_HEIGHT
         layer = tile.z
@@ -147,6 +297,8 @@ class Board:
         Checks if two tiles are a valid match according to game rules.
         Includes special wildcard logic for Jacks and Kings.
         """
+        self.match_checks += 1
+        
         # Special Bonus Rules (Wildcards)
         if t1.suit == c.TYPE_JACK and t2.suit == c.TYPE_JACK: return True
         if t1.suit == c.TYPE_KING and t2.suit == c.TYPE_KING: return True
@@ -158,6 +310,7 @@ class Board:
         
     def has_valid_moves(self):
         """Checks if there is at least one valid pair available to play."""
+        self.valid_move_checks += 1
         visible_tiles = [t for t in self.tiles if t.is_visible and self.can_move(t)]
         
         for i in range(len(visible_tiles)):
@@ -168,6 +321,7 @@ class Board:
 
     def get_hint_pair(self):
         """Finds and returns a valid matching pair for the hint system."""
+        self.hint_searches += 1
         visible_tiles = [t for t in self.tiles if t.is_visible and self.can_move(t)]
         
         for i in range(len(visible_tiles)):
@@ -178,13 +332,295 @@ class Board:
 
     def shuffle_remaining(self):
         """Rearranges the suits and values of the visible tiles, keeping positions."""
+        self.shuffles += 1
         vis = [t for t in self.tiles if t.is_visible]
         content = [(t.suit, t.value) for t in vis]
-        random.shuffle(content)
+        self._shuffle_rng().shuffle(content)
         
+        self._toggle_keys(vis)
         for i, t in enumerate(vis):
             t.suit, t.value = content[i]
             t.is_selected = False
+        self._toggle_keys(vis)
+        # A solution line of the old faces would no longer be made of pairs
+        self.solution = None
+        self._faces_changed()
+
+    def shuffle_solvable(self):
+        """
+        Redeals the remaining faces so that the position can be cleared.
+        
+        Uses the same reverse construction as a solvable deal, restricted to
+        the tiles still on the board, so a single pass replaces repeated
+        shuffle-and-check. Faces are paired within their match class (any
+        two Jacks, any two Kings, otherwise identical faces), so every
+        constructed pair really is a match.
+        
+        Returns:
+            bool: False if the remaining positions cannot be cleared in any
+            order. The faces are left untouched in that case, but the
+            shuffle number still advances, so the next shuffle draws from a
+            fresh generator just as after a successful one.
+        """
+        self.shuffles += 1
+        rng = self._shuffle_rng()
+        remaining = [i for i, t in enumerate(self.tiles) if t.is_visible]
+        order = self.topology.solvable_pairing(rng, subset=remaining)
+        if order is None: return False
+        
+        classes = {}
+        faces = [(self.tiles[i].suit, self.tiles[i].value) for i in remaining]
+        rng.shuffle(faces)
+        for suit, value in faces:
+            key = suit if suit in (c.TYPE_JACK, c.TYPE_KING) else (suit, value)
+            classes.setdefault(key, []).append((suit, value))
+        pairs = []
+        for group in classes.values():
+            if len(group) % 2: return False
+            for k in range(0, len(group), 2):
+                pairs.append((group[k], group[k + 1]))
+        rng.shuffle(pairs)
+        
+        vis = [self.tiles[i] for i in remaining]
+        self._toggle_keys(vis)
+        for (i, j), (face_a, face_b) in zip(order, pairs):
+            self.tiles[i].suit, self.tiles[i].value = face_a
+            self.tiles[j].suit, self.tiles[j].value = face_b
+        for t in vis:
+            t.is_selected = False
+        self._toggle_keys(vis)
+        self.solution = order
+        self._faces_changed()
+        return True
+
+    def _shuffle_rng(self):
+        """
+        Returns the generator for the next shuffle.
+        
+        Every shuffle gets its own generator derived from the board seed and
+        the shuffle number, so the sequence stays reproducible after a
+        save/load round trip without storing generator state.
+        """
+        rng = random.Random(f"{self.seed}:shuffle:{self.shuffle_count}")
+        self.shuffle_count += 1
+        return rng
+
+    def shuffle_until_playable(self, max_attempts=100):
+        """
+        Shuffles the remaining tiles until at least one valid pair is free.
+        
+        Args:
+            max_attempts (int): Maximum number of shuffles to try.
+            
+        Returns:
+            bool: True if the final arrangement has a valid move.
+        """
+        for attempt in range(max_attempts):
+            if attempt: self.shuffle_retries += 1
+            self.shuffle_remaining()
+            if self.has_valid_moves(): return True
+        return False
+
+    # --- TILE REMOVAL & STATE KEY ---
+
+    def remove_tiles(self, *tiles):
+        """
+        Takes tiles off the board (a match), updating state_key in O(1) per tile.
+        
+        Args:
+            *tiles (Tile): Tiles of this board.
+        """
+        for t in tiles:
+            if t.is_visible:
+                t.is_visible = False
+                self._toggle_tile(t)
+        self._check_state_key()
+
+    def restore_tiles(self, *tiles):
+        """
+        Puts removed tiles back (undo), updating state_key in O(1) per tile.
+        
+        Args:
+            *tiles (Tile): Tiles of this board.
+        """
+        for t in tiles:
+            if not t.is_visible:
+                t.is_visible = True
+                self._toggle_tile(t)
+        self._check_state_key()
+
+    def move_faces(self, targets, sources):
+        """
+        Moves faces between positions, e.g. to undo or redo a shuffle.
+
+        tiles[targets[k]] receives the face tiles[sources[k]] had before the
+        call, so swapping the two arguments reverts the move.
+
+        Args:
+            targets (sequence): Position indices whose face is replaced.
+            sources (sequence): Position indices the faces are taken from.
+
+        Returns:
+            list: The tiles whose face changed.
+        """
+        before = self.faces
+        changed = [self.tiles[i] for i in targets]
+        self._toggle_keys(changed)
+        for i, j in zip(targets, sources):
+            t = self.tiles[i]
+            t.suit, t.value = before[j]
+            t.is_selected = False
+        self._toggle_keys(changed)
+        self.solution = None
+        self._faces_changed()
+        return changed
+
+    def _toggle_tile(self, tile):
+        """Flips a tile's bit in visible_mask and its key in state_key."""
+        i = self.index_of[tile.id]
+        self.visible_mask ^= 1 << i
+        self.state_key ^= zobrist_key(i, tile.suit, tile.value)
+
+    def _tile_key(self, tile):
+        return zobrist_key(self.index_of[tile.id], tile.suit, tile.value)
+
+    def _toggle_keys(self, tiles):
+        """XORs the keys of tiles in or out (around a face change)."""
+        for t in tiles:
+            self.state_key ^= self._tile_key(t)
+
+    def canonical_key(self):
+        """
+        Returns the state key shared with every mirror image of this state.
+        
+        Equal for positions that are the same game up to the layout's
+        symmetries (see LayoutTopology.automorphisms). O(n) per call.
+        """
+        return self.topology.canonical_key(
+            [(t.suit, t.value) if t.is_visible else None for t in self.tiles])
+
+    def compute_state_key(self):
+        """Recomputes the Zobrist hash from scratch (O(n))."""
+        key = 0
+        for i, t in enumerate(self.tiles):
+            if t.is_visible: key ^= zobrist_key(i, t.suit, t.value)
+        return key
+
+    def _reset_tracking(self):
+        """Indexes the tiles by id and recomputes faces, visible_mask and state_key."""
+        self.index_of = {t.id: i for i, t in enumerate(self.tiles)}
+        self.faces = tuple((t.suit, t.value) for t in self.tiles)
+        self.visible_mask = present_to_mask(bytearray(t.is_visible for t in self.tiles))
+        self.state_key = self.compute_state_key()
+        self._seen_states = {}
+        self._check_state_key()
+
+    def _faces_changed(self):
+        """Publishes a new face tuple after a shuffle (snapshots keep the old one)."""
+        self.faces = tuple((t.suit, t.value) for t in self.tiles)
+        self._check_state_key()
+
+    def _check_state_key(self):
+        """In check mode, verifies state_key and looks for hash collisions."""
+        if not self.check_state_keys: return
+        if self.state_key != self.compute_state_key():
+            raise AssertionError("state_key out of sync with the board")
+        if self.faces != tuple((t.suit, t.value) for t in self.tiles):
+            raise AssertionError("faces out of sync with the board")
+        if self.visible_mask != sum(1 << i for i, t in enumerate(self.tiles) if t.is_visible):
+            raise AssertionError("visible_mask out of sync with the board")
+        state = frozenset((i, t.suit, t.value) for i, t in enumerate(self.tiles) if t.is_visible)
+        seen = self._seen_states.setdefault(self.state_key, state)
+        if seen != state:
+            raise AssertionError(f"Zobrist collision on key {self.state_key:#018x}")
+
+    # --- SNAPSHOTS ---
+
+    def snapshot(self):
+        """
+        Captures the current state in O(1).
+        
+        Returns:
+            BoardSnapshot: An immutable copy, cheap to keep (undo, replays)
+            and to pickle (background workers, process pools).
+        """
+        return BoardSnapshot(self.visible_mask, self.faces, self.positions, self.layout_mode,
+                             self.difficulty, self.seed, self.shuffle_count, self.state_key,
+                             self.solution)
+
+    def restore(self, snapshot):
+        """
+        Returns the board to a snapshot taken from it.
+        
+        Only tiles whose visibility differs are touched, plus every face if
+        a shuffle happened in between, so undoing a match is O(k).
+        
+        Args:
+            snapshot (BoardSnapshot): A snapshot of this board.
+            
+        Returns:
+            list: The tiles that changed (for the renderer).
+            
+        Raises:
+            ValueError: If the snapshot comes from a board of another size.
+        """
+        if len(snapshot.faces) != len(self.tiles):
+            raise ValueError("snapshot does not belong to this board")
+        changed = []
+        if snapshot.faces is not self.faces:
+            for t, (suit, value) in zip(self.tiles, snapshot.faces):
+                if t.suit != suit or t.value != value:
+                    t.suit, t.value = suit, value
+                    changed.append(t)
+            self.faces = snapshot.faces
+            self.shuffle_count = snapshot.shuffle_count
+            self.solution = snapshot.solution
+        
+        diff = self.visible_mask ^ snapshot.mask
+        while diff:
+            low = diff & -diff
+            diff ^= low
+            t = self.tiles[low.bit_length() - 1]
+            t.is_visible = not t.is_visible
+            t.is_selected = False
+            changed.append(t)
+        self.visible_mask = snapshot.mask
+        self.state_key = snapshot.state_key
+        self._check_state_key()
+        return changed
+
+    # --- INSTRUMENTATION ---
+
+    def reset_stats(self):
+        """Sets every work counter back to zero."""
+        self.can_move_calls = 0
+        self.tiles_scanned = 0
+        self.match_checks = 0
+        self.valid_move_checks = 0
+        self.hint_searches = 0
+        self.shuffles = 0
+        self.shuffle_retries = 0
+
+    def stats(self):
+        """
+        Returns a snapshot of the work counters.
+        
+        The counters are plain integers bumped on the hot paths, so they are
+        always on. Diff two snapshots (or reset in between) to measure what
+        a single user action costs.
+        
+        Returns:
+            dict: Counter name to value.
+        """
+        return {
+            "can_move_calls": self.can_move_calls,
+            "tiles_scanned": self.tiles_scanned,
+            "match_checks": self.match_checks,
+            "valid_move_checks": self.valid_move_checks,
+            "hint_searches": self.hint_searches,
+            "shuffles": self.shuffles,
+            "shuffle_retries": self.shuffle_retries,
+        }
 
     # --- PERSISTENCE ---
 
@@ -196,4 +632,10 @@ class Board:
         """Restores the board state from saved data."""
         self.tiles = []
         for t_data in tiles_data:
-            self.tiles.append(Tile.from_dict(t_data))
\ No newline at end of file
+            self.tiles.append(Tile.from_dict(t_data))
+        
+        # Keep tiles[i] on positions[i], whatever layout the save came from
+        self.positions = [(t.x, t.y, t.z) for t in self.tiles]
+        self._topology = None
+        self.solution = None
+        self._reset_tracking()
\ No newline at end of file
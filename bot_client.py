@@ -0,0 +1,159 @@
+"""
+Bot Client Module.
+
+This module is a load generator for bot_server.py. It opens a pool of
+connections, gives each one a share of the sessions, and plays random
+legal moves on all of them at once: every round sends one request per
+session in a single batch and waits for the batch of responses. When a
+game is won or stuck, the session is closed and a new game is dealt.
+
+At the end it reports requests and moves per second and the latency of
+a batch round trip:
+    python bot_client.py --connections 4 --sessions 256 --seconds 10
+"""
+
+import asyncio
+import random
+import time
+from frame_profiler import percentile
+
+
+class BotConnection:
+    """One pooled connection and the sessions it drives."""
+
+    def __init__(self, reader, writer):
+        self.reader = reader
+        self.writer = writer
+
+    async def batch(self, requests):
+        """
+        Sends several requests in one write and reads their responses.
+
+        Args:
+            requests (list): Request lines, without newlines.
+
+        Returns:
+            list: Response lines, in request order.
+        """
+        self.writer.write(("\n".join(requests) + "\n").encode("ascii"))
+        await self.writer.drain()
+        responses = []
+        for _ in requests:
+            responses.append((await self.reader.readline()).decode("ascii").rstrip("\n"))
+        return responses
+
+    def close(self):
+        self.writer.close()
+
+
+async def connect_pool(size, host, port, unix_path=None):
+    """Opens 'size' connections to the server."""
+    pool = []
+    for _ in range(size):
+        if unix_path: reader, writer = await asyncio.open_unix_connection(unix_path)
+        else: reader, writer = await asyncio.open_connection(host, port)
+        pool.append(BotConnection(reader, writer))
+    return pool
+
+
+def pick_pair(free_line, rng):
+    """
+    Chooses a random matching pair from a free-tiles response.
+
+    Returns:
+        tuple | None: (i, j) positions, or None if no free tiles match.
+    """
+    by_class = {}
+    for item in free_line.split()[1:]:
+        i, k = item.split(":")
+        by_class.setdefault(k, []).append(i)
+    groups = [g for g in by_class.values() if len(g) > 1]
+    if not groups: return None
+    return tuple(rng.sample(rng.choice(groups), 2))
+
+
+async def drive(conn, sessions, layout, difficulty, deadline, rng, stats):
+    """Plays 'sessions' games over one connection until the deadline."""
+    ids = [int(r.split()[1]) for r in await conn.batch(
+        [f"new-game {layout} {difficulty} {rng.randrange(2 ** 32)}" for _ in range(sessions)])]
+    stats["games"] += sessions
+
+    while time.perf_counter() < deadline:
+        # Round 1: free tiles of every session
+        started = time.perf_counter()
+        free = await conn.batch([f"free-tiles {sid}" for sid in ids])
+        stats["latency"].append(time.perf_counter() - started)
+
+        # Round 2: one move per session, or a new deal when it is over
+        moves, replaced = [], []
+        for k, (sid, line) in enumerate(zip(ids, free)):
+            pair = pick_pair(line, rng)
+            if pair:
+                moves.append(f"play-pair {sid} {pair[0]} {pair[1]}")
+            else:
+                replaced.append(k)
+                moves.append(f"close {sid}")
+                moves.append(f"new-game {layout} {difficulty} {rng.randrange(2 ** 32)}")
+        started = time.perf_counter()
+        responses = await conn.batch(moves)
+        stats["latency"].append(time.perf_counter() - started)
+        stats["requests"] += len(ids) + len(moves)
+        stats["moves"] += len(moves) - 2 * len(replaced)
+        stats["games"] += len(replaced)
+
+        new_ids = iter(int(r.split()[1]) for r in responses if r.startswith("OK ") and len(r.split()) == 3)
+        for k in replaced: ids[k] = next(new_ids)
+
+    await conn.batch([f"close {sid}" for sid in ids])
+
+
+async def run_load(host, port, unix_path, connections, sessions, seconds, layout, difficulty, seed):
+    """
+    Runs the load and returns the measurements.
+
+    Returns:
+        dict: requests, moves and games counts, elapsed seconds and the
+        round-trip latencies (seconds) of every batch.
+    """
+    pool = await connect_pool(connections, host, port, unix_path)
+    rng = random.Random(seed)
+    stats = {"requests": 0, "moves": 0, "games": 0, "latency": []}
+    started = time.perf_counter()
+    deadline = started + seconds
+    share = [sessions // connections + (k < sessions % connections) for k in range(connections)]
+    await asyncio.gather(*(drive(conn, n, layout, difficulty, deadline, random.Random(rng.random()), stats)
+                           for conn, n in zip(pool, share) if n))
+    stats["elapsed"] = time.perf_counter() - started
+    for conn in pool: conn.close()
+    return stats
+
+
+def main():
+    """Command-line entry point of the load generator."""
+    import argparse
+
+    parser = argparse.ArgumentParser(description="Load generator for bot_server.py")
+    parser.add_argument("--host", default="127.0.0.1", help="server address")
+    parser.add_argument("--port", type=int, default=7777, help="server port")
+    parser.add_argument("--unix", metavar="PATH", help="connect to a Unix socket instead")
+    parser.add_argument("--connections", type=int, default=4, help="pooled connections")
+    parser.add_argument("--sessions", type=int, default=256, help="concurrent games")
+    parser.add_argument("--seconds", type=float, default=10.0, help="duration of the run")
+    parser.add_argument("--layout", default="TURTLE", help="layout of the games")
+    parser.add_argument("--difficulty", default="MEDIUM", help="difficulty of the games")
+    parser.add_argument("--seed", type=int, default=0, help="seed of the random policy")
+    args = parser.parse_args()
+
+    stats = asyncio.run(run_load(args.host, args.port, args.unix, args.connections, args.sessions,
+                                 args.seconds, args.layout, args.difficulty, args.seed))
+    elapsed = stats["elapsed"]
+    latency = sorted(stats["latency"])
+    print(f"{stats['requests']} requests, {stats['moves']} moves, {stats['games']} games "
+          f"in {elapsed:.1f}s")
+    print(f"{stats['requests'] / elapsed:.0f} requests/s, {stats['moves'] / elapsed:.0f} moves/s")
+    print("batch round trip (ms): " + ", ".join(
+        f"p{q} {percentile(latency, q) * 1000:.2f}" for q in (50, 95, 99)))
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,260 @@
+"""
+Bot Server Module.
+
+This module hosts many independent headless games in one process, so AI
+policies can be benchmarked against the ruleset without any window. It
+speaks a line protocol over localhost TCP or a Unix socket (asyncio).
+
+Requests, one per line:
+    new-game <layout> <difficulty> [seed]  ->  OK <session> <tiles>
+    free-tiles <session>                   ->  OK <i>:<class> <j>:<class> ...
+    play-pair <session> <i> <j>            ->  OK <tiles left>
+    undo <session>                         ->  OK <tiles left>
+    state-hash <session>                   ->  OK <64-bit hex Zobrist key>
+    close <session>                        ->  OK
+Failures answer "ERR <reason>"; a line longer than MAX_LINE bytes closes
+the connection. Positions are board indices; two free
+tiles match when their class numbers are equal (Jacks and Kings included).
+
+Responses come back in request order. A client should send a batch of
+requests before reading their responses: the server answers everything
+that arrived in one read with a single write. Sessions are global, so
+every connection of a client's pool can drive any of its sessions.
+
+Run it as a script:
+    python bot_server.py --port 7777
+    python bot_server.py --unix /tmp/mahjong.sock
+"""
+
+import asyncio
+import os
+import constants as c
+from board import Board
+from deal_db import FACE_IDS, LAYOUT_IDS, DIFFICULTY_IDS
+from move_log import MoveLog
+
+READ_SIZE = 1 << 16
+# Longest request line accepted; a client that exceeds it is disconnected
+MAX_LINE = 4096
+
+
+def match_id(suit, value):
+    """Returns the class number shared by exactly the faces that match each other."""
+    if suit in (c.TYPE_JACK, c.TYPE_KING): return FACE_IDS[(suit, "Coins")]
+    return FACE_IDS[(suit, value)]
+
+
+class BotSession:
+    """
+    One headless game: a board, its free tiles and an undo log.
+
+    The set of free positions is updated from the neighbour lists of the
+    two tiles of each move, so listing it never scans the board.
+
+    Attributes:
+        board (Board): The game.
+        present (bytearray): 1 for every position still holding a tile.
+        free (set): Free positions.
+        left (int): Tiles still on the board.
+    """
+
+    def __init__(self, board):
+        self.board = board
+        self.top = board.topology
+        self.klass = [match_id(t.suit, t.value) for t in board.tiles]
+        self.present = bytearray(t.is_visible for t in board.tiles)
+        self.free = {i for i, p in enumerate(self.present) if p and self.top.is_free(i, self.present)}
+        self.left = sum(self.present)
+        self.log = MoveLog(max_entries=len(board.tiles))
+
+    def free_tiles(self):
+        """Returns 'i:class' for every free position, in index order."""
+        klass = self.klass
+        return " ".join(f"{i}:{klass[i]}" for i in sorted(self.free))
+
+    def play_pair(self, i, j):
+        """
+        Removes a matching pair of free tiles.
+
+        Returns:
+            str | None: Why the move is illegal, or None once it is played.
+        """
+        if i == j or i not in self.free or j not in self.free: return "tile not free"
+        if self.klass[i] != self.klass[j]: return "tiles do not match"
+        tiles = self.board.tiles
+        self.board.remove_tiles(tiles[i], tiles[j])
+        self.log.record_pair(i, j, 0)
+        self._set(i, 0)
+        self._set(j, 0)
+        self.left -= 2
+        return None
+
+    def undo(self):
+        """Puts the last pair back. Returns False if nothing was played."""
+        step = self.log.undo(self.board)
+        if step is None: return False
+        _, _, tiles = step
+        index_of = self.board.index_of
+        for t in reversed(tiles):
+            self._set(index_of[t.id], 1)
+        self.left += 2
+        return True
+
+    def _set(self, i, value):
+        """Adds or removes position i and refreshes the tiles it can block."""
+        top, present, free = self.top, self.present, self.free
+        present[i] = value
+        if value and top.is_free(i, present): free.add(i)
+        else: free.discard(i)
+        for k in top.below[i] + top.left[i] + top.right[i]:
+            if present[k] and top.is_free(k, present): free.add(k)
+            else: free.discard(k)
+
+
+class BotServer:
+    """
+    Command dispatcher and asyncio front end.
+
+    Attributes:
+        sessions (dict): Session number -> BotSession.
+        max_sessions (int): Open sessions allowed at once.
+        requests (int): Requests answered since start.
+    """
+
+    def __init__(self, max_sessions=100000):
+        self.sessions = {}
+        self.max_sessions = max_sessions
+        self.next_id = 1
+        self.requests = 0
+        self.commands = {
+            "new-game": self._new_game,
+            "free-tiles": self._free_tiles,
+            "play-pair": self._play_pair,
+            "undo": self._undo,
+            "state-hash": self._state_hash,
+            "close": self._close,
+        }
+
+    # --- COMMANDS ---
+
+    def handle_line(self, line):
+        """
+        Answers one request line.
+
+        Args:
+            line (str): The request, without its newline.
+
+        Returns:
+            str: The response, without its newline.
+        """
+        self.requests += 1
+        parts = line.split()
+        if not parts: return "ERR empty request"
+        command = self.commands.get(parts[0])
+        if command is None: return f"ERR unknown command {parts[0]}"
+        try:
+            return command(parts[1:])
+        except (ValueError, IndexError):
+            return f"ERR bad arguments for {parts[0]}"
+        except KeyError:
+            return "ERR unknown session"
+
+    def _session(self, args):
+        return self.sessions[int(args[0])]
+
+    def _new_game(self, args):
+        layout, difficulty = args[0].upper(), args[1].upper()
+        if layout not in LAYOUT_IDS or difficulty not in DIFFICULTY_IDS:
+            return "ERR unknown layout or difficulty"
+        if len(self.sessions) >= self.max_sessions: return "ERR too many sessions"
+        seed = int(args[2]) if len(args) > 2 else None
+        board = Board(layout, difficulty, seed=seed, solvable=True)
+        sid = self.next_id
+        self.next_id += 1
+        self.sessions[sid] = BotSession(board)
+        return f"OK {sid} {len(board.tiles)}"
+
+    def _free_tiles(self, args):
+        return "OK " + self._session(args).free_tiles()
+
+    def _play_pair(self, args):
+        session = self._session(args)
+        error = session.play_pair(int(args[1]), int(args[2]))
+        if error: return f"ERR {error}"
+        return f"OK {session.left}"
+
+    def _undo(self, args):
+        session = self._session(args)
+        if not session.undo(): return "ERR nothing to undo"
+        return f"OK {session.left}"
+
+    def _state_hash(self, args):
+        return f"OK {self._session(args).board.state_key:016x}"
+
+    def _close(self, args):
+        del self.sessions[int(args[0])]
+        return "OK"
+
+    # --- NETWORK ---
+
+    async def handle_client(self, reader, writer):
+        """Serves one connection: every batch of lines read gets one write."""
+        pending = b""
+        try:
+            while True:
+                data = await reader.read(READ_SIZE)
+                if not data: break
+                lines = (pending + data).split(b"\n")
+                pending = lines.pop()
+                out = [self.handle_line(line.decode("ascii", "replace")) for line in lines]
+                if len(pending) > MAX_LINE: out.append("ERR request too long")
+                if not out: continue
+                out.append("")
+                # Requests may echo back bytes that were not ASCII
+                writer.write("\n".join(out).encode("ascii", "replace"))
+                await writer.drain()
+                if len(pending) > MAX_LINE: break
+        except ConnectionError:
+            pass
+        finally:
+            writer.close()
+
+    async def serve(self, host="127.0.0.1", port=7777, unix_path=None):
+        """
+        Accepts connections until cancelled.
+
+        Args:
+            host (str): TCP interface (localhost only by default).
+            port (int): TCP port.
+            unix_path (str | None): Listen on this Unix socket instead of TCP.
+        """
+        if unix_path:
+            if os.path.exists(unix_path): os.remove(unix_path)
+            server = await asyncio.start_unix_server(self.handle_client, unix_path)
+        else:
+            server = await asyncio.start_server(self.handle_client, host, port)
+        async with server:
+            await server.serve_forever()
+
+
+def main():
+    """Command-line entry point of the server."""
+    import argparse
+
+    parser = argparse.ArgumentParser(description="Headless Mahjong sessions for bots")
+    parser.add_argument("--host", default="127.0.0.1", help="TCP interface")
+    parser.add_argument("--port", type=int, default=7777, help="TCP port")
+    parser.add_argument("--unix", metavar="PATH", help="serve on a Unix socket instead of TCP")
+    parser.add_argument("--max-sessions", type=int, default=100000, help="open sessions allowed")
+    args = parser.parse_args()
+
+    where = args.unix or f"{args.host}:{args.port}"
+    print(f"Bot server listening on {where}")
+    try:
+        asyncio.run(BotServer(args.max_sessions).serve(args.host, args.port, args.unix))
+    except KeyboardInterrupt:
+        pass
+
+
+if __name__ == "__main__":
+    main()
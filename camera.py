@@ -0,0 +1,123 @@
+"""
+Camera Module.
+
+This module converts between board space and screen space so that layouts
+larger than the window can be panned and zoomed. Board space is measured
+in unscaled pixels: a tile at grid (x, y, z) sits at
+(x * TILE_SCALE_X + z * LAYER_SHIFT_X, y * TILE_SCALE_Y + z * LAYER_SHIFT_Y).
+"""
+
+import constants as c
+
+# Discrete zoom steps. Keeping zoom on a fixed ladder lets scaled sprites
+# be cached per level instead of being rescaled on every wheel tick.
+ZOOM_LEVELS = (0.2, 0.25, 0.32, 0.4, 0.5, 0.64, 0.8, 1.0, 1.25, 1.5, 2.0)
+
+
+def tile_world_pos(tile):
+    """
+    Returns the top-left corner of a tile's face in board space.
+
+    Args:
+        tile (Tile): The tile to locate.
+
+    Returns:
+        tuple: (x, y) in unscaled pixels.
+    """
+    return (tile.x * c.TILE_SCALE_X + tile.z * c.LAYER_SHIFT_X,
+            tile.y * c.TILE_SCALE_Y + tile.z * c.LAYER_SHIFT_Y)
+
+
+class Camera:
+    """
+    A 2D camera with panning and stepped zoom.
+
+    Attributes:
+        offset_x (int): Screen X coordinate of the board-space origin.
+        offset_y (int): Screen Y coordinate of the board-space origin.
+        zoom_index (int): Index into ZOOM_LEVELS.
+        viewport (tuple): (x, y, width, height) of the drawable screen area.
+    """
+
+    def __init__(self, viewport=(0, 0, c.SCREEN_WIDTH, c.SCREEN_HEIGHT)):
+        """
+        Initializes a camera at 100% zoom looking at the board-space origin.
+
+        Args:
+            viewport (tuple): (x, y, width, height) of the visible screen area.
+        """
+        self.viewport = viewport
+        self.offset_x = 0
+        self.offset_y = 0
+        self.zoom_index = ZOOM_LEVELS.index(1.0)
+        # Incremented on every change so renderers can tell when cached
+        # screen positions are stale.
+        self.version = 0
+
+    @property
+    def zoom(self):
+        """float: The current scale factor."""
+        return ZOOM_LEVELS[self.zoom_index]
+
+    def world_to_screen(self, wx, wy):
+        """Converts a board-space point to integer screen coordinates."""
+        z = self.zoom
+        return (self.offset_x + round(wx * z), self.offset_y + round(wy * z))
+
+    def screen_to_world(self, sx, sy):
+        """Converts a screen point back to (fractional) board space."""
+        z = self.zoom
+        return ((sx - self.offset_x) / z, (sy - self.offset_y) / z)
+
+    def visible_world_rect(self):
+        """
+        Returns the area of board space currently covered by the viewport.
+
+        Returns:
+            tuple: (x, y, width, height) in unscaled pixels.
+        """
+        vx, vy, vw, vh = self.viewport
+        wx, wy = self.screen_to_world(vx, vy)
+        return (wx, wy, vw / self.zoom, vh / self.zoom)
+
+    def pan(self, dx, dy):
+        """Moves the view by a screen-space delta."""
+        if dx or dy:
+            self.offset_x += int(dx)
+            self.offset_y += int(dy)
+            self.version += 1
+
+    def zoom_at(self, steps, screen_pos):
+        """
+        Zooms in (positive steps) or out (negative steps) around a screen point.
+
+        The board-space point under 'screen_pos' stays under the cursor.
+        """
+        new_index = max(0, min(len(ZOOM_LEVELS) - 1, self.zoom_index + steps))
+        if new_index == self.zoom_index: return
+        wx, wy = self.screen_to_world(*screen_pos)
+        self.zoom_index = new_index
+        self.offset_x = screen_pos[0] - round(wx * self.zoom)
+        self.offset_y = screen_pos[1] - round(wy * self.zoom)
+        self.version += 1
+
+    def fit(self, bounds, margin_top=0):
+        """
+        Centers the view on a board-space rectangle.
+
+        Uses 100% zoom whenever the rectangle fits, otherwise the largest
+        zoom level that shows it entirely.
+
+        Args:
+            bounds (tuple): (x, y, width, height) in unscaled pixels.
+            margin_top (int): Extra downward shift, leaving room for the HUD.
+        """
+        bx, by, bw, bh = bounds
+        vx, vy, vw, vh = self.viewport
+        self.zoom_index = ZOOM_LEVELS.index(1.0)
+        while self.zoom_index > 0 and (bw * self.zoom > vw or bh * self.zoom + margin_top > vh):
+            self.zoom_index -= 1
+        z = self.zoom
+        self.offset_x = vx + (vw - round(bw * z)) // 2 - round(bx * z)
+        self.offset_y = vy + (vh - round(bh * z)) // 2 - round(by * z) + margin_top
+        self.version += 1
@@ -0,0 +1,278 @@
+"""
+Deal Database Module.
+
+This module stores large numbers of pre-verified solvable deals in a flat
+binary file and reads them back through mmap, so picking deal N is a
+single offset computation with no parsing and no full-file load.
+
+File layout (little-endian):
+    header  16 bytes  magic b"MJDEALDB", version (u16), max_tiles (u16), count (u32)
+    record  10 + max_tiles bytes each:
+            layout id (u8), difficulty id (u8), tile count (u16),
+            solution length in pairs (u16, 0 if unknown), seed (u32),
+            one face id (u8) per position, zero-padded to max_tiles
+
+Run it as a script to build a database with several worker processes:
+    python deal_db.py deals.db --count 100000 --workers 8
+"""
+
+import mmap
+import os
+import random
+import struct
+import time
+import constants as c
+import layouts
+
+MAGIC = b"MJDEALDB"
+VERSION = 1
+HEADER = struct.Struct("<8sHHI")
+RECORD_HEAD = struct.Struct("<BBHHI")
+
+# Ids are part of the file format: only ever append to these tables
+LAYOUT_IDS = ("TURTLE", "BUTTERFLY", "COLOSSEUM")
+DIFFICULTY_IDS = ("EASY", "MEDIUM", "HARD")
+
+FACES = (
+    [(suit, value) for suit in (c.SUIT_COINS, c.SUIT_CUPS, c.SUIT_SWORDS) for value in range(1, 10)]
+    + [(kind, sub) for kind in (c.TYPE_KNIGHT, c.TYPE_JACK, c.TYPE_KING)
+       for sub in ("Coins", "Cups", "Swords", "Clubs")]
+    + [(c.TYPE_JOKER, sub) for sub in ("Red", "Green", "Blue")]
+)
+FACE_IDS = {face: i for i, face in enumerate(FACES)}
+
+
+class DealRecord:
+    """
+    One deal: which layout, which difficulty, and the face on every position.
+
+    Attributes:
+        layout (str): Layout mode.
+        difficulty (str): Difficulty.
+        seed (int): Board seed, which also drives later shuffles.
+        solution_length (int): Pairs in the known solution (0 if unknown).
+        face_ids (bytes): One face id per position, in layout order.
+    """
+
+    def __init__(self, layout, difficulty, seed, solution_length, face_ids):
+        self.layout = layout
+        self.difficulty = difficulty
+        self.seed = seed
+        self.solution_length = solution_length
+        self.face_ids = face_ids
+
+    def faces(self):
+        """Returns the (suit, value) of every position."""
+        return [FACES[f] for f in self.face_ids]
+
+    @staticmethod
+    def from_board(board):
+        """
+        Captures the deal of a freshly dealt board.
+
+        Args:
+            board (Board): A board on a named layout, before any move.
+
+        Returns:
+            DealRecord: The record describing it.
+        """
+        solution_length = len(board.solution) if board.solution else 0
+        face_ids = bytes(FACE_IDS[(t.suit, t.value)] for t in board.tiles)
+        return DealRecord(board.layout_mode, board.difficulty, board.seed, solution_length, face_ids)
+
+    def pack(self, max_tiles):
+        """Encodes the record into its fixed-size binary form."""
+        head = RECORD_HEAD.pack(LAYOUT_IDS.index(self.layout), DIFFICULTY_IDS.index(self.difficulty),
+                                len(self.face_ids), self.solution_length, self.seed)
+        return head + self.face_ids.ljust(max_tiles, b"\0")
+
+
+class DealDatabase:
+    """
+    Read-only, memory-mapped view of a deal database file.
+
+    Attributes:
+        max_tiles (int): Face slots per record.
+        record_size (int): Bytes per record.
+    """
+
+    def __init__(self, path):
+        """
+        Maps the file and validates its header.
+
+        Args:
+            path (str): Database file.
+
+        Raises:
+            ValueError: If the file is not a deal database of a known version.
+        """
+        self.file = open(path, "rb")
+        try:
+            self.map = mmap.mmap(self.file.fileno(), 0, access=mmap.ACCESS_READ)
+            magic, version, self.max_tiles, self.count = HEADER.unpack_from(self.map, 0)
+        except (ValueError, struct.error):
+            self.file.close()
+            raise ValueError(f"{path} is not a deal database")
+        if magic != MAGIC or version != VERSION:
+            self.close()
+            raise ValueError(f"{path} is not a version {VERSION} deal database")
+        self.record_size = RECORD_HEAD.size + self.max_tiles
+
+    def __len__(self):
+        return self.count
+
+    def __getitem__(self, n):
+        """
+        Reads deal n straight from the mapping.
+
+        Args:
+            n (int): Record index (negative indices count from the end).
+
+        Returns:
+            DealRecord: The deal.
+        """
+        if n < 0: n += self.count
+        if not 0 <= n < self.count: raise IndexError("deal index out of range")
+        offset = HEADER.size + n * self.record_size
+        layout, difficulty, tiles, solution_length, seed = RECORD_HEAD.unpack_from(self.map, offset)
+        start = offset + RECORD_HEAD.size
+        return DealRecord(LAYOUT_IDS[layout], DIFFICULTY_IDS[difficulty], seed,
+                          solution_length, self.map[start:start + tiles])
+
+    def close(self):
+        """Unmaps and closes the file."""
+        self.map.close()
+        self.file.close()
+
+    def __enter__(self):
+        return self
+
+    def __exit__(self, *exc):
+        self.close()
+
+
+def write_database(path, records, max_tiles):
+    """
+    Streams records into a new database file.
+
+    The file is written next to its destination and renamed at the end, so
+    readers never see a half-written database.
+
+    Args:
+        path (str): Destination file.
+        records (iterable): DealRecord objects, or their packed bytes.
+        max_tiles (int): Face slots per record (the largest layout).
+
+    Returns:
+        int: Number of records written.
+    """
+    tmp_path = path + ".tmp"
+    count = 0
+    with open(tmp_path, "wb") as f:
+        f.write(HEADER.pack(MAGIC, VERSION, max_tiles, 0))
+        for record in records:
+            f.write(record if isinstance(record, bytes) else record.pack(max_tiles))
+            count += 1
+        f.seek(0)
+        f.write(HEADER.pack(MAGIC, VERSION, max_tiles, count))
+    os.replace(tmp_path, path)
+    return count
+
+
+# --- BUILDER ---
+
+def _deal_job(job):
+    """Worker: deals one solvable board; returns its symmetry class key and packed record."""
+    from board import Board
+    layout, difficulty, seed, max_tiles = job
+    while True:
+        board = Board(layout, difficulty, seed=seed, solvable=True)
+        if board.solution is not None:
+            key = (layout, difficulty, board.canonical_key())
+            return key, DealRecord.from_board(board).pack(max_tiles)
+        # No pairing found for this seed (very rare): move on to the next
+        seed = (seed + 1) % 2 ** 32
+
+
+def build_database(path, count, layout_modes=LAYOUT_IDS, difficulties=DIFFICULTY_IDS,
+                   seed=0, workers=None, dedupe=True):
+    """
+    Fills a database with solvable deals using a pool of processes.
+
+    Deals cycle through every (layout, difficulty) pair, and deal n is
+    derived from (seed, n) only, so the same arguments always produce the
+    same file regardless of the number of workers.
+
+    With dedupe, a deal that is a mirror image of one already written (on
+    a symmetric layout) is skipped, so each symmetry class is stored once.
+
+    Args:
+        path (str): Destination file.
+        count (int): Number of deals.
+        layout_modes (tuple): Layouts to include.
+        difficulties (tuple): Difficulties to include.
+        seed (int): Base seed.
+        workers (int | None): Processes to use (CPU count when None).
+        dedupe (bool): Skip deals equivalent to an earlier one.
+
+    Returns:
+        int: Number of records written.
+    """
+    import multiprocessing
+
+    max_tiles = max(len(layouts.get_layout(name)) for name in layout_modes)
+    keys = [(l, d) for l in layout_modes for d in difficulties]
+
+    def job(n):
+        layout, difficulty = keys[n % len(keys)]
+        deal_seed = random.Random(f"{seed}:{n}").randrange(2 ** 32)
+        return (layout, difficulty, deal_seed, max_tiles)
+
+    def records(pool):
+        # Deals are requested in batches until enough distinct ones arrive;
+        # imap keeps the input order, so the file does not depend on timing
+        seen = set()
+        n = written = 0
+        while written < count:
+            batch = [job(k) for k in range(n, n + min(max(count - written, 64), 4096))]
+            n += len(batch)
+            for key, packed in pool.imap(_deal_job, batch, chunksize=64):
+                if dedupe:
+                    if key in seen: continue
+                    seen.add(key)
+                yield packed
+                written += 1
+                if written == count: return
+
+    with multiprocessing.Pool(workers) as pool:
+        return write_database(path, records(pool), max_tiles)
+
+
+def main():
+    """Command-line entry point of the builder."""
+    import argparse
+
+    parser = argparse.ArgumentParser(description="Build a database of solvable deals")
+    parser.add_argument("path", help="output file")
+    parser.add_argument("--count", type=int, default=10000, help="number of deals")
+    parser.add_argument("--layout", choices=LAYOUT_IDS, action="append",
+                        help="layout to include (repeatable, default: all)")
+    parser.add_argument("--difficulty", choices=DIFFICULTY_IDS, action="append",
+                        help="difficulty to include (repeatable, default: all)")
+    parser.add_argument("--seed", type=int, default=0, help="base seed")
+    parser.add_argument("--workers", type=int, default=None, help="worker processes")
+    parser.add_argument("--keep-mirrors", action="store_true",
+                        help="keep deals that mirror an earlier deal")
+    args = parser.parse_args()
+
+    started = time.perf_counter()
+    written = build_database(args.path, args.count, tuple(args.layout or LAYOUT_IDS),
+                             tuple(args.difficulty or DIFFICULTY_IDS), args.seed, args.workers,
+                             dedupe=not args.keep_mirrors)
+    elapsed = time.perf_counter() - started
+    print(f"{written} deals written to {args.path} in {elapsed:.1f}s "
+          f"({written / max(elapsed, 1e-9):.0f} deals/s, {os.path.getsize(args.path)} bytes)")
+
+
+if __name__ == "__main__":
+    main()
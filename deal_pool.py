@@ -0,0 +1,176 @@
+"""
+Deal Pool Module.
+
+This module keeps a few ready-made, verified boards for every
+(layout, difficulty) pair so that starting a game is a constant-time pop
+instead of a full deal. A background thread refills the pool while the
+player is in the menu or playing.
+
+Deals for a given pair always come from the same seed sequence, whether
+they were prepared in the background or built on demand, so sessions stay
+reproducible no matter how the worker thread was scheduled.
+"""
+
+import random
+import threading
+from collections import deque
+from board import Board
+
+LAYOUTS = ("TURTLE", "BUTTERFLY", "COLOSSEUM")
+DIFFICULTIES = ("EASY", "MEDIUM", "HARD")
+
+
+def default_factory(layout, difficulty, seed):
+    """Deals a solvable board for a pair from a seed."""
+    return Board(layout, difficulty, seed=seed, solvable=True)
+
+
+def default_verify(board):
+    """Accepts deals built with a known solution."""
+    return board.solution is not None
+
+
+class DealPool:
+    """
+    Per-(layout, difficulty) queues of verified boards.
+
+    Attributes:
+        size (int): Deals kept ready for each pair.
+        ready (dict): Maps (layout, difficulty) to a deque of boards, oldest first.
+    """
+
+    def __init__(self, size=2, factory=default_factory, verify=default_verify, seed=None,
+                 layouts=LAYOUTS, difficulties=DIFFICULTIES):
+        """
+        Initializes an empty pool. Call start() to fill it in the background.
+
+        Args:
+            size (int): Deals to keep ready per pair.
+            factory (callable): factory(layout, difficulty, seed) -> Board.
+            verify (callable): verify(board) -> bool. Rejected deals are
+                replaced by the next seed in the sequence.
+            seed (int | None): Base seed of the per-pair seed sequences.
+            layouts (tuple): Layout modes to serve.
+            difficulties (tuple): Difficulties to serve.
+        """
+        self.size = size
+        self.factory = factory
+        self.verify = verify
+        self.base_seed = seed if seed is not None else random.randrange(2 ** 32)
+        self.keys = [(l, d) for l in layouts for d in difficulties]
+        self.ready = {key: deque() for key in self.keys}
+        
+        # Seed bookkeeping: 'issued' counts seeds handed out per pair. At most
+        # one deal per pair is built at a time ('busy'), so deals always come
+        # out of the queues in seed order.
+        self.issued = {key: 0 for key in self.keys}
+        self.busy = set()
+        self.preferred = None
+        
+        self.lock = threading.Condition()
+        self.thread = None
+        self.running = False
+
+    def _next_seed(self, key):
+        """Returns the next seed of a pair's sequence. Caller holds the lock."""
+        n = self.issued[key]
+        self.issued[key] = n + 1
+        return random.Random(f"{self.base_seed}:{key[0]}:{key[1]}:{n}").randrange(2 ** 32)
+
+    def _build(self, key):
+        """
+        Deals boards from a pair's seed sequence until one passes verification.
+        
+        The caller must have marked the pair busy.
+        """
+        while True:
+            with self.lock:
+                seed = self._next_seed(key)
+            board = self.factory(key[0], key[1], seed)
+            if self.verify(board): return board
+
+    def prefer(self, layout, difficulty):
+        """Asks the worker to refill a pair first (e.g. the one selected in the menu)."""
+        with self.lock:
+            self.preferred = (layout, difficulty)
+            self.lock.notify_all()
+
+    def take(self, layout, difficulty):
+        """
+        Returns a ready deal, building one synchronously if the pool is empty.
+
+        Args:
+            layout (str): Layout mode.
+            difficulty (str): Difficulty.
+
+        Returns:
+            Board: A verified board.
+        """
+        key = (layout, difficulty)
+        with self.lock:
+            queue = self.ready.get(key)
+            if queue is None:
+                # Not a pooled pair: deal directly from a one-off seed
+                return self.factory(layout, difficulty, None)
+            # If the worker is dealing this pair right now, its deal is next
+            while not queue and key in self.busy:
+                self.lock.wait()
+            if queue:
+                board = queue.popleft()
+                self.lock.notify_all()
+                return board
+            self.busy.add(key)
+        try:
+            return self._build(key)
+        finally:
+            with self.lock:
+                self.busy.discard(key)
+                self.lock.notify_all()
+
+    # --- BACKGROUND WORKER ---
+
+    def start(self):
+        """Starts the refill thread (a daemon, so it never blocks exit)."""
+        if self.thread: return
+        self.running = True
+        self.thread = threading.Thread(target=self._worker, name="deal-pool", daemon=True)
+        self.thread.start()
+
+    def stop(self):
+        """Stops the refill thread and waits for it to finish its current deal."""
+        if not self.thread: return
+        with self.lock:
+            self.running = False
+            self.lock.notify_all()
+        self.thread.join()
+        self.thread = None
+
+    def _next_job(self):
+        """Picks the emptiest pair, the preferred one first. Caller holds the lock."""
+        candidates = [k for k in self.keys
+                      if len(self.ready[k]) < self.size and k not in self.busy]
+        if not candidates: return None
+        if self.preferred in candidates and len(self.ready[self.preferred]) == 0:
+            return self.preferred
+        return min(candidates, key=lambda k: len(self.ready[k]))
+
+    def _worker(self):
+        """Refill loop: deal, verify, enqueue; sleep while every pair is full."""
+        while True:
+            with self.lock:
+                key = self._next_job()
+                while self.running and key is None:
+                    self.lock.wait()
+                    key = self._next_job()
+                if not self.running: return
+                self.busy.add(key)
+            
+            board = None
+            try:
+                board = self._build(key)
+            finally:
+                # Enqueue and release together so no take() sees the gap
+                with self.lock:
+                    if board is not None: self.ready[key].append(board)
+                    self.busy.discard(key)
+                    self.lock.notify_all()
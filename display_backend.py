@@ -0,0 +1,211 @@
+"""
+Display Backend Module.
+
+This module hides how frames reach the window. The game draws its menus,
+HUD and messages onto a regular pygame Surface and hands the board to the
+backend as a batched sprite sequence (see renderer.BoardRenderer).
+
+Two backends are available:
+- BlitBackend: the classic software path on top of pygame.display.set_mode.
+- TextureBackend: an SDL2 Renderer/Texture path (pygame._sdl2.video). Tile
+  atlases are uploaded once as textures and the board is composited with
+  texture copies. It works with both GPU and software SDL renderers.
+"""
+
+import pygame
+import constants as c
+
+BACKENDS = ("blit", "sdl2", "sdl2-software")
+
+
+class BlitBackend:
+    """
+    Software rendering through the display surface.
+
+    Attributes:
+        surface (pygame.Surface): The surface the game draws onto (the screen).
+    """
+
+    def __init__(self, size, title):
+        """
+        Opens the game window.
+
+        Args:
+            size (tuple): Window size in pixels.
+            title (str): Window caption.
+        """
+        self.surface = pygame.display.set_mode(size)
+        pygame.display.set_caption(title)
+
+    def convert(self, img):
+        """Converts a loaded image to the fastest opaque format."""
+        return img.convert()
+
+    def convert_alpha(self, img):
+        """Converts a loaded image to the fastest format with per-pixel alpha."""
+        return img.convert_alpha()
+
+    def draw_background(self, img):
+        """Starts a frame with the background image, or the felt color."""
+        if img: self.surface.blit(img, (0, 0))
+        else: self.surface.fill(c.COLOR_BACKGROUND)
+
+    def draw_board(self, renderer, hint_tiles, selected):
+        """Draws the board's visible tiles with a single blits call."""
+        renderer.draw(self.surface, hint_tiles, selected)
+
+    def begin_overlay(self):
+        """Nothing to prepare: overlays are drawn straight onto the screen."""
+
+    def finish(self):
+        """Completes the frame. Everything is already on the screen surface."""
+
+    def present(self):
+        """Shows the finished frame."""
+        pygame.display.flip()
+
+    def screenshot(self):
+        """Returns a copy of the finished frame (call before present)."""
+        return self.surface.copy()
+
+
+class FrameSurface(pygame.Surface):
+    """
+    The software frame of TextureBackend.
+
+    Once the board has been composited, the first blit or fill calls
+    'before_draw' so the backend can read the frame back first; without it
+    such drawing would land under the tiles and never be shown. pygame.draw
+    functions bypass these methods: call begin_overlay() before using them
+    over the board.
+    """
+
+    before_draw = None
+
+    def blit(self, *args, **kwargs):
+        if self.before_draw: self.before_draw()
+        return super().blit(*args, **kwargs)
+
+    def blits(self, *args, **kwargs):
+        if self.before_draw: self.before_draw()
+        return super().blits(*args, **kwargs)
+
+    def fill(self, *args, **kwargs):
+        if self.before_draw: self.before_draw()
+        return super().fill(*args, **kwargs)
+
+
+class TextureBackend:
+    """
+    Hardware (or SDL software) compositing with SDL2 textures.
+
+    Menus, HUD and background are drawn in software onto 'surface' exactly
+    as with BlitBackend and streamed into one base texture per frame, so text
+    and translucent UI blend identically. Tiles, including their selection
+    and hint highlights, are copied from an atlas texture that is uploaded
+    once per zoom level. Anything drawn over the board is composited on a
+    read-back copy of the frame: begin_overlay() reads it back, and so does
+    the first blit or fill after the board (see FrameSurface).
+
+    Attributes:
+        surface (pygame.Surface): The surface the game draws its UI onto.
+    """
+
+    def __init__(self, size, title, software=False):
+        """
+        Opens the game window with an SDL2 renderer.
+
+        Args:
+            size (tuple): Window size in pixels.
+            title (str): Window caption.
+            software (bool): Force SDL's software renderer (no GPU needed).
+        """
+        from pygame._sdl2 import video
+        self.video = video
+        self.window = video.Window(title, size)
+        try:
+            self.renderer = video.Renderer(self.window, accelerated=0 if software else -1)
+        except Exception:
+            # No usable GPU driver: fall back to SDL's software renderer
+            self.renderer = video.Renderer(self.window, accelerated=0)
+        
+        # There is no display surface, so images are converted against these
+        self.surface = FrameSurface(size, 0, 32)
+        self.base = video.Texture(self.renderer, size, streaming=True)
+        self.board_drawn = False
+        self.atlas = None
+        self.atlas_texture = None
+
+    def convert(self, img):
+        """Converts an image to the opaque frame format."""
+        return img.convert(self.surface)
+
+    def convert_alpha(self, img):
+        """Converts an image to a format with per-pixel alpha."""
+        if img.get_flags() & pygame.SRCALPHA: return img.copy()
+        converted = pygame.Surface(img.get_size(), pygame.SRCALPHA)
+        converted.blit(img, (0, 0))
+        return converted
+
+    def _upload_surface(self):
+        """Streams the software-drawn frame into the base texture and draws it."""
+        self.base.update(self.surface)
+        self.base.draw()
+
+    def draw_background(self, img):
+        """Starts a frame with the background image, or the felt color."""
+        self.board_drawn = False
+        self.surface.before_draw = None
+        if img: self.surface.blit(img, (0, 0))
+        else: self.surface.fill(c.COLOR_BACKGROUND)
+
+    def draw_board(self, renderer, hint_tiles, selected):
+        """Draws the UI drawn so far, then copies every visible tile from the atlas texture."""
+        self._upload_surface()
+        draw_list = renderer.prepare(hint_tiles, selected)
+        atlas = renderer.list_atlas
+        if atlas is not self.atlas:
+            self.atlas = atlas
+            self.atlas_texture = self.video.Texture.from_surface(self.renderer, atlas.surface)
+            self.atlas_texture.blend_mode = pygame.BLENDMODE_BLEND
+        draw = self.atlas_texture.draw
+        for _, (x, y), area in draw_list:
+            draw(srcrect=area, dstrect=(x, y, area.width, area.height))
+        self.board_drawn = True
+        self.surface.before_draw = self.begin_overlay
+
+    def begin_overlay(self):
+        """Prepares 'surface' for drawing over the board (e.g. end-of-game messages)."""
+        if self.board_drawn:
+            self.surface.before_draw = None
+            self.renderer.to_surface(self.surface)
+            self.board_drawn = False
+
+    def finish(self):
+        """Composites everything drawn since the board."""
+        if not self.board_drawn: self._upload_surface()
+
+    def present(self):
+        """Shows the finished frame."""
+        self.renderer.present()
+
+    def screenshot(self):
+        """Reads the finished frame back into a Surface (call before present)."""
+        return self.renderer.to_surface()
+
+
+def create_backend(name, size=(c.SCREEN_WIDTH, c.SCREEN_HEIGHT), title=""):
+    """
+    Builds a display backend by name.
+
+    Args:
+        name (str): One of BACKENDS.
+        size (tuple): Window size in pixels.
+        title (str): Window caption.
+
+    Returns:
+        BlitBackend | TextureBackend: The opened backend.
+    """
+    if name == "sdl2": return TextureBackend(size, title)
+    if name == "sdl2-software": return TextureBackend(size, title, software=True)
+    return BlitBackend(size, title)
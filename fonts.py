@@ -0,0 +1,85 @@
+"""
+Fonts Module.
+
+This module opens fonts without pygame.font.SysFont. SysFont enumerates
+every installed font the first time it is called (fc-list on Linux),
+which can take a large share of the startup time. Here a font name is
+resolved from the bundled fonts first, then from a small cache of earlier
+lookups, and only on a cache miss from the system font list. The cache
+lives next to the save file and is rebuilt if a cached file disappears.
+"""
+
+import json
+import os
+import pygame
+
+FONT_DIR = os.path.join("assets", "fonts")
+FONT_CACHE_FILE = "font_cache.json"
+
+_cache = None
+
+
+def _load_cache():
+    global _cache
+    if _cache is None:
+        try:
+            with open(FONT_CACHE_FILE, "r") as f:
+                _cache = json.load(f)
+        except Exception:
+            _cache = {}
+    return _cache
+
+
+def _save_cache():
+    try:
+        with open(FONT_CACHE_FILE, "w") as f:
+            json.dump(_cache, f)
+    except Exception:
+        pass
+
+
+def find_font(name, bold=False):
+    """
+    Resolves a font name to a file path.
+
+    Args:
+        name (str): Family name, e.g. "Arial", or a file in assets/fonts.
+        bold (bool): Prefer the bold face.
+
+    Returns:
+        str | None: Path to the font file, or None if the system has no
+        such font (pygame's default font is used then).
+    """
+    bundled = os.path.join(FONT_DIR, name)
+    if os.path.exists(bundled): return bundled
+
+    cache = _load_cache()
+    key = f"{name}|{'bold' if bold else 'regular'}"
+    if key in cache:
+        path = cache[key]
+        if path is None or os.path.exists(path): return path
+
+    # Cache miss: the only call that scans the installed fonts
+    path = pygame.font.match_font(name, bold=bold)
+    cache[key] = path
+    _save_cache()
+    return path
+
+
+def load_font(name, size, bold=False):
+    """
+    Opens a font like pygame.font.SysFont, without the system font scan.
+
+    Args:
+        name (str): Family name or bundled file name.
+        size (int): Point size.
+        bold (bool): Bold face (synthesized if no bold file is found).
+
+    Returns:
+        pygame.font.Font: The font.
+    """
+    path = find_font(name, bold)
+    font = pygame.font.Font(path, size)
+    if bold and (path is None or path == find_font(name, False)):
+        font.set_bold(True)
+    return font
@@ -0,0 +1,221 @@
+"""
+Frame Profiler Module.
+
+This module measures where the time of every frame goes (event polling,
+game logic, each draw phase, presenting and the frame-rate wait). Samples
+are kept in a fixed-size ring buffer, summarized as rolling percentiles in
+an on-screen overlay, and can be dumped to CSV for offline analysis.
+
+While disabled, every call returns after a single attribute check.
+
+StartupProfile does the same for the one-off phases of launching the game,
+up to the first presented frame and the work deferred after it.
+"""
+
+import csv
+import math
+import time
+from array import array
+import pygame
+
+# Phases in the order they happen within a frame
+PHASES = ("events", "logic", "draw_menu", "draw_game", "draw_rules", "draw_stats",
+          "draw_load", "draw_replay", "draw_message", "overlay", "flip", "tick")
+
+
+def percentile(sorted_values, q):
+    """
+    Returns the q-th percentile (0-100) of an already sorted sequence.
+
+    Uses the nearest-rank method (the smallest value with at least q% of
+    the values at or below it), which is exact for the small windows
+    shown in the overlay.
+    """
+    if not sorted_values: return 0.0
+    n = len(sorted_values)
+    rank = max(0, min(n - 1, math.ceil(q * n / 100) - 1))
+    return sorted_values[rank]
+
+
+class StartupProfile:
+    """
+    Wall-clock time of each startup phase, printed as one table.
+
+    Attributes:
+        enabled (bool): When False, nothing is measured or printed.
+        phases (list): (name, seconds) in the order they were marked.
+    """
+
+    def __init__(self, enabled=False):
+        self.enabled = enabled
+        self.phases = []
+        self.started = self.last = time.perf_counter()
+
+    def mark(self, phase):
+        """Charges the time elapsed since the previous mark to 'phase'."""
+        if not self.enabled: return
+        now = time.perf_counter()
+        self.phases.append((phase, now - self.last))
+        self.last = now
+
+    def report(self):
+        """Prints the phases and their total (milliseconds), then stops measuring."""
+        if not self.enabled: return
+        self.enabled = False
+        width = max(len(name) for name, _ in self.phases) if self.phases else 5
+        print("--- STARTUP PROFILE (ms) ---")
+        for name, seconds in self.phases:
+            print(f"{name:<{width}} {seconds * 1000:9.2f}")
+        print(f"{'total':<{width}} {(self.last - self.started) * 1000:9.2f}")
+
+
+class FrameProfiler:
+    """
+    Per-frame, per-phase timing with a ring buffer of recent frames.
+
+    Attributes:
+        enabled (bool): When False, nothing is measured.
+        capacity (int): Number of frames kept in the ring buffer.
+        window (int): Number of most recent frames used for the overlay.
+    """
+
+    def __init__(self, capacity=3600, window=240):
+        """
+        Initializes an empty, disabled profiler.
+
+        Args:
+            capacity (int): Frames kept for CSV export (one minute at 60 FPS).
+            window (int): Frames summarized by the overlay percentiles.
+        """
+        self.enabled = False
+        self.capacity = capacity
+        self.window = window
+        self.phase_index = {name: i for i, name in enumerate(PHASES)}
+        
+        # One column per phase, plus the frame number, preallocated
+        self.samples = [array("d", bytes(8 * capacity)) for _ in PHASES]
+        self.frame_numbers = array("q", bytes(8 * capacity))
+        self.head = 0
+        self.count = 0
+        
+        self.frame = 0
+        self.current = [0.0] * len(PHASES)
+        self.last = 0.0
+        
+        # Overlay text is refreshed a few times per second, not every frame
+        self.font = None
+        self.overlay_lines = []
+        self.overlay_age = 0
+
+    def toggle(self):
+        """Switches profiling (and the overlay) on or off."""
+        self.enabled = not self.enabled
+        self.overlay_age = 0
+        # Toggling happens mid-frame: start the current frame from here
+        self.current = [0.0] * len(PHASES)
+        self.last = time.perf_counter()
+
+    def begin_frame(self, frame_number):
+        """Starts timing a new frame."""
+        if not self.enabled: return
+        self.frame = frame_number
+        current = self.current
+        for i in range(len(current)): current[i] = 0.0
+        self.last = time.perf_counter()
+
+    def mark(self, phase):
+        """Charges the time elapsed since the previous mark to 'phase'."""
+        if not self.enabled: return
+        now = time.perf_counter()
+        self.current[self.phase_index[phase]] += now - self.last
+        self.last = now
+
+    def end_frame(self):
+        """Stores the finished frame in the ring buffer."""
+        if not self.enabled: return
+        slot = self.head
+        for column, value in zip(self.samples, self.current):
+            column[slot] = value
+        self.frame_numbers[slot] = self.frame
+        self.head = (slot + 1) % self.capacity
+        self.count = min(self.count + 1, self.capacity)
+
+    def _recent(self, column, n):
+        """Returns the last n values of a column, oldest first."""
+        n = min(n, self.count)
+        start = (self.head - n) % self.capacity
+        if start + n <= self.capacity:
+            return column[start:start + n]
+        return column[start:] + column[:(start + n) % self.capacity]
+
+    def summary(self, n=None):
+        """
+        Computes p50/p95/p99 per phase (and for the whole frame) in milliseconds.
+
+        Args:
+            n (int | None): Number of recent frames to summarize (default: window).
+
+        Returns:
+            list: (phase, p50, p95, p99) tuples, ending with a 'frame' total.
+        """
+        n = n or self.window
+        columns = [self._recent(col, n) for col in self.samples]
+        totals = [sum(values) for values in zip(*columns)]
+        rows = []
+        for name, values in list(zip(PHASES, columns)) + [("frame", totals)]:
+            ordered = sorted(values)
+            rows.append((name, *(percentile(ordered, q) * 1000 for q in (50, 95, 99))))
+        return rows
+
+    def dump_csv(self, path=None):
+        """
+        Writes every buffered frame to a CSV file (times in milliseconds).
+
+        Args:
+            path (str | None): Destination file. Defaults to a timestamped name.
+
+        Returns:
+            str: The path written.
+        """
+        if path is None:
+            path = time.strftime("frame_profile_%Y%m%d-%H%M%S.csv")
+        columns = [self._recent(col, self.count) for col in self.samples]
+        frames = self._recent(self.frame_numbers, self.count)
+        with open(path, "w", newline="") as f:
+            writer = csv.writer(f)
+            writer.writerow(["frame", *PHASES, "total"])
+            for i, frame in enumerate(frames):
+                values = [col[i] * 1000 for col in columns]
+                writer.writerow([frame, *(f"{v:.4f}" for v in values), f"{sum(values):.4f}"])
+        return path
+
+    def draw_overlay(self, surface):
+        """Draws the rolling percentile table in the bottom-left corner."""
+        if not self.enabled: return
+        if self.font is None:
+            # pygame's bundled default font: no system font scan needed
+            self.font = pygame.font.Font(None, 20)
+        if self.overlay_age <= 0:
+            rows = [("phase (ms)", "p50", "p95", "p99")]
+            rows += [(name, f"{p50:.2f}", f"{p95:.2f}", f"{p99:.2f}")
+                     for name, p50, p95, p99 in self.summary()]
+            self.overlay_lines = [
+                [self.font.render(cell, True, (255, 255, 255) if i == 0 else (200, 255, 200))
+                 for cell in row]
+                for i, row in enumerate(rows)
+            ]
+            self.overlay_age = 15
+        self.overlay_age -= 1
+        
+        # Right-aligned numeric columns after the phase name
+        col_right = (0, 160, 220, 280)
+        line_h = 18
+        height = line_h * len(self.overlay_lines) + 10
+        panel = pygame.Rect(10, surface.get_height() - height - 10, 300, height)
+        pygame.draw.rect(surface, (0, 0, 0), panel)
+        pygame.draw.rect(surface, (218, 165, 32), panel, 1)
+        for i, cells in enumerate(self.overlay_lines):
+            y = panel.y + 5 + i * line_h
+            surface.blit(cells[0], (panel.x + 8, y))
+            for cell, right in zip(cells[1:], col_right[1:]):
+                surface.blit(cell, (panel.x + right - cell.get_width(), y))
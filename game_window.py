@@ -1,10 +1,56 @@
+import asyncio
 import pygame
 import os
+import time
+from concurrent.futures import ThreadPoolExecutor
 import constants as c
-from board import Board
+from deal_db import FACES
+from deal_pool import DealPool
+from hint_service import HintService
 import persistence
+import save_slots
+from display_backend import create_backend
+from frame_profiler import FrameProfiler, StartupProfile
+import fonts
+import session_profiler
+from input_recorder import InputRecorder
+from move_log import MoveLog, PAIR
+from replay_viewer import GameRecord, ReplayViewer
+from renderer import BoardRenderer
+from solver import Solver, DEAD, UNKNOWN
+from stats_store import StatsStore
 from sound_manager import SoundManager
 
+# Camera pan step (pixels) for the arrow keys
+PAN_KEYS = {
+    pygame.K_LEFT: (40, 0),
+    pygame.K_RIGHT: (-40, 0),
+    pygame.K_UP: (0, 40),
+    pygame.K_DOWN: (0, -40),
+}
+
+# Seconds of dead-end search allowed per frame
+LOOKAHEAD_BUDGET = 0.002
+
+# Save entries visible at once on the LOAD screen
+LOAD_ROWS = 5
+
+# Replay screen controls: key -> (action, argument)
+REPLAY_KEYS = {
+    pygame.K_SPACE: ("play", 0),
+    pygame.K_RIGHT: ("step", 1),
+    pygame.K_LEFT: ("step", -1),
+    pygame.K_PAGEUP: ("step", -10),
+    pygame.K_PAGEDOWN: ("step", 10),
+    pygame.K_HOME: ("seek", 0),
+    pygame.K_END: ("seek", -1),
+    pygame.K_UP: ("speed", 1),
+    pygame.K_DOWN: ("speed", -1),
+}
+
+# Asyncio runtime: seconds before the search of one position is abandoned
+LOOKAHEAD_DEADLINE = 30.0
+
 class GameWindow:
     """
     Main controller class for the Spanish Mahjong game.
@@ -13,48 +59,61 @@ class GameWindow:
     updates the game state, and renders the graphics to the screen.
     """
 
-    def __init__(self):
+    def __init__(self, backend="blit", audio=True, lookahead=True, startup_profile=False):
         """
         Initializes the game window, loads assets, and sets up the initial state.
         
+        Args:
+            backend (str): Display backend, one of display_backend.BACKENDS.
+            audio (bool): If False, the mixer is never initialized.
+            lookahead (bool): If True, a budgeted search flags positions that
+                can no longer be won.
+            startup_profile (bool): If True, prints how long each startup
+                phase took once the first frame is on screen.
+        
         Tasks performed:
         - Initialize Pygame and the display window.
-        - Initialize the audio system and start background music.
+        - Prepare the audio system (mixer and music start after the first frame).
         - Load custom fonts (Medieval style) or fallbacks.
         - Load the background image.
         - Define game states and configuration variables.
-        - Load UI assets (buttons, icons).
+        - Load UI assets (buttons, icons; rule examples on first use).
         - Define interactive areas (rectangles) for mouse input.
         """
         # --- INITIALIZATION & SETUP ---
+        self.startup = StartupProfile(startup_profile)
         pygame.init()
-        self.screen = pygame.display.set_mode((c.SCREEN_WIDTH, c.SCREEN_HEIGHT))
-        pygame.display.set_caption("Spanish Mahjong - Medieval Edition")
+        self.backend = create_backend(backend, (c.SCREEN_WIDTH, c.SCREEN_HEIGHT),
+                                      "Spanish Mahjong - Medieval Edition")
+        self.screen = self.backend.surface
         self.clock = pygame.time.Clock()
+        self.startup.mark("display")
         
         # --- AUDIO SYSTEM ---
-        self.sound_manager = SoundManager()
+        # Mixer, sound effects and music.mp3 (assets/) are loaded once the
+        # first frame is on screen, see _finish_startup
+        self.sound_manager = SoundManager(enabled=audio, deferred=True)
         self.music_enabled = True
-        # Ensure music.mp3 exists in assets/sounds
-        self.sound_manager.play_music("music.mp3", 0.2)
         
         # --- FONTS LOADING ---
         font_path = os.path.join("assets", "fonts", "medieval.otf")
         
-        # Determine appropriate font to load
+        # Determine appropriate font to load. System fonts go through the
+        # font path cache (see fonts.py): SysFont would scan every installed font
         self.title_font = pygame.font.Font(font_path, 80)
         self.menu_font = pygame.font.Font(font_path, 30) 
         self.message_font = pygame.font.Font(font_path, 90)
-        self.rules_medieval_font = pygame.font.SysFont("Times New Roman", 24)
+        self.rules_medieval_font = None  # opened with the rules screen
 
-        self.ui_font = pygame.font.SysFont("Arial", 20, bold=True)
+        self.ui_font = fonts.load_font("Arial", 20, bold=True)
+        self.startup.mark("fonts")
         
         # --- BACKGROUND LOADING ---
         self.background_img = None
         bg_path = os.path.join("assets/ui", "background.jpeg")
         if os.path.exists(bg_path):
             try:
-                img = pygame.image.load(bg_path).convert()
+                img = self.backend.convert(pygame.image.load(bg_path))
                 self.background_img = pygame.transform.smoothscale(img, (c.SCREEN_WIDTH, c.SCREEN_HEIGHT))
                 # Apply dark overlay for better visibility
                 darkener = pygame.Surface((c.SCREEN_WIDTH, c.SCREEN_HEIGHT))
@@ -64,9 +123,10 @@ class GameWindow:
             except Exception as e:
                 # Fail silently if background cannot be loaded
                 pass
+        self.startup.mark("background")
 
         # --- GAME STATES ---
-        self.state = "MENU"         # Current screen: MENU, PLAYING, RULES
+        self.state = "MENU"         # Current screen: MENU, PLAYING, RULES, STATS, LOAD
         self.game_state = "PLAYING" # Game status: PLAYING, WON, LOST
         self.board = None   
         
@@ -74,6 +134,14 @@ class GameWindow:
         self.selected_map = "TURTLE"     
         self.selected_diff = "MEDIUM"    
         
+        # Ready-made deals, refilled in the background while the menu is up.
+        # The base seed comes from the random module, so recorded sessions
+        # replay the same deals.
+        self.deal_pool = DealPool()
+        self.deal_pool.prefer(self.selected_map, self.selected_diff)
+        self.deal_pool.start()
+        self.startup.mark("deal_pool")
+        
         # --- UI ASSETS LOADING ---
         self.ui_images = {}
         ui_path = os.path.join("assets", "ui")
@@ -82,28 +150,16 @@ class GameWindow:
         BTN_SIZE = 130
         
         if os.path.exists(ui_path):
-            def load_ui_btn(filename, w, h):
-                try:
-                    full_p = os.path.join(ui_path, filename)
-                    if not os.path.exists(full_p): return None
-                    img = pygame.image.load(full_p).convert_alpha()
-                    return pygame.transform.smoothscale(img, (w, h))
-                except Exception as e:
-                    return None
-
             # Load Map Icons
-            self.ui_images['map_classic'] = load_ui_btn("map_classic.jpeg", BTN_SIZE, BTN_SIZE)
-            self.ui_images['map_butterfly'] = load_ui_btn("map_butterfly.jpeg", BTN_SIZE, BTN_SIZE)
-            self.ui_images['map_fortress'] = load_ui_btn("map_fortress.jpeg", BTN_SIZE, BTN_SIZE)
+            self.ui_images['map_classic'] = self._load_ui_image("map_classic.jpeg", BTN_SIZE, BTN_SIZE)
+            self.ui_images['map_butterfly'] = self._load_ui_image("map_butterfly.jpeg", BTN_SIZE, BTN_SIZE)
+            self.ui_images['map_fortress'] = self._load_ui_image("map_fortress.jpeg", BTN_SIZE, BTN_SIZE)
             
             # Load Difficulty Icons
-            self.ui_images['diff_easy'] = load_ui_btn("diff_easy.jpeg", BTN_SIZE, BTN_SIZE)
-            self.ui_images['diff_medium'] = load_ui_btn("diff_medium.jpeg", BTN_SIZE, BTN_SIZE)
-            self.ui_images['diff_hard'] = load_ui_btn("diff_hard.jpeg", BTN_SIZE, BTN_SIZE)
-            
-            # Load Rule Examples
-            self.ui_images['ex_jack'] = load_ui_btn("example_jack.jpg", 60, 90) 
-            self.ui_images['ex_king'] = load_ui_btn("example_king.jpg", 60, 90)
+            self.ui_images['diff_easy'] = self._load_ui_image("diff_easy.jpeg", BTN_SIZE, BTN_SIZE)
+            self.ui_images['diff_medium'] = self._load_ui_image("diff_medium.jpeg", BTN_SIZE, BTN_SIZE)
+            self.ui_images['diff_hard'] = self._load_ui_image("diff_hard.jpeg", BTN_SIZE, BTN_SIZE)
+        self.startup.mark("ui_images")
 
         # --- INTERACTIVE ZONES (RECTS) ---
         cx, cy = c.SCREEN_WIDTH // 2, c.SCREEN_HEIGHT // 2
@@ -131,16 +187,95 @@ class GameWindow:
         # Menu: Extras
         self.rect_music = pygame.Rect(c.SCREEN_WIDTH - 160, 20, 140, 30)
         self.rect_rules = pygame.Rect(c.SCREEN_WIDTH - 160, 60, 140, 30)
+        self.rect_stats = pygame.Rect(c.SCREEN_WIDTH - 160, 100, 140, 30)
 
         # Game Session Variables
         self.selected_tile = None
         self.score = 0
         self.hint_tiles = []
-        self.history = []
+        self.history = MoveLog()
         self.total_tiles = 0
-        self.start_x = 0
-        self.start_y = 0
         self.images = {}
+        
+        # Board rendering (camera, culling, sprite cache)
+        self.renderer = BoardRenderer()
+        self.panning = False
+        self.mouse_pos = (0, 0)
+        
+        # Frame timing (F3 overlay, F4 CSV export)
+        self.profiler = FrameProfiler()
+        self.frame_count = 0
+        self.fps = c.FPS
+        
+        # Dead-end detection, spread over frames (see solver.py)
+        self.solver = Solver() if lookahead else None
+        self.doomed = False
+        
+        # Finished games, written to stats.db in the background (see stats_store.py)
+        self.stats_store = StatsStore()
+        self.stats_store.start()
+        self.game_stats = None
+        self.stats_view = None
+        
+        # LOAD screen: autosave and save slots (see save_slots.py)
+        self.load_entries = []
+        self.load_scroll = 0
+        self.load_message = ""
+        self.thumbnails = {}
+        self.notice = None
+        self.slot_requested = False
+        
+        # REPLAY screen: every delta of the current game (see replay_viewer.py)
+        self.record = None
+        self.replay = None
+        self.rect_timeline = pygame.Rect(40, c.SCREEN_HEIGHT - 40, c.SCREEN_WIDTH - 80, 14)
+        
+        # Asyncio runtime (run_async): background tasks, the thread that
+        # writes saves, and tile images decoded ahead of use
+        self.loop = None
+        self.tasks = set()
+        self.lookahead_task = None
+        self.io_executor = None
+        self.decoded = {}
+        
+        # Ranked hints, computed off the UI thread (see hint_service.py)
+        self.hint_service = HintService()
+        self.hint_service.start()
+        
+        # Input recording / scripted replay (see input_recorder.py)
+        self.input_recorder = None
+        self.input_replay = None
+        
+        # cProfile / tracemalloc capture (F5, or MAHJONG_PROFILE=1 at launch)
+        self.session_profiler = session_profiler.SessionProfiler()
+        if os.environ.get(session_profiler.ENV_VAR, "") not in ("", "0"):
+            self.session_profiler.start()
+        self.startup.mark("services")
+
+    def _load_ui_image(self, filename, w, h):
+        """Loads and scales an image from assets/ui (None if missing or unreadable)."""
+        try:
+            full_p = os.path.join("assets", "ui", filename)
+            if not os.path.exists(full_p): return None
+            img = self.backend.convert_alpha(pygame.image.load(full_p))
+            return pygame.transform.smoothscale(img, (w, h))
+        except Exception as e:
+            return None
+
+    def _load_rules_assets(self):
+        """Opens the rules font and example images the first time RULES is shown."""
+        if self.rules_medieval_font is not None: return
+        self.rules_medieval_font = fonts.load_font("Times New Roman", 24)
+        self.ui_images['ex_jack'] = self._load_ui_image("example_jack.jpg", 60, 90)
+        self.ui_images['ex_king'] = self._load_ui_image("example_king.jpg", 60, 90)
+
+    def _finish_startup(self):
+        """Work deferred until the first frame is on screen: audio, then the startup report."""
+        self.sound_manager.load()
+        if self.music_enabled:
+            self.sound_manager.play_music("music.mp3", 0.2)
+        self.startup.mark("audio (deferred)")
+        self.startup.report()
 
     # --- GAME FLOW CONTROL ---
 
@@ -153,79 +288,156 @@ class GameWindow:
                                If False, starts a new game with selected settings.
         """
         if load_saved:
-            self.board = Board("TURTLE", "MEDIUM")            
             if persistence.load_game(self):
-                self.state = "PLAYING"
-                self.game_state = "PLAYING"
-                self._load_images()
-                self._center_board()
-                return
-            else:
-                return 
+                self._enter_loaded_game()
+            return
         
-        # Initialize new board
-        self.board = Board(layout_mode=self.selected_map, difficulty=self.selected_diff)
+        # Take a pre-dealt board (built on the spot if the pool ran dry)
+        self.board = self.deal_pool.take(self.selected_map, self.selected_diff)
         self.score = 0
-        self.history = []
+        self.history.clear()
+        self._start_record()
         self.hint_tiles = []
+        self.selected_tile = None
         self.total_tiles = len(self.board.tiles) 
+        self._reset_game_stats()
 
         self.state = "PLAYING"
         self.game_state = "PLAYING"
         self._load_images()
         self._center_board()
+        self._position_changed()
 
-    def _center_board(self):
+    def _enter_loaded_game(self):
+        """Switches to a game just restored from a save."""
+        # Older saves have no replay: it starts from the loaded position
+        if self.record is None: self._start_record()
+        else: self.history.journal = self.record.steps
+        self.selected_tile = None
+        self.hint_tiles = []
+        self.state = "PLAYING"
+        self.game_state = "PLAYING"
+        self._load_images()
+        self._center_board()
+        self._position_changed()
+
+    def _load_slot(self, slot):
         """
-        Calculates the rendering offset (start_x, start_y) to ensure the 
-        game board is centered on the screen based on its dimensions.
+        Loads a save slot, decoding its board only now.
+        
+        Returns:
+            bool: False if the slot could not be read.
+        """
+        data = save_slots.read_slot(slot)
+        if data is None or not persistence.restore_game(self, data): return False
+        self._enter_loaded_game()
+        return True
+
+    def _save_to_slot(self):
         """
-        if not self.board.tiles: return
-        xs = [t.x for t in self.board.tiles]
-        ys = [t.y for t in self.board.tiles]
-        min_x, max_x = min(xs), max(xs)
-        min_y, max_y = min(ys), max(ys)
+        Saves the current game into a free (or the oldest) slot, with a screenshot.
         
-        board_width = ((max_x - min_x) * c.TILE_SCALE_X) + c.VISUAL_WIDTH
-        board_height = ((max_y - min_y) * c.TILE_SCALE_Y) + c.VISUAL_HEIGHT
+        Called once the frame is drawn: the frame is read back through the
+        backend, since texture backends never draw the tiles onto the screen surface.
+        """
+        self.slot_requested = False
+        slot = save_slots.free_slot()
+        thumb = pygame.transform.smoothscale(self.backend.screenshot(), save_slots.THUMBNAIL_SIZE)
+        thumbnail = (*save_slots.THUMBNAIL_SIZE, pygame.image.tostring(thumb, "RGB"))
+        data = persistence.capture_game(self)
+        if self.loop is None:
+            save_slots.write_slot(slot, data, thumbnail)
+        else:
+            self.loop.run_in_executor(self.io_executor, save_slots.write_slot, slot, data, thumbnail)
+        self.sound_manager.play("click")
+        self.notice = (f"SAVED TO SLOT {slot + 1}", self.frame_count + 2 * c.FPS)
+
+    def _start_record(self):
+        """Starts recording the game for replays from the current position."""
+        self.record = GameRecord.from_board(self.board)
+        self.history.journal = self.record.steps
+
+    def _reset_game_stats(self):
+        """Starts counting the statistics of a new game."""
+        self.game_stats = {"started": time.time(), "elapsed": 0.0, "moves": 0,
+                           "hints": 0, "shuffles": 0, "recorded": False}
+
+    def _record_game(self):
+        """
+        Hands a finished game (won, or lost and left) to the stats store, once.
         
-        self.start_x = (c.SCREEN_WIDTH - board_width) // 2 - (min_x * c.TILE_SCALE_X)
-        self.start_y = (c.SCREEN_HEIGHT - board_height) // 2 - (min_y * c.TILE_SCALE_Y) + 30
+        A lost game is only recorded when the player leaves it, since undo
+        or shuffle can still bring it back into play.
+        """
+        stats = self.game_stats
+        if not self.board or not stats or stats["recorded"]: return
+        if self.game_state not in ("WON", "LOST"): return
+        stats["recorded"] = True
+        moves = [(kind, a, b) if kind == PAIR else (kind, None, None)
+                 for kind, _, a, b in self.history.applied()]
+        self.stats_store.record_game({
+            "layout": self.board.layout_mode,
+            "difficulty": self.board.difficulty,
+            "seed": self.board.seed,
+            "score": self.score,
+            "duration": stats["elapsed"] + time.time() - stats["started"],
+            "moves": stats["moves"],
+            "hints": stats["hints"],
+            "shuffles": stats["shuffles"],
+            "outcome": self.game_state,
+        }, moves)
+
+    def _center_board(self):
+        """
+        Attaches the current board to the renderer and points the camera
+        at its center. Boards that do not fit on screen are zoomed out.
+        """
+        self.renderer.set_board(self.board, self.images)
+        self.renderer.fit_to_board(margin_top=30)
 
     def _load_images(self):
         """
         Dynamically loads card images from the assets folder.
         Only loads images required for the current board to optimize memory.
         """
-        base_path = "assets"
-        if not os.path.exists(base_path): return
-        extensions = [".jpg", ".png", ".jpeg", ".JPG", ".PNG"]
+        if not os.path.exists("assets"): return
         self.images = {}
         
         for tile in self.board.tiles:
-            # Construct filename based on suit and value
-            base_name = ""
-            if tile.suit in [c.SUIT_COINS, c.SUIT_CUPS, c.SUIT_SWORDS]:
-                name = "Ace" if tile.value == 1 else str(tile.value)
-                base_name = f"{name}_of_{tile.suit}"
-            elif tile.suit == c.TYPE_KNIGHT: base_name = f"Knight_of_{tile.value}"
-            elif tile.suit == c.TYPE_JOKER: base_name = f"Joker_{tile.value}"
-            elif tile.suit == c.TYPE_JACK: base_name = f"Jack_of_{tile.value}"
-            elif tile.suit == c.TYPE_KING: base_name = f"King_of_{tile.value}"
-
-            if base_name:
-                key = f"{tile.suit}_{tile.value}"
-                if key in self.images: continue
-                # Try to find the file with supported extensions
-                for ext in extensions:
-                    full_path = os.path.join(base_path, base_name + ext)
-                    if os.path.exists(full_path):
-                        try:
-                            img = pygame.image.load(full_path).convert_alpha()
-                            img = pygame.transform.smoothscale(img, (c.VISUAL_WIDTH-2, c.VISUAL_HEIGHT-2))
-                            self.images[key] = img
-                            break
-                        except: pass
+            key = f"{tile.suit}_{tile.value}"
+            if key in self.images: continue
+            full_path = self._tile_image_path(tile.suit, tile.value)
+            if full_path is None: continue
+            try:
+                # Already decoded and scaled by the asyncio runtime?
+                img = self.decoded.get(full_path)
+                if img is not None:
+                    self.images[key] = self.backend.convert_alpha(img)
+                    continue
+                img = self.backend.convert_alpha(pygame.image.load(full_path))
+                img = pygame.transform.smoothscale(img, (c.VISUAL_WIDTH-2, c.VISUAL_HEIGHT-2))
+                self.images[key] = img
+            except: pass
+
+    @staticmethod
+    def _tile_image_path(suit, value):
+        """Returns the image file of a face in assets/, or None if there is none."""
+        # Construct filename based on suit and value
+        base_name = ""
+        if suit in [c.SUIT_COINS, c.SUIT_CUPS, c.SUIT_SWORDS]:
+            name = "Ace" if value == 1 else str(value)
+            base_name = f"{name}_of_{suit}"
+        elif suit == c.TYPE_KNIGHT: base_name = f"Knight_of_{value}"
+        elif suit == c.TYPE_JOKER: base_name = f"Joker_{value}"
+        elif suit == c.TYPE_JACK: base_name = f"Jack_of_{value}"
+        elif suit == c.TYPE_KING: base_name = f"King_of_{value}"
+        if not base_name: return None
+        
+        # Try to find the file with supported extensions
+        for ext in [".jpg", ".png", ".jpeg", ".JPG", ".PNG"]:
+            full_path = os.path.join("assets", base_name + ext)
+            if os.path.exists(full_path): return full_path
+        return None
 
     # --- MAIN LOOP ---
 
@@ -235,62 +447,311 @@ class GameWindow:
         Responsible for Event Handling, Update Logic, and Rendering.
         """
         running = True
+        prof = self.profiler
         while running:
-            # 1. EVENT HANDLING
-            for event in pygame.event.get():
-                if event.type == pygame.QUIT:
-                    if self.state == "PLAYING" and self.game_state == "PLAYING":
-                        persistence.save_game(self)
-                    running = False
-                
-                elif event.type == pygame.KEYDOWN:
-                    # ESCAPE: Save and Exit
-                    if event.key == pygame.K_ESCAPE:
-                        if self.state == "PLAYING" and self.game_state == "PLAYING":
-                            persistence.save_game(self)
-                        running = False
-                    
-                    # 'S': Shuffle Board
-                    if event.key == pygame.K_s:
-                        if self.state == "PLAYING": self._shuffle_game()
-                    
-                    # 'H': Toggle Rules
-                    if event.key == pygame.K_h:
-                         if self.state == "MENU": self.state = "RULES"
-                         elif self.state == "RULES": self.state = "MENU"
-
-                    # 'M': Return to Menu
-                    if event.key == pygame.K_m:
-                        if self.state == "PLAYING" and self.game_state == "PLAYING":
-                            persistence.save_game(self)
-                        self.state = "MENU"
-                    
-                    # 'U': Undo Move
-                    if event.key == pygame.K_u:
-                        if self.state == "PLAYING": 
-                            self._undo_move()
-                
-                elif event.type == pygame.MOUSEBUTTONDOWN:
-                    if event.button == 1:
-                        if self.state == "MENU": self._handle_menu_click(event.pos)
-                        elif self.state == "PLAYING": self._handle_game_click(event.pos)
-                        elif self.state == "RULES": self.state = "MENU"
-            
-            # 2. DRAWING PHASE
-            # Draw Background
-            if self.background_img:
-                self.screen.blit(self.background_img, (0,0))
+            running = self._run_frame()
+            self.clock.tick(self.fps)
+            prof.mark("tick")
+            prof.end_frame()
+            self.frame_count += 1
+        self._shutdown()
+
+    def _run_frame(self):
+        """
+        Handles the events of one frame, updates and draws it.
+        
+        Returns:
+            bool: False once an event asked the game to exit.
+        """
+        running = True
+        prof = self.profiler
+        prof.begin_frame(self.frame_count)
+        
+        # 1. EVENT HANDLING
+        events = pygame.event.get()
+        if self.input_replay:
+            events = self.input_replay.events_for(self.frame_count)
+        elif self.input_recorder:
+            self.input_recorder.record(self.frame_count, events)
+        prof.mark("events")
+        for event in events:
+            if not self._handle_event(event): running = False
+        # The asyncio runtime searches in its own task instead
+        if self.loop is None: self._update_lookahead()
+        if self.replay:
+            # Fixed step per frame, so recorded sessions replay identically
+            self.renderer.tiles_changed(self.replay.update(1 / c.FPS))
+        prof.mark("logic")
+        
+        # 2. DRAWING PHASE
+        self._draw_frame()
+        # Slot saves wait for a finished frame to take their screenshot from
+        if self.slot_requested: self._save_to_slot()
+        self.backend.present()
+        prof.mark("flip")
+        if self.frame_count == 0:
+            self.startup.mark("first_frame")
+            self._finish_startup()
+        return running
+
+    def _shutdown(self):
+        """Stops the background work and closes pygame."""
+        if self.input_recorder: self.input_recorder.save()
+        self.deal_pool.stop()
+        self.hint_service.stop()
+        self.stats_store.stop()
+        self.stats_store.close()
+        self.session_profiler.stop()
+        pygame.quit()
+
+    # --- ASYNCIO RUNTIME ---
+
+    async def run_async(self):
+        """
+        Asyncio version of run().
+        
+        Each frame runs the same frame body as run(), then the coroutine
+        sleeps until the next frame is due instead of blocking in
+        clock.tick, so the event loop fits other work in between: saves
+        written on an I/O thread, tile images decoded ahead of use, and the
+        dead-end search as a cancellable task with a deadline.
+        """
+        self.loop = asyncio.get_running_loop()
+        self.io_executor = ThreadPoolExecutor(max_workers=1, thread_name_prefix="game-io")
+        self._spawn(self._prefetch_tile_images())
+        self._restart_lookahead()
+        
+        running = True
+        prof = self.profiler
+        next_frame = self.loop.time()
+        while running:
+            running = self._run_frame()
+            # Frame pacing by the loop (no cap when fps is 0); a late
+            # frame does not make the following ones rush to catch up
+            if self.fps:
+                next_frame = max(next_frame + 1 / self.fps, self.loop.time())
+                await asyncio.sleep(next_frame - self.loop.time())
             else:
-                self.screen.fill(c.COLOR_BACKGROUND)
+                await asyncio.sleep(0)
+            prof.mark("tick")
+            prof.end_frame()
+            self.frame_count += 1
+        
+        for task in list(self.tasks): task.cancel()
+        await asyncio.gather(*self.tasks, return_exceptions=True)
+        # Saves still queued are written before exiting
+        self.io_executor.shutdown(wait=True)
+        self.loop = None
+        self._shutdown()
+
+    def _spawn(self, coro, deadline=None):
+        """
+        Runs a coroutine as a background task of the asyncio runtime.
+        
+        Args:
+            coro (coroutine): The work.
+            deadline (float | None): Seconds after which it is cancelled.
             
-            # Draw specific state
-            if self.state == "MENU": self._draw_menu()
-            elif self.state == "PLAYING": self._draw_game()
-            elif self.state == "RULES": self._draw_rules()
-                
-            pygame.display.flip()
-            self.clock.tick(c.FPS)
-        pygame.quit()
+        Returns:
+            asyncio.Task: The task (cancel it to stop the work).
+        """
+        if deadline is not None: coro = asyncio.wait_for(coro, deadline)
+        task = self.loop.create_task(coro)
+        self.tasks.add(task)
+        task.add_done_callback(self._task_done)
+        return task
+
+    def _task_done(self, task):
+        self.tasks.discard(task)
+        # Timeouts and failures of background work are not fatal to the game
+        if not task.cancelled(): task.exception()
+
+    def _restart_lookahead(self):
+        """Replaces the dead-end search task with one for the current position."""
+        if self.lookahead_task: self.lookahead_task.cancel()
+        self.lookahead_task = None
+        if self.loop and self.solver and self.board:
+            self.lookahead_task = self._spawn(self._lookahead(), LOOKAHEAD_DEADLINE)
+
+    async def _lookahead(self):
+        """Searches the current position in LOOKAHEAD_BUDGET slices until a verdict."""
+        while True:
+            if self.state == "PLAYING" and self.game_state == "PLAYING":
+                verdict = self.solver.step(LOOKAHEAD_BUDGET)
+                if verdict == DEAD: self.doomed = True
+                if verdict != UNKNOWN: return
+            await asyncio.sleep(LOOKAHEAD_BUDGET)
+
+    async def _prefetch_tile_images(self):
+        """Decodes and scales every tile image on a worker thread, ahead of the first game."""
+        for suit, value in FACES:
+            path = self._tile_image_path(suit, value)
+            if path is None or path in self.decoded: continue
+            img = await self.loop.run_in_executor(None, self._decode_tile_image, path)
+            if img is not None: self.decoded[path] = img
+
+    @staticmethod
+    def _decode_tile_image(path):
+        """Loads and scales a tile image (safe off the UI thread: no display access)."""
+        try:
+            img = pygame.image.load(path)
+            return pygame.transform.smoothscale(img, (c.VISUAL_WIDTH-2, c.VISUAL_HEIGHT-2))
+        except Exception:
+            return None
+
+    def _save_game(self):
+        """Saves the session; the asyncio runtime writes the file on its I/O thread."""
+        if self.loop is None:
+            persistence.save_game(self)
+        else:
+            self.loop.run_in_executor(self.io_executor, persistence.write_save,
+                                      persistence.capture_game(self))
+
+    def _delete_save(self):
+        """Deletes the save file, after any save still being written."""
+        if self.loop is None:
+            persistence.delete_save()
+        else:
+            self.loop.run_in_executor(self.io_executor, persistence.delete_save)
+
+    def _handle_event(self, event):
+        """
+        Dispatches a single pygame event.
+        
+        Returns:
+            bool: False if the event asks the game to exit, True otherwise.
+        """
+        if event.type == pygame.QUIT:
+            if self.state == "REPLAY": self._close_replay()
+            if self.state == "PLAYING" and self.game_state == "PLAYING":
+                self._save_game()
+            self._record_game()
+            return False
+        
+        elif event.type == pygame.KEYDOWN:
+            # Replay controls (SPACE, arrows, PAGE UP/DOWN, HOME/END)
+            if self.state == "REPLAY" and event.key in REPLAY_KEYS:
+                self._replay_action(*REPLAY_KEYS[event.key])
+                return True
+            
+            # 'V': Open/Close the Replay of the Game (ESC and 'M' leave it too)
+            if event.key == pygame.K_v:
+                if self.state == "PLAYING": self._open_replay()
+                elif self.state == "REPLAY": self._close_replay()
+            elif self.state == "REPLAY" and event.key in (pygame.K_ESCAPE, pygame.K_m):
+                self._close_replay()
+                return True
+            
+            # ESCAPE: Save and Exit
+            if event.key == pygame.K_ESCAPE:
+                if self.state == "PLAYING" and self.game_state == "PLAYING":
+                    self._save_game()
+                self._record_game()
+                return False
+            
+            # 'S': Shuffle Board
+            if event.key == pygame.K_s:
+                if self.state == "PLAYING": self._shuffle_game()
+            
+            # 'H': Toggle Rules
+            if event.key == pygame.K_h:
+                 if self.state == "MENU": self.state = "RULES"
+                 elif self.state == "RULES": self.state = "MENU"
+
+            # 'M': Return to Menu
+            if event.key == pygame.K_m:
+                if self.state == "PLAYING" and self.game_state == "PLAYING":
+                    self._save_game()
+                self._record_game()
+                self.state = "MENU"
+            
+            # 'U': Undo Move
+            if event.key == pygame.K_u:
+                if self.state == "PLAYING": 
+                    self._undo_move()
+            
+            # 'K': Keep a Copy in a Save Slot
+            if event.key == pygame.K_k:
+                if self.state == "PLAYING" and self.game_state == "PLAYING":
+                    self.slot_requested = True
+            
+            # 'R': Redo Undone Move
+            if event.key == pygame.K_r:
+                if self.state == "PLAYING":
+                    self._redo_move()
+            
+            # 'C': Re-center Camera
+            if event.key == pygame.K_c:
+                if self.state in ("PLAYING", "REPLAY"): self.renderer.fit_to_board(margin_top=30)
+            
+            # Arrows: Pan Camera
+            if self.state == "PLAYING" and event.key in PAN_KEYS:
+                self.renderer.camera.pan(*PAN_KEYS[event.key])
+            
+            # F3: Toggle Frame Profiler / F4: Dump Samples to CSV
+            if event.key == pygame.K_F3:
+                self.profiler.toggle()
+            if event.key == pygame.K_F4 and self.profiler.count:
+                print(f"Frame profile written to {self.profiler.dump_csv()}")
+            
+            # F5: Start/Stop cProfile + tracemalloc Capture
+            if event.key == pygame.K_F5:
+                self.session_profiler.toggle()
+        
+        elif event.type == pygame.MOUSEBUTTONDOWN:
+            self.mouse_pos = event.pos
+            if event.button == 1:
+                if self.state == "MENU": self._handle_menu_click(event.pos)
+                elif self.state == "PLAYING": self._handle_game_click(event.pos)
+                elif self.state in ("RULES", "STATS"): self.state = "MENU"
+                elif self.state == "LOAD": self._handle_load_click(event.pos)
+                elif self.state == "REPLAY": self._handle_replay_click(event.pos)
+            # Right or middle button: start dragging the camera
+            elif event.button in (2, 3):
+                self.panning = self.state in ("PLAYING", "REPLAY")
+        
+        elif event.type == pygame.MOUSEBUTTONUP:
+            if event.button in (2, 3): self.panning = False
+        
+        elif event.type == pygame.MOUSEMOTION:
+            self.mouse_pos = event.pos
+            if self.panning: self.renderer.camera.pan(*event.rel)
+        
+        elif event.type == pygame.MOUSEWHEEL:
+            # Zoom around the last known cursor position (kept from events
+            # rather than polled, so recorded sessions replay identically)
+            if self.state in ("PLAYING", "REPLAY"):
+                self.renderer.camera.zoom_at(event.y, self.mouse_pos)
+            elif self.state == "LOAD":
+                last = max(0, len(self.load_entries) - LOAD_ROWS)
+                self.load_scroll = max(0, min(last, self.load_scroll - event.y))
+        return True
+
+    def _draw_frame(self):
+        """Draws the background, the current screen and the profiler overlay."""
+        prof = self.profiler
+        self.backend.draw_background(self.background_img)
+        
+        # Draw specific state
+        if self.state == "MENU":
+            self._draw_menu(); prof.mark("draw_menu")
+        elif self.state == "PLAYING":
+            self._draw_game(); prof.mark("draw_game")
+        elif self.state == "RULES":
+            self._draw_rules(); prof.mark("draw_rules")
+        elif self.state == "STATS":
+            self._draw_stats(); prof.mark("draw_stats")
+        elif self.state == "LOAD":
+            self._draw_load(); prof.mark("draw_load")
+        elif self.state == "REPLAY":
+            self._draw_replay(); prof.mark("draw_replay")
+        
+        if prof.enabled:
+            # The overlay goes over the board (read back on texture backends)
+            self.backend.begin_overlay()
+            prof.draw_overlay(self.screen)
+        self.backend.finish()
+        prof.mark("overlay")
 
     # --- LOGIC HANDLERS ---
 
@@ -305,10 +766,11 @@ class GameWindow:
         if self.rect_diff1.collidepoint(pos): self.selected_diff = "EASY"
         if self.rect_diff2.collidepoint(pos): self.selected_diff = "MEDIUM"
         if self.rect_diff3.collidepoint(pos): self.selected_diff = "HARD"
+        self.deal_pool.prefer(self.selected_map, self.selected_diff)
         
         # Action Buttons
         if self.rect_play.collidepoint(pos): self._start_game(load_saved=False)
-        if self.rect_load.collidepoint(pos): self._start_game(load_saved=True)
+        if self.rect_load.collidepoint(pos): self._open_load_menu()
         
         # Settings
         if self.rect_music.collidepoint(pos):
@@ -317,6 +779,7 @@ class GameWindow:
             else: self.sound_manager.stop_music()
             
         if self.rect_rules.collidepoint(pos): self.state = "RULES"
+        if self.rect_stats.collidepoint(pos): self._open_stats()
 
     def _handle_game_click(self, pos):
         """
@@ -325,7 +788,8 @@ class GameWindow:
         """
         # Check UI Buttons
         if self.btn_menu.collidepoint(pos):
-            persistence.save_game(self)
+            self._save_game()
+            self._record_game()
             self.state = "MENU"
             return
         if self.btn_undo.collidepoint(pos):
@@ -335,80 +799,141 @@ class GameWindow:
         if self.btn_shuffle.collidepoint(pos):
             self._shuffle_game(); return
             
-        # Check Tile Selection (Raycasting / Collision logic)
+        # Check Tile Selection (top-most tile under the cursor)
         self.hint_tiles = []
-        # Sort reverse to click top-most tiles first
-        tiles_rev = sorted(self.board.tiles, key=lambda t: (t.z, t.y, t.x), reverse=True)
+        tile = self.renderer.tile_at(pos)
+        if tile is None: return
         
-        for tile in tiles_rev:
-            if not tile.is_visible: continue
-            
-            px = self.start_x + (tile.x * c.TILE_SCALE_X) + (tile.z * c.LAYER_SHIFT_X)
-            py = self.start_y + (tile.y * c.TILE_SCALE_Y) + (tile.z * c.LAYER_SHIFT_Y)
-            tr = pygame.Rect(px, py, c.VISUAL_WIDTH, c.VISUAL_HEIGHT)
-            
-            if tr.collidepoint(pos):
-                # Validate move
-                if not self.board.can_move(tile):
-                    self.sound_manager.play("error")
-                    return
-                
-                self.sound_manager.play("click")
-                
-                # Selection Logic
-                if self.selected_tile is None:
-                    self.selected_tile = tile
-                    tile.is_selected = True
-                elif self.selected_tile == tile:
-                    self.selected_tile = None
-                    tile.is_selected = False
-                else:
-                    # Attempt Match
-                    if self.board.is_match(tile, self.selected_tile):
-                        self.sound_manager.play("match")
-                        tile.is_visible = False
-                        self.selected_tile.is_visible = False
-                        self.history.append((tile, self.selected_tile, 100))
-                        self.score += 100
-                        self.total_tiles -= 2 
-                        self.selected_tile = None
-                        self._check_game_status()
-                    else:
-                        self.sound_manager.play("error")
-                        self.selected_tile.is_selected = False
-                        tile.is_selected = True
-                        self.selected_tile = tile
-                return
+        # Validate move
+        if not self.board.can_move(tile):
+            self.sound_manager.play("error")
+            return
+        
+        self.sound_manager.play("click")
+        
+        # Selection Logic
+        if self.selected_tile is None:
+            self.selected_tile = tile
+            tile.is_selected = True
+        elif self.selected_tile == tile:
+            self.selected_tile = None
+            tile.is_selected = False
+        else:
+            # Attempt Match
+            if self.board.is_match(tile, self.selected_tile):
+                self.sound_manager.play("match")
+                self.board.remove_tiles(tile, self.selected_tile)
+                self.history.record_pair(self.board.index_of[tile.id],
+                                         self.board.index_of[self.selected_tile.id], 100)
+                self.renderer.tiles_changed((tile, self.selected_tile))
+                self.score += 100
+                self.game_stats["moves"] += 1
+                self.total_tiles -= 2 
+                self.selected_tile = None
+                self._check_game_status()
+            else:
+                self.sound_manager.play("error")
+                self.selected_tile.is_selected = False
+                tile.is_selected = True
+                self.selected_tile = tile
 
     def _undo_move(self):
         """
-        Reverts the last successful matching move.
-        Restores the tiles to the board and deducts score.
+        Reverts the last move (a match or a shuffle).
+        Takes back the points it changed and deducts the undo cost.
         """
         if self.score < 100: 
             self.sound_manager.play("error")
             return
-        if self.history:
-            t1, t2, pts = self.history.pop()
-            t1.is_visible = t2.is_visible = True
-            t1.is_selected = t2.is_selected = False
+        step = self.history.undo(self.board)
+        if step:
+            kind, pts, changed = step
             self.score -= pts
-            self.total_tiles += 2
             self.sound_manager.play("undo")
             self.score = max(0, self.score - 100)
-            
-            # If game was lost, undoing allows playing again
-            if self.game_state == "LOST": self.game_state = "PLAYING"
+            self._apply_log_step(kind, changed, +2)
+
+    def _redo_move(self):
+        """Replays the last undone move, with the points it gave or cost."""
+        step = self.history.redo(self.board)
+        if not step:
+            self.sound_manager.play("error")
+            return
+        kind, pts, changed = step
+        self.score = max(0, self.score + pts)
+        self.sound_manager.play("click")
+        self._apply_log_step(kind, changed, -2)
+
+    def _apply_log_step(self, kind, changed, tile_delta):
+        """Updates counters and rendering after an undo or redo."""
+        if kind == PAIR:
+            self.total_tiles += tile_delta
+            self.renderer.tiles_changed(changed)
+        else:
+            self.renderer.invalidate()
+        if self.selected_tile: self.selected_tile.is_selected = False
+        self.selected_tile = None
+        self.hint_tiles = []
+        
+        # If game was lost, undoing allows playing again
+        if self.game_state == "LOST": self.game_state = "PLAYING"
+        self._check_game_status()
+
+    # --- REPLAY ---
+
+    def _open_replay(self):
+        """Shows the game so far from its first move, on a board of its own."""
+        if not self.record: return
+        self.replay = ReplayViewer(self.record)
+        self.state = "REPLAY"
+        self.panning = False
+        self.renderer.set_board(self.replay.board, self.images)
+
+    def _close_replay(self):
+        """Returns to the game where it was left."""
+        self.replay = None
+        self.state = "PLAYING"
+        self.renderer.set_board(self.board, self.images)
+
+    def _replay_action(self, action, arg):
+        """Applies a replay control: play, step, seek (-1: the end) or speed."""
+        viewer = self.replay
+        if action == "play": changed = viewer.toggle_play()
+        elif action == "step": changed = viewer.step(arg)
+        elif action == "seek": changed = viewer.seek(viewer.length if arg < 0 else arg)
+        else:
+            viewer.change_speed(arg)
+            return
+        self.renderer.tiles_changed(changed)
+
+    def _handle_replay_click(self, pos):
+        """Jumps to the clicked point of the timeline; BACK returns to the game."""
+        if self.btn_menu.collidepoint(pos):
+            self._close_replay()
+            return
+        bar = self.rect_timeline.inflate(0, 16)
+        if bar.collidepoint(pos):
+            fraction = (pos[0] - self.rect_timeline.x) / self.rect_timeline.width
+            self.renderer.tiles_changed(self.replay.seek_fraction(max(0.0, min(fraction, 1.0))))
 
     def _activate_hint(self):
         """Highlights a pair of matching free tiles if available."""
         if self.score < 50: 
             self.sound_manager.play("error")
             return
-        pair = self.board.get_hint_pair()
+        # Best pair ranked so far in the background; the first free pair
+        # if the service has not scored this position yet
+        pair = None
+        ranked = self.hint_service.best()
+        if ranked:
+            t1, t2 = self.board.tiles[ranked[0]], self.board.tiles[ranked[1]]
+            if t1.is_visible and t2.is_visible: pair = (t1, t2)
+        if pair is None:
+            pair = self.board.get_hint_pair()
         if pair:
             self.hint_tiles = [pair[0], pair[1]]
             self.score = max(0, self.score - 50)
+            self.game_stats["hints"] += 1
             self.sound_manager.play("hint")
 
     def _shuffle_game(self):
@@ -419,14 +944,19 @@ class GameWindow:
         if self.total_tiles > 0:
             self.sound_manager.play("shuffle")
             self.score = max(0, self.score - 150)
-            for _ in range(100):
-                self.board.shuffle_remaining()
-                if self.board.has_valid_moves(): break
+            self.game_stats["shuffles"] += 1
+            # One constructive pass; only a position that no order of faces
+            # could clear falls back to shuffling until a pair is free
+            before = self.board.faces
+            if not self.board.shuffle_solvable():
+                self.board.shuffle_until_playable(max_attempts=100)
+            self.history.record_shuffle(before, self.board.faces, -150)
+            self.renderer.invalidate()
             
             self.game_state = "PLAYING" 
-            self.history = []
             self.selected_tile = None
             self.hint_tiles = []
+            self._position_changed()
             
     def _check_game_status(self):
         """Checks victory or defeat conditions after every move."""
@@ -434,10 +964,34 @@ class GameWindow:
         if visible_count == 0:
             self.game_state = "WON"
             self.sound_manager.play("win")
-            persistence.delete_save()
+            self._delete_save()
+            self._record_game()
         elif not self.board.has_valid_moves():
             self.game_state = "LOST"
             self.sound_manager.play("lose")
+        else:
+            self._position_changed()
+
+    def _position_changed(self):
+        """Restarts the background analysis (dead ends, hint ranking) for the current position."""
+        self.doomed = False
+        if not self.board: return
+        if self.solver: self.solver.start(self.board)
+        self.hint_service.update(self.board)
+        self._restart_lookahead()
+
+    def _update_lookahead(self):
+        """
+        Runs one frame's worth of dead-end search.
+        
+        The search resumes where the previous frame left it and checks the
+        clock on every node, so a frame spends LOOKAHEAD_BUDGET plus at
+        most one node (O(free tiles)) on it.
+        """
+        if not self.solver or self.doomed: return
+        if self.state != "PLAYING" or self.game_state != "PLAYING": return
+        if self.solver.step(LOOKAHEAD_BUDGET) == DEAD:
+            self.doomed = True
 
     # --- DRAWING METHODS ---
 
@@ -502,10 +1056,12 @@ class GameWindow:
         temp_font = self.menu_font; self.menu_font = self.ui_font 
         draw_text_btn(self.rect_music, music_txt)
         draw_text_btn(self.rect_rules, "Rules (H)")
+        draw_text_btn(self.rect_stats, "Stats")
         self.menu_font = temp_font
 
     def _draw_rules(self):
         """Draws the Rules Overlay with graphical examples."""
+        self._load_rules_assets()
         box_w, box_h = 1000, 650
         overlay = pygame.Surface((box_w, box_h))
         overlay.fill((55, 45, 35)) # Dark parchment style
@@ -538,7 +1094,9 @@ class GameWindow:
             "4. BUTTONS:",
             "   - HINT (-50 points): Shows a possible match.",
             "   - SHUFFLE (-150 points): Randomly rearranges remaining tiles.",
-            "   - UNDO (-100 points): Reverts the last move.",
+            "   - UNDO (-100 points): Reverts the last move ('R' redoes it).",
+            "   - 'K' keeps a copy in a save slot (see LOAD GAME), 'V' replays the game.",
+            "5. VIEW: Mouse wheel zooms, right-drag or arrows pan, 'C' re-centers.",
             "",
             "Press 'M' to return to Menu."
         ]
@@ -566,6 +1124,131 @@ class GameWindow:
         if img_king:
             self.screen.blit(img_king, (images_x, current_img_y))
 
+    def _open_stats(self):
+        """Switches to the STATS screen, querying the aggregates once."""
+        self.stats_view = (self.stats_store.summary(),
+                           self.stats_store.leaderboard(self.selected_map, self.selected_diff, limit=5))
+        self.state = "STATS"
+
+    def _draw_stats(self):
+        """Draws totals per layout and difficulty, and the best scores of the selected ones."""
+        summary, leaderboard = self.stats_view or ([], [])
+        box_w, box_h = 900, 600
+        rect = pygame.Rect(0, 0, box_w, box_h)
+        rect.center = (c.SCREEN_WIDTH//2, c.SCREEN_HEIGHT//2)
+        
+        # Dim background
+        s = pygame.Surface((c.SCREEN_WIDTH, c.SCREEN_HEIGHT), pygame.SRCALPHA)
+        s.fill((0, 0, 0, 180))
+        self.screen.blit(s, (0,0))
+        pygame.draw.rect(self.screen, (55, 45, 35), rect)
+        pygame.draw.rect(self.screen, (218, 165, 32), rect, 6)
+
+        header = self.menu_font.render("STATISTICS", True, (255, 215, 0))
+        self.screen.blit(header, (rect.centerx - header.get_width()//2, rect.y + 30))
+
+        # Table columns (left edges), so no monospaced font is needed
+        cols = (0, 160, 270, 370, 460, 560, 680)
+        rows = [("MAP", "LEVEL", "PLAYED", "WON", "WIN %", "BEST", "AVG TIME")]
+        for layout, difficulty, played, won, best, avg in summary:
+            rows.append((layout, difficulty, str(played), str(won), f"{100 * won / played:.0f}%",
+                         str(best), f"{int(avg) // 60}:{int(avg) % 60:02d}"))
+        y = rect.y + 100
+        for i, row in enumerate(rows):
+            col = (255, 215, 0) if i == 0 else (230, 230, 230)
+            for x, cell in zip(cols, row):
+                self.screen.blit(self.ui_font.render(cell, True, col), (rect.x + 50 + x, y))
+            y += 28
+        if not summary:
+            self.screen.blit(self.ui_font.render("No finished games yet.", True, (200, 200, 200)),
+                             (rect.x + 50, y))
+            y += 28
+
+        y += 28
+        title = f"BEST SCORES - {self.selected_map} {self.selected_diff}"
+        self.screen.blit(self.ui_font.render(title, True, (255, 215, 0)), (rect.x + 50, y))
+        for rank, (score, duration, moves, outcome, _) in enumerate(leaderboard, 1):
+            y += 28
+            line = (f"{rank}.  {score} pts   {moves} matches   "
+                    f"{int(duration) // 60}:{int(duration) % 60:02d}   {outcome}")
+            self.screen.blit(self.ui_font.render(line, True, (230, 230, 230)), (rect.x + 50, y))
+
+        foot = self.ui_font.render("Click anywhere to return", True, (150, 150, 150))
+        self.screen.blit(foot, (rect.centerx - foot.get_width()//2, rect.bottom - 45))
+
+    def _open_load_menu(self):
+        """Switches to the LOAD screen, listing saves from their headers only."""
+        self.load_entries = []
+        if os.path.exists(persistence.SAVE_FILE):
+            self.load_entries.append(None)  # autosave of the last game left
+        self.load_entries += save_slots.list_slots()
+        self.load_scroll = 0
+        self.load_message = "" if self.load_entries else "No saved games yet."
+        self.state = "LOAD"
+
+    def _load_row_rect(self, row):
+        """Screen rectangle of the row-th visible entry of the LOAD screen."""
+        return pygame.Rect(c.SCREEN_WIDTH//2 - 420, c.SCREEN_HEIGHT//2 - 200 + row * 100, 840, 94)
+
+    def _handle_load_click(self, pos):
+        """Loads the clicked save; a click outside the list returns to the menu."""
+        visible = self.load_entries[self.load_scroll:self.load_scroll + LOAD_ROWS]
+        for row, entry in enumerate(visible):
+            if not self._load_row_rect(row).collidepoint(pos): continue
+            if entry is None:
+                self._start_game(load_saved=True)
+                ok = self.state == "PLAYING"
+            else:
+                ok = self._load_slot(entry.slot)
+            if not ok: self.load_message = "This save could not be loaded."
+            return
+        self.state = "MENU"
+
+    def _thumbnail(self, header):
+        """Screenshot of a slot as a Surface, read from the file on first use."""
+        key = (header.slot, header.saved_at)
+        if key not in self.thumbnails:
+            thumb = save_slots.read_thumbnail(header)
+            self.thumbnails[key] = (pygame.image.frombuffer(thumb[2], thumb[:2], "RGB")
+                                    if thumb else None)
+        return self.thumbnails[key]
+
+    def _draw_load(self):
+        """Draws the list of saves: the autosave, then the slots, most recent first."""
+        rect = pygame.Rect(0, 0, 900, 640)
+        rect.center = (c.SCREEN_WIDTH//2, c.SCREEN_HEIGHT//2)
+        s = pygame.Surface((c.SCREEN_WIDTH, c.SCREEN_HEIGHT), pygame.SRCALPHA)
+        s.fill((0, 0, 0, 180))
+        self.screen.blit(s, (0,0))
+        pygame.draw.rect(self.screen, (55, 45, 35), rect)
+        pygame.draw.rect(self.screen, (218, 165, 32), rect, 6)
+        
+        header = self.menu_font.render("LOAD GAME", True, (255, 215, 0))
+        self.screen.blit(header, (rect.centerx - header.get_width()//2, rect.y + 25))
+        
+        visible = self.load_entries[self.load_scroll:self.load_scroll + LOAD_ROWS]
+        for row, entry in enumerate(visible):
+            row_rect = self._load_row_rect(row)
+            hover = row_rect.collidepoint(self.mouse_pos)
+            pygame.draw.rect(self.screen, (85, 70, 50) if hover else (70, 58, 42), row_rect)
+            pygame.draw.rect(self.screen, (150, 120, 60), row_rect, 2)
+            if entry is None:
+                title = "CONTINUE LAST GAME (AUTOSAVE)"
+                detail = time.strftime("%Y-%m-%d %H:%M", time.localtime(os.path.getmtime(persistence.SAVE_FILE)))
+            else:
+                thumb = self._thumbnail(entry)
+                if thumb: self.screen.blit(thumb, (row_rect.x + 2, row_rect.y + 2))
+                title = f"SLOT {entry.slot + 1} - {entry.layout} {entry.difficulty}"
+                detail = (f"Score {entry.score}   {entry.tiles_left} tiles left   "
+                          + time.strftime("%Y-%m-%d %H:%M", time.localtime(entry.saved_at)))
+            x = row_rect.x + save_slots.THUMBNAIL_SIZE[0] + 20
+            self.screen.blit(self.ui_font.render(title, True, (255, 255, 255)), (x, row_rect.y + 20))
+            self.screen.blit(self.ui_font.render(detail, True, (200, 200, 200)), (x, row_rect.y + 52))
+        
+        foot_text = self.load_message or "Click a save to load it, elsewhere to return. Wheel scrolls."
+        foot = self.ui_font.render(foot_text, True, (150, 150, 150))
+        self.screen.blit(foot, (rect.centerx - foot.get_width()//2, rect.bottom - 45))
+
     def _draw_game(self):
         """Draws the main gameplay screen."""
         # Top HUD Bar
@@ -587,49 +1270,64 @@ class GameWindow:
         # Score Display
         sc = self.ui_font.render(f"SCORE: {self.score}", True, (255,255,255))
         self.screen.blit(sc, (20, 15))
+        if self.notice and self.frame_count < self.notice[1]:
+            note = self.ui_font.render(self.notice[0], True, (120, 220, 120))
+            self.screen.blit(note, (40 + sc.get_width(), 15))
         
-        # Render Tiles (Sorted by depth)
-        vis = sorted(self.board.tiles, key=lambda t: (t.z, t.y, t.x))
-        for tile in vis:
-            if tile.is_visible: self._draw_tile(tile, self.start_x, self.start_y)
+        # Dead-end warning (the player may still undo or shuffle)
+        if self.doomed and self.game_state == "PLAYING":
+            warn = self.ui_font.render("CANNOT BE WON - UNDO OR SHUFFLE", True, (255, 80, 80))
+            self.screen.blit(warn, (c.SCREEN_WIDTH - warn.get_width() - 20, 15))
+        
+        # Render Tiles (only those inside the viewport, sorted by depth)
+        self.backend.draw_board(self.renderer, self.hint_tiles, self.selected_tile)
             
         # Game Over / Victory Messages
-        if self.game_state == "WON": self._draw_message("VICTORY!", (255, 215, 0))
-        elif self.game_state == "LOST": self._draw_message("NO MOVES LEFT", (255, 50, 50))
-
-    def _draw_tile(self, tile, ox, oy):
-        """Draws a single tile with 3D depth and shadows."""
-        pos_x = ox + (tile.x * c.TILE_SCALE_X) + (tile.z * c.LAYER_SHIFT_X)
-        pos_y = oy + (tile.y * c.TILE_SCALE_Y) + (tile.z * c.LAYER_SHIFT_Y)
-        depth = c.TILE_THICKNESS
-        
-        # 1. Shadow/Side
-        shadow_rect = pygame.Rect(pos_x + depth, pos_y + depth, c.VISUAL_WIDTH, c.VISUAL_HEIGHT)
-        pygame.draw.rect(self.screen, c.COLOR_TILE_SIDE, shadow_rect)
-        pygame.draw.rect(self.screen, (0,0,0), shadow_rect, 1)
-        
-        # 2. Top Face
-        face_rect = pygame.Rect(pos_x, pos_y, c.VISUAL_WIDTH, c.VISUAL_HEIGHT)
-        pygame.draw.rect(self.screen, c.COLOR_TILE_FACE, face_rect)
-        
-        # 3. Card Image
-        key = f"{tile.suit}_{tile.value}"
-        if key in self.images:
-            img = self.images[key]
-            self.screen.blit(img, img.get_rect(center=face_rect.center))
-            
-            # Effects (Highlight / Hint)
-            if tile.is_selected:
-                s = pygame.Surface((c.VISUAL_WIDTH, c.VISUAL_HEIGHT))
-                s.set_alpha(100); s.fill(c.COLOR_HIGHLIGHT)
-                self.screen.blit(s, (pos_x, pos_y))
-            elif tile in self.hint_tiles:
-                s = pygame.Surface((c.VISUAL_WIDTH, c.VISUAL_HEIGHT))
-                s.set_alpha(100); s.fill(c.COLOR_HINT)
-                self.screen.blit(s, (pos_x, pos_y))
-        
-        # 4. Border
-        pygame.draw.rect(self.screen, c.COLOR_BORDER, face_rect, 2)
+        if self.game_state != "PLAYING":
+            self.profiler.mark("draw_game")
+            self.backend.begin_overlay()
+            if self.game_state == "WON": self._draw_message("VICTORY!", (255, 215, 0))
+            elif self.game_state == "LOST": self._draw_message("NO MOVES LEFT", (255, 50, 50))
+            self.profiler.mark("draw_message")
+
+    def _draw_replay(self):
+        """Draws the replayed board, its HUD and the timeline."""
+        viewer = self.replay
+        pygame.draw.rect(self.screen, (30, 30, 30), (0, 0, c.SCREEN_WIDTH, 50))
+        pygame.draw.line(self.screen, (218, 165, 32), (0, 50), (c.SCREEN_WIDTH, 50), 3)
+        
+        pygame.draw.rect(self.screen, c.COLOR_BUTTON, self.btn_menu)
+        pygame.draw.rect(self.screen, (200,200,200), self.btn_menu, 2)
+        ts = self.ui_font.render("BACK", True, (255,255,255))
+        self.screen.blit(ts, ts.get_rect(center=self.btn_menu.center))
+        
+        status = "PLAYING" if viewer.playing else "PAUSED"
+        info = self.ui_font.render(f"REPLAY  MOVE {viewer.position} / {viewer.length}   "
+                                   f"{status} x{viewer.speed}", True, (255,255,255))
+        self.screen.blit(info, (20, 15))
+        
+        self.backend.draw_board(self.renderer, [], None)
+        self.profiler.mark("draw_replay")
+        self.backend.begin_overlay()
+        
+        # Timeline: played part, cursor, and a tick per keyframe
+        bar = self.rect_timeline
+        pygame.draw.rect(self.screen, (30, 30, 30), (0, bar.y - 38, c.SCREEN_WIDTH, c.SCREEN_HEIGHT))
+        pygame.draw.line(self.screen, (218, 165, 32), (0, bar.y - 38), (c.SCREEN_WIDTH, bar.y - 38), 3)
+        pygame.draw.rect(self.screen, (30, 30, 30), bar)
+        if viewer.length:
+            done = bar.width * viewer.position // viewer.length
+            pygame.draw.rect(self.screen, (218, 165, 32), (bar.x, bar.y, done, bar.height))
+            for k in range(len(viewer.keyframes)):
+                x = bar.x + bar.width * k * viewer.interval // viewer.length
+                pygame.draw.line(self.screen, (90, 90, 90), (x, bar.bottom), (x, bar.bottom + 4))
+            pygame.draw.rect(self.screen, (255, 255, 255), (bar.x + done - 2, bar.y - 4, 4, bar.height + 8))
+        pygame.draw.rect(self.screen, (200, 200, 200), bar, 1)
+        
+        keys = self.ui_font.render("SPACE play/pause   LEFT/RIGHT step   PAGE UP/DOWN 10 moves   "
+                                   "HOME/END   UP/DOWN speed   click the bar to jump   'V' back",
+                                   True, (200, 200, 200))
+        self.screen.blit(keys, (c.SCREEN_WIDTH//2 - keys.get_width()//2, bar.y - 30))
 
     def _draw_message(self, txt, col):
         """Draws a centered message overlay (e.g., Victory)."""
@@ -641,12 +1339,38 @@ class GameWindow:
         rect = ts.get_rect(center=(c.SCREEN_WIDTH//2, c.SCREEN_HEIGHT//2))
         self.screen.blit(ts, rect)
         
-        sub = self.ui_font.render("Press 'M' for Menu or 'ESC' to Exit", True, (200,200,200))
+        sub = self.ui_font.render("Press 'V' for the Replay, 'M' for Menu or 'ESC' to Exit", True, (200,200,200))
         self.screen.blit(sub, sub.get_rect(center=(c.SCREEN_WIDTH//2, rect.bottom + 20)))
         
         if self.game_state == "LOST":
             sub2 = self.ui_font.render("(Press 'U' to Undo or 'S' to Shuffle and continue)", True, (150,150,150))
             self.screen.blit(sub2, sub2.get_rect(center=(c.SCREEN_WIDTH//2, rect.bottom + 50)))
         
+def main():
+    """Parses command-line options and starts the game."""
+    import argparse
+    from display_backend import BACKENDS
+    
+    parser = argparse.ArgumentParser(description="Spanish Mahjong - Medieval Edition")
+    parser.add_argument("--renderer", choices=BACKENDS, default="blit",
+                        help="display backend (sdl2-software needs no GPU)")
+    parser.add_argument("--no-audio", action="store_true", help="do not initialize the mixer")
+    parser.add_argument("--no-lookahead", action="store_true",
+                        help="do not search for dead ends in the background")
+    parser.add_argument("--record", metavar="PATH",
+                        help="record the input stream for replay_benchmark.py")
+    parser.add_argument("--startup-profile", action="store_true",
+                        help="print the time spent in each startup phase")
+    parser.add_argument("--asyncio", action="store_true",
+                        help="run the frame loop as an asyncio coroutine")
+    args = parser.parse_args()
+    
+    recorder = InputRecorder(args.record) if args.record else None
+    game = GameWindow(backend=args.renderer, audio=not args.no_audio,
+                      lookahead=not args.no_lookahead, startup_profile=args.startup_profile)
+    game.input_recorder = recorder
+    if args.asyncio: asyncio.run(game.run_async())
+    else: game.run()
+
 if __name__ == "__main__":
-    GameWindow().run()
\ No newline at end of file
+    main()
\ No newline at end of file
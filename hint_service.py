@@ -0,0 +1,187 @@
+"""
+Hint Service Module.
+
+This module ranks hint candidates on a background thread, so pressing HINT
+never waits for a search. Every free matching pair gets a quick score
+(how many tiles its removal frees), then the best candidates are checked
+with a bounded solver search. The best pair found so far is published as
+soon as it is known and improves while the player thinks.
+"""
+
+import threading
+import time
+from solver import Solver, match_class, WINNABLE, DEAD
+
+# Score adjustments from the bounded search of the position after a pair
+WIN_BONUS = 1000
+DEAD_PENALTY = -1000
+
+
+class HintService:
+    """
+    Background ranking of the free matching pairs of the current position.
+
+    Attributes:
+        search_budget (float): Seconds of solver search per candidate.
+        slice_budget (float): Length of one search slice; the worker sleeps
+            as long between slices so the UI thread keeps the interpreter.
+        max_candidates (int): Candidates that get a solver search.
+    """
+
+    def __init__(self, search_budget=0.05, slice_budget=0.001, max_candidates=8, cache_size=4096):
+        """
+        Initializes an idle service. Call start() to launch the worker.
+
+        Args:
+            search_budget (float): Seconds of search per candidate.
+            slice_budget (float): Seconds per search slice.
+            max_candidates (int): Candidates searched per position.
+            cache_size (int): Positions whose best pair is remembered, keyed
+                by Board.state_key, so undo gets its hint back instantly.
+        """
+        self.search_budget = search_budget
+        self.slice_budget = slice_budget
+        self.max_candidates = max_candidates
+        self.cache_size = cache_size
+        self.cache = {}
+        self.state_key = None
+
+        self.lock = threading.Condition()
+        self.generation = 0
+        self.job = None
+        self.best_pair = None
+        self.best_score = None
+        self.thread = None
+        self.running = False
+
+    def update(self, board):
+        """
+        Hands a snapshot of the board's position to the worker.
+
+        Any ranking still running for an older position is abandoned.
+
+        Args:
+            board (Board): The board whose current position needs hints.
+        """
+        snapshot = board.snapshot()
+        # The face tuple is shared by every snapshot until the next shuffle,
+        # so it also tells the solver when its dead-position table still holds
+        job = (board.topology, snapshot.faces, snapshot.present(),
+               (board.topology, snapshot.faces), snapshot.solution)
+        with self.lock:
+            self.generation += 1
+            self.job = job
+            self.state_key = snapshot.state_key
+            self.best_pair, self.best_score = self.cache.get(snapshot.state_key, (None, None))
+            self.lock.notify_all()
+
+    def best(self):
+        """
+        Returns the best pair found so far for the latest position.
+
+        Returns:
+            tuple | None: (i, j) position indices, or None if nothing is ranked yet.
+        """
+        with self.lock:
+            return self.best_pair
+
+    # --- BACKGROUND WORKER ---
+
+    def start(self):
+        """Starts the ranking thread (a daemon, so it never blocks exit)."""
+        if self.thread: return
+        self.running = True
+        self.thread = threading.Thread(target=self._worker, name="hint-service", daemon=True)
+        self.thread.start()
+
+    def stop(self):
+        """Stops the ranking thread."""
+        if not self.thread: return
+        with self.lock:
+            self.running = False
+            self.lock.notify_all()
+        self.thread.join()
+        self.thread = None
+
+    def _publish(self, generation, scores):
+        """
+        Publishes the top-scoring pair, unless the position is outdated.
+
+        Returns:
+            bool: False if a newer position has been submitted meanwhile.
+        """
+        pair = max(scores, key=scores.get)
+        with self.lock:
+            if generation != self.generation: return False
+            self.best_pair, self.best_score = pair, scores[pair]
+            if len(self.cache) >= self.cache_size: self.cache.clear()
+            self.cache[self.state_key] = (pair, scores[pair])
+            return True
+
+    def _worker(self):
+        """Waits for positions and ranks them until a newer one arrives."""
+        solver = Solver()
+        while True:
+            with self.lock:
+                while self.running and self.job is None:
+                    self.lock.wait()
+                if not self.running: return
+                generation, job = self.generation, self.job
+                self.job = None
+            self._rank(generation, job, solver)
+
+    def _rank(self, generation, job, solver):
+        """Scores every candidate of one position, publishing improvements."""
+        topology, faces, present, faces_id, solution = job
+
+        # --- QUICK SCORE: tiles freed by the removal ---
+        free = [i for i, p in enumerate(present) if p and topology.is_free(i, present)]
+        candidates = []
+        for a in range(len(free)):
+            for b in range(a + 1, len(free)):
+                i, j = free[a], free[b]
+                if match_class(*faces[i]) == match_class(*faces[j]):
+                    candidates.append((self._unblock_score(topology, present, i, j), (i, j)))
+        if not candidates: return
+        candidates.sort(reverse=True)
+        scores = {pair: score for score, pair in candidates}
+        if not self._publish(generation, scores): return
+
+        # --- BOUNDED SEARCH: does the position stay winnable? ---
+        for _, (i, j) in candidates[:self.max_candidates]:
+            after = bytearray(present)
+            after[i] = after[j] = 0
+            solver.start_position(topology, faces, after, faces_id=faces_id, solution=solution)
+            spent = 0.0
+            while solver.verdict not in (WINNABLE, DEAD) and spent < self.search_budget:
+                solver.step(self.slice_budget)
+                spent += self.slice_budget
+                time.sleep(self.slice_budget)
+                if generation != self.generation or not self.running: return
+            if solver.verdict == WINNABLE: scores[(i, j)] += WIN_BONUS
+            elif solver.verdict == DEAD: scores[(i, j)] += DEAD_PENALTY
+            if not self._publish(generation, scores): return
+
+    @staticmethod
+    def _unblock_score(topology, present, i, j):
+        """
+        Counts the tiles a removal would free, with height as a tie-break.
+
+        Args:
+            topology (LayoutTopology): Neighbour lists.
+            present (bytearray): Current position.
+            i (int): First tile of the pair.
+            j (int): Second tile of the pair.
+
+        Returns:
+            int: Ten points per freed tile plus the layers of both tiles.
+        """
+        touched = set(topology.below[i] + topology.below[j] + topology.left[i]
+                      + topology.right[i] + topology.left[j] + topology.right[j])
+        touched.discard(i)
+        touched.discard(j)
+        before = [k for k in touched if present[k] and not topology.is_free(k, present)]
+        present[i] = present[j] = 0
+        freed = sum(1 for k in before if topology.is_free(k, present))
+        present[i] = present[j] = 1
+        return 10 * freed + topology.positions[i][2] + topology.positions[j][2]
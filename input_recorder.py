@@ -0,0 +1,146 @@
+"""
+Input Recorder Module.
+
+This module records the raw input stream of a session (clicks, key presses,
+mouse motion and wheel, each tagged with its frame number) together with
+the random seed the session was dealt from, and plays such a recording
+back into GameWindow frame by frame.
+
+Recordings are JSON files:
+    {"version": 1, "seed": int, "initial_save": str | null,
+     "frames": int, "events": [[frame, kind, ...], ...]}
+"""
+
+import json
+import os
+import random
+import pygame
+import persistence
+
+RECORDING_VERSION = 1
+
+
+def _encode(frame, event):
+    """Converts a pygame event into a compact list, or None if it is not input."""
+    t = event.type
+    if t == pygame.KEYDOWN: return [frame, "key", event.key]
+    if t == pygame.MOUSEBUTTONDOWN: return [frame, "down", event.button, *event.pos]
+    if t == pygame.MOUSEBUTTONUP: return [frame, "up", event.button, *event.pos]
+    if t == pygame.MOUSEMOTION: return [frame, "motion", *event.pos, *event.rel]
+    if t == pygame.MOUSEWHEEL: return [frame, "wheel", event.x, event.y]
+    if t == pygame.QUIT: return [frame, "quit"]
+    return None
+
+
+def _decode(entry):
+    """Rebuilds the pygame event described by an encoded list."""
+    kind = entry[1]
+    if kind == "key":
+        return pygame.event.Event(pygame.KEYDOWN, key=entry[2], mod=0, unicode="", scancode=0)
+    if kind == "down":
+        return pygame.event.Event(pygame.MOUSEBUTTONDOWN, button=entry[2], pos=(entry[3], entry[4]))
+    if kind == "up":
+        return pygame.event.Event(pygame.MOUSEBUTTONUP, button=entry[2], pos=(entry[3], entry[4]))
+    if kind == "motion":
+        return pygame.event.Event(pygame.MOUSEMOTION, pos=(entry[2], entry[3]),
+                                  rel=(entry[4], entry[5]), buttons=(0, 0, 0))
+    if kind == "wheel":
+        return pygame.event.Event(pygame.MOUSEWHEEL, x=entry[2], y=entry[3], flipped=False)
+    return pygame.event.Event(pygame.QUIT)
+
+
+class InputRecorder:
+    """
+    Collects the input events of a session.
+
+    Attributes:
+        path (str): Where the recording is written by save().
+        seed (int): Seed applied to the random module when recording started.
+        events (list): Encoded events in arrival order.
+    """
+
+    def __init__(self, path, seed=None):
+        """
+        Starts a recording and seeds the random module so deals can be reproduced.
+
+        Args:
+            path (str): Destination JSON file.
+            seed (int | None): Seed to use. A fresh one is drawn when None.
+        """
+        self.path = path
+        self.seed = seed if seed is not None else random.randrange(2 ** 32)
+        random.seed(self.seed)
+        self.events = []
+        self.frames = 0
+        
+        # LOAD GAME depends on the save file, so keep a copy of it
+        self.initial_save = None
+        if os.path.exists(persistence.SAVE_FILE):
+            with open(persistence.SAVE_FILE, "r") as f:
+                self.initial_save = f.read()
+
+    def record(self, frame, events):
+        """Stores the input events handled during a frame."""
+        for event in events:
+            entry = _encode(frame, event)
+            if entry is not None: self.events.append(entry)
+        self.frames = frame + 1
+
+    def save(self):
+        """Writes the recording to disk."""
+        data = {
+            "version": RECORDING_VERSION,
+            "seed": self.seed,
+            "initial_save": self.initial_save,
+            "frames": self.frames,
+            "events": self.events,
+        }
+        with open(self.path, "w") as f:
+            json.dump(data, f)
+        print(f"Input recording written to {self.path}")
+
+
+class InputReplay:
+    """
+    Feeds a recording back to the game one frame at a time.
+
+    Attributes:
+        seed (int): Seed the recorded session was dealt from.
+        frames (int): Number of frames in the recording.
+        initial_save (str | None): Save file contents when recording started.
+    """
+
+    def __init__(self, path):
+        """
+        Loads a recording.
+
+        Args:
+            path (str): A file written by InputRecorder.save().
+        """
+        with open(path, "r") as f:
+            data = json.load(f)
+        if data.get("version") != RECORDING_VERSION:
+            raise ValueError(f"Unsupported recording version: {data.get('version')}")
+        self.seed = data["seed"]
+        self.frames = data["frames"]
+        self.initial_save = data.get("initial_save")
+        
+        # Group events by frame up front so playback is a dictionary lookup
+        self.by_frame = {}
+        for entry in data["events"]:
+            self.by_frame.setdefault(entry[0], []).append(_decode(entry))
+
+    def start(self):
+        """Seeds the random module exactly like the recorded session."""
+        random.seed(self.seed)
+
+    def events_for(self, frame):
+        """
+        Returns the events to handle in a frame.
+
+        Once the recording is exhausted a QUIT event is returned so the game
+        loop ends.
+        """
+        if frame >= self.frames:
+            return [pygame.event.Event(pygame.QUIT)]
+        return self.by_frame.get(frame, [])
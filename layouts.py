@@ -6,6 +6,8 @@ Each layout function calculates and returns a list of (x, y, z) coordinates
 representing the 3D position of every tile on the board.
 """
 
+import random
+
 def get_turtle_layout():
     """
     Generates the classic 'Turtle' formation.
@@ -150,4 +152,136 @@ def get_colosseum_layout():
     positions.append((22, 8, 1)); positions.append((22, 10, 1))
     positions.append((26, 8, 1)); positions.append((26, 10, 1))
 
-    return positions
\ No newline at end of file
+    return positions
+
+def get_layout(layout_mode):
+    """
+    Returns the positions of a named layout.
+    
+    Args:
+        layout_mode (str): TURTLE, BUTTERFLY or COLOSSEUM. Unknown names
+            fall back to TURTLE.
+        
+    Returns:
+        list: A list of (x, y, z) tuples representing tile coordinates.
+    """
+    if layout_mode == "BUTTERFLY": return get_butterfly_layout()
+    if layout_mode == "COLOSSEUM": return get_colosseum_layout()
+    return get_turtle_layout()
+
+# --- PROCEDURAL GENERATION ---
+
+SYMMETRY_MODES = ("NONE", "MIRROR_X", "MIRROR_Y", "BOTH")
+
+
+def generate_pyramid_layout(tile_count, layers=5, symmetry="BOTH", seed=None):
+    """
+    Generates a pyramid-style layout with an exact number of tiles.
+    
+    Each layer is a centered rectangle resting entirely on the layer below,
+    so every tile above layer 0 is fully supported, just like the tiers of
+    the Turtle shell. Surplus tiles are eroded from uncovered positions in
+    symmetric groups until the requested count is reached.
+    
+    Args:
+        tile_count (int): Number of tiles (even, between 100 and 50,000).
+        layers (int): Number of stacked layers (1 or more).
+        symmetry (str): NONE, MIRROR_X (left/right), MIRROR_Y (top/bottom) or BOTH.
+        seed (int | None): Seed for the erosion pattern. Same seed, same layout.
+        
+    Returns:
+        list: A list of (x, y, z) tuples representing tile coordinates.
+    """
+    if tile_count % 2 != 0 or not 100 <= tile_count <= 50000:
+        raise ValueError("tile_count must be an even number between 100 and 50000")
+    if layers < 1:
+        raise ValueError("layers must be at least 1")
+    if symmetry not in SYMMETRY_MODES:
+        raise ValueError(f"Unknown symmetry mode: {symmetry}")
+
+    rng = random.Random(seed)
+    
+    # Widths are always even so left/right mirrors never land on a column.
+    # Heights are even too, except with BOTH mirrors: an odd height gives a
+    # middle row whose mirror groups hold 2 tiles instead of 4, which lets
+    # the erosion step finish on any even count.
+    odd_height = symmetry == "BOTH"
+    sizes = _pyramid_layer_sizes(tile_count, layers, odd_height)
+    
+    base_w, base_h = sizes[0]
+    cells = set()
+    for z, (w, h) in enumerate(sizes):
+        off_x, off_y = (base_w - w) // 2, (base_h - h) // 2
+        for i in range(off_x, off_x + w):
+            for j in range(off_y, off_y + h):
+                cells.add((i, j, z))
+
+    _erode_layout(cells, len(cells) - tile_count, base_w, base_h, symmetry, rng)
+    
+    # Grid cells are two logical units apart, as in the hand-written layouts
+    return [(2 * i, 2 * j, z) for (i, j, z) in sorted(cells, key=lambda p: (p[2], p[0], p[1]))]
+
+
+def _pyramid_layer_sizes(tile_count, layers, odd_height):
+    """
+    Chooses (width, height) in grid cells for every layer.
+    
+    Layer k aims at a geometric share of the tiles, and each layer is kept
+    no larger than the one below with matching parity so it stays centered.
+    The targets are scaled up until the pyramid holds at least tile_count.
+    """
+    ratio = 0.55
+    weights = [ratio ** k for k in range(layers)]
+    total_weight = sum(weights)
+    min_h = 1 if odd_height else 2
+    
+    scale = 1.0
+    while True:
+        sizes = []
+        for k in range(layers):
+            target = max(2, tile_count * scale * weights[k] / total_weight)
+            # Roughly twice as wide as tall, like the Turtle base
+            h = max(min_h, int(round((target / 2) ** 0.5)))
+            if (h % 2 == 1) != odd_height: h += 1
+            w = max(2, int(round(target / h)))
+            if w % 2: w += 1
+            if sizes:
+                prev_w, prev_h = sizes[-1]
+                w, h = min(w, prev_w), min(h, prev_h)
+            sizes.append((w, h))
+        if sum(w * h for w, h in sizes) >= tile_count:
+            return sizes
+        scale *= 1.05
+
+
+def _erode_layout(cells, excess, base_w, base_h, symmetry, rng):
+    """
+    Removes 'excess' uncovered cells in mirror groups, keeping the shape symmetric.
+    
+    Groups of the largest size are removed first and the smaller middle-row
+    groups are only used for the final remainder, so an exact count is
+    always reachable.
+    """
+    def orbit(cell):
+        i, j, z = cell
+        group = {cell}
+        if symmetry in ("MIRROR_X", "BOTH"):
+            group |= {(base_w - 1 - a, b, z) for (a, b, _) in group}
+        if symmetry in ("MIRROR_Y", "BOTH"):
+            group |= {(a, base_h - 1 - b, z) for (a, b, _) in group}
+        return frozenset(group)
+    
+    while excess > 0:
+        uncovered = [cell for cell in cells if (cell[0], cell[1], cell[2] + 1) not in cells]
+        orbits = {}
+        for cell in uncovered:
+            group = orbit(cell)
+            if len(group) <= excess: orbits[min(group)] = group
+        largest = max(len(o) for o in orbits.values())
+        
+        # Uncovered groups are independent, so a whole batch can go at once
+        candidates = sorted(rep for rep, o in orbits.items() if len(o) == largest)
+        batch_size = min(len(candidates), excess // largest)
+        for rep in rng.sample(candidates, batch_size):
+            cells.difference_update(orbits[rep])
+            excess -= largest
@@ -0,0 +1,203 @@
+"""
+Move Log Module.
+
+This module records the moves of a game as small integer deltas, so any
+number of them can be undone and redone, shuffles included:
+    a matched pair is stored as its two position indices;
+    a shuffle is stored as the permutation it applied to the faces of the
+    positions it changed.
+Undoing or redoing a step touches only the k positions it involves and
+never copies the board, and the whole log serializes to plain lists.
+
+A log can also keep a journal: every delta it applies, undos included, in
+play order. Replaying the journal from the starting position reproduces
+the game step by step (see replay_viewer.py).
+"""
+
+from array import array
+from collections import deque
+
+# --- ENTRY KINDS ---
+PAIR = "PAIR"        # (PAIR, points, i, j): tiles i and j were removed
+SHUFFLE = "SHUFFLE"  # (SHUFFLE, points, targets, sources): see Board.move_faces
+UNPAIR = "UNPAIR"    # journal only: (UNPAIR, i, j), tiles i and j were put back
+
+
+class MoveLog:
+    """
+    Linear undo/redo history of one board.
+
+    Entries before 'position' have been played; those after it were undone
+    and can be redone until a new move is recorded.
+
+    Attributes:
+        entries (deque): (kind, points, a, b) tuples, oldest first.
+        position (int): Number of entries currently applied.
+        journal (list | None): When set, (kind, a, b) for every delta
+            applied since, in play order; undos appear as UNPAIR or as the
+            inverse SHUFFLE.
+    """
+
+    def __init__(self, max_entries=10000):
+        """
+        Initializes an empty log.
+
+        Args:
+            max_entries (int): Entries kept; the oldest are forgotten first,
+                so memory stays bounded in endless sessions.
+        """
+        self.entries = deque(maxlen=max_entries)
+        self.position = 0
+        self.journal = None
+
+    def clear(self):
+        """Forgets every entry (new board)."""
+        self.entries.clear()
+        self.position = 0
+
+    def can_undo(self):
+        """Returns True if an entry can be undone."""
+        return self.position > 0
+
+    def can_redo(self):
+        """Returns True if an undone entry can be redone."""
+        return self.position < len(self.entries)
+
+    def applied(self):
+        """Returns the entries currently applied, oldest first."""
+        return [self.entries[k] for k in range(self.position)]
+
+    # --- RECORDING ---
+
+    def _append(self, entry):
+        # A new move discards the undone branch
+        while len(self.entries) > self.position:
+            self.entries.pop()
+        self.entries.append(entry)
+        self.position = len(self.entries)
+        self._journal(entry[0], entry[2], entry[3])
+
+    def _journal(self, kind, a, b):
+        if self.journal is not None: self.journal.append((kind, a, b))
+
+    def record_pair(self, i, j, points):
+        """
+        Records the removal of a matched pair.
+
+        Args:
+            i (int): Position index of the first tile.
+            j (int): Position index of the second tile.
+            points (int): Score change caused by the move.
+        """
+        self._append((PAIR, points, i, j))
+
+    def record_shuffle(self, before, after, points):
+        """
+        Records a shuffle as the permutation it applied.
+
+        Only positions whose face changed are stored. Shuffles move faces
+        around without creating any, so each changed position can be given
+        a distinct source among the changed positions.
+
+        Args:
+            before (tuple): Board.faces before the shuffle.
+            after (tuple): Board.faces after the shuffle.
+            points (int): Score change caused by the shuffle.
+        """
+        changed = [i for i in range(len(after)) if before[i] != after[i]]
+        if not changed: return
+        by_face = {}
+        for i in changed:
+            by_face.setdefault(before[i], []).append(i)
+        sources = [by_face[after[i]].pop() for i in changed]
+        self._append((SHUFFLE, points, array("H", changed), array("H", sources)))
+
+    # --- UNDO / REDO ---
+
+    def undo(self, board):
+        """
+        Reverts the last applied entry on the board.
+
+        Args:
+            board (Board): The board the log was recorded on.
+
+        Returns:
+            tuple | None: (kind, points, changed tiles), or None if there is
+            nothing to undo. 'points' is the score change to take back.
+        """
+        if not self.can_undo(): return None
+        self.position -= 1
+        kind, points, a, b = self.entries[self.position]
+        if kind == PAIR:
+            tiles = (board.tiles[a], board.tiles[b])
+            board.restore_tiles(*tiles)
+            for t in tiles: t.is_selected = False
+            self._journal(UNPAIR, a, b)
+            return kind, points, list(tiles)
+        self._journal(SHUFFLE, b, a)
+        return kind, points, board.move_faces(b, a)
+
+    def redo(self, board):
+        """
+        Applies the next undone entry again.
+
+        Args:
+            board (Board): The board the log was recorded on.
+
+        Returns:
+            tuple | None: (kind, points, changed tiles), or None if there is
+            nothing to redo. 'points' is the score change to apply again.
+        """
+        if not self.can_redo(): return None
+        kind, points, a, b = self.entries[self.position]
+        self.position += 1
+        if kind == PAIR:
+            tiles = (board.tiles[a], board.tiles[b])
+            board.remove_tiles(*tiles)
+            for t in tiles: t.is_selected = False
+            self._journal(kind, a, b)
+            return kind, points, list(tiles)
+        self._journal(kind, a, b)
+        return kind, points, board.move_faces(a, b)
+
+    # --- SERIALIZATION ---
+
+    def to_data(self):
+        """Returns the log as JSON-friendly lists."""
+        return {
+            "position": self.position,
+            "entries": [[kind, points, list(a) if kind == SHUFFLE else a,
+                         list(b) if kind == SHUFFLE else b]
+                        for kind, points, a, b in self.entries],
+        }
+
+    def load_data(self, data, size):
+        """
+        Replaces the log with one produced by to_data().
+
+        Args:
+            data (dict): Serialized log.
+            size (int): Number of positions on the board it belongs to.
+
+        Raises:
+            ValueError: If the data does not describe a log of such a board.
+        """
+        entries = []
+        for kind, points, a, b in data["entries"]:
+            if kind == PAIR:
+                indices = (a, b)
+            elif kind == SHUFFLE:
+                if len(a) != len(b) or sorted(a) != sorted(b):
+                    raise ValueError("shuffle entry is not a permutation")
+                indices = a
+                a, b = array("H", a), array("H", b)
+            else:
+                raise ValueError(f"unknown move kind {kind!r}")
+            if not all(isinstance(i, int) and 0 <= i < size for i in indices):
+                raise ValueError("move refers to a position off the board")
+            entries.append((kind, int(points), a, b))
+        position = data["position"]
+        if not 0 <= position <= len(entries):
+            raise ValueError("log position out of range")
+        self.entries = deque(entries, maxlen=self.entries.maxlen)
+        self.position = max(0, position - (len(entries) - len(self.entries)))
@@ -8,6 +8,11 @@ exactly where they left off.
 
 import json
 import os
+import random
+import time
+from board import Board
+from move_log import MoveLog
+from replay_viewer import GameRecord
 
 # The filename used for storing save data
 SAVE_FILE = "savegame.json"
@@ -17,21 +22,60 @@ def save_game(game_window):
     Saves the current game state to a JSON file.
     
     This function captures the player's score, the count of remaining tiles,
-    and the exact position and state of every tile on the board.
+    the exact position and state of every tile on the board, the
+    undo/redo log (a few integers per move, see move_log.py) and the
+    steps of the replay screen.
     
-    Note: The 'Undo' history is not serialized to keep the save file architecture
-    simple; history is effectively reset upon reloading a session.
+    Args:
+        game_window (GameWindow): The main game controller instance containing the state.
+    """
+    write_save(capture_game(game_window))
+
+def capture_game(game_window):
+    """
+    Collects the data save_game writes, without touching the disk.
+    
+    Cheap enough for the UI thread; the returned dictionary shares nothing
+    mutable with the game, so write_save can run on another thread.
     
     Args:
         game_window (GameWindow): The main game controller instance containing the state.
+        
+    Returns:
+        dict: The save data.
     """
-    # Prepare the data dictionary
+    board = game_window.board
     data = {
         "score": game_window.score,
         "total_tiles": game_window.total_tiles,
-        "board_state": game_window.board.get_state(),
+        "layout": board.layout_mode,
+        "difficulty": board.difficulty,
+        "seed": board.seed,
+        "shuffle_count": board.shuffle_count,
+        "board_state": board.get_state(),
+        "moves": game_window.history.to_data(),
     }
+    # Every step since the deal, for the replay screen (see replay_viewer.py)
+    if game_window.record:
+        data["replay"] = game_window.record.to_data()
+    # Statistics of the game so far (see stats_store.py)
+    stats = game_window.game_stats
+    if stats:
+        data["stats"] = {
+            "elapsed": stats["elapsed"] + time.time() - stats["started"],
+            "moves": stats["moves"],
+            "hints": stats["hints"],
+            "shuffles": stats["shuffles"],
+        }
+    return data
+
+def write_save(data):
+    """
+    Writes save data produced by capture_game to the save file.
     
+    Args:
+        data (dict): The save data.
+    """
     try:
         with open(SAVE_FILE, "w") as f:
             json.dump(data, f)
@@ -59,19 +103,70 @@ def load_game(game_window):
     try:
         with open(SAVE_FILE, "r") as f:
             data = json.load(f)
-            
-        # Restore Game Session Variables
-        game_window.score = data.get("score", 0)
-        game_window.total_tiles = data.get("total_tiles", 144)
+    except Exception:
+        return False
+    return restore_game(game_window, data)
+
+def restore_game(game_window, data):
+    """
+    Applies save data (from the save file or a save slot) to the game.
+    
+    The whole save is decoded before the game is touched, so a damaged
+    save leaves the running game exactly as it was.
+    
+    Args:
+        game_window (GameWindow): The main game controller instance to populate.
+        data (dict): Save data, as produced by capture_game.
+        
+    Returns:
+        bool: True if the data could be applied, False otherwise.
+    """
+    try:
+        score = int(data.get("score", 0))
+        total_tiles = int(data.get("total_tiles", 144))
         
         # Reconstruct the Board State
+        board = Board("TURTLE", "MEDIUM")
         board_data = data.get("board_state", [])
         if board_data:
-            game_window.board.set_state(board_data)
-            
-        return True
+            board.set_state(board_data)
+        
+        # Restore the random stream (older saves have no seed)
+        board.layout_mode = data.get("layout", board.layout_mode)
+        board.difficulty = data.get("difficulty", board.difficulty)
+        if "seed" in data:
+            board.seed = data["seed"]
+            board.rng = random.Random(board.seed)
+            board.shuffle_count = data.get("shuffle_count", 0)
+        
+        # Statistics carry on from where the game was saved
+        saved_stats = data.get("stats", {})
+        stats = {key: saved_stats.get(key, 0) for key in ("elapsed", "moves", "hints", "shuffles")}
     except Exception:
         return False
+    
+    # Undo/redo log (older saves have none; a damaged one is dropped)
+    history = MoveLog(max_entries=game_window.history.entries.maxlen)
+    try:
+        history.load_data(data["moves"], len(board.tiles))
+    except Exception:
+        history.clear()
+    
+    # Replay of the game (older saves have none; a damaged one is dropped)
+    try:
+        record = GameRecord.from_data(data["replay"])
+    except Exception:
+        record = None
+    
+    # Everything decoded: switch the game over
+    game_window.board = board
+    game_window.score = score
+    game_window.total_tiles = total_tiles
+    game_window.history = history
+    game_window.record = record
+    game_window._reset_game_stats()
+    game_window.game_stats.update(stats)
+    return True
 
 def delete_save():
     """
@@ -0,0 +1,423 @@
+"""
+Renderer Module.
+
+This module draws the board for the game window. Tiles are pre-composed
+into sprites (side, face, card image, highlight and border) packed in one
+atlas per zoom level, atlases are kept in an LRU cache, and only tiles whose
+rectangle intersects the viewport are drawn. Tiles completely hidden by
+tiles drawn after them are skipped as well.
+
+The visible tiles are kept as a ready-made (atlas, dest, area) sequence
+that is submitted with a single Surface.blits call and only rebuilt when
+the camera moves or tiles change.
+"""
+
+from collections import OrderedDict
+import pygame
+import constants as c
+from camera import Camera, tile_world_pos
+from spatial_index import SpatialIndex
+
+# Sprite variants for tile highlight states
+VARIANT_NORMAL = 0
+VARIANT_SELECTED = 1
+VARIANT_HINT = 2
+
+# Full footprint of a tile sprite: the face plus its offset 3D side
+SPRITE_WIDTH = c.VISUAL_WIDTH + c.TILE_THICKNESS
+SPRITE_HEIGHT = c.VISUAL_HEIGHT + c.TILE_THICKNESS
+
+
+def face_key(tile):
+    """Returns the image dictionary key for a tile's face."""
+    return f"{tile.suit}_{tile.value}"
+
+
+def sprite_geometry(zoom):
+    """
+    Returns the integer sprite geometry used at a zoom level.
+
+    Scaled sprites are drawn with these exact sizes (rather than smoothscaled)
+    so their opaque area is always two crisp rectangles, which is what the
+    occlusion test relies on.
+
+    Returns:
+        tuple: (face_width, face_height, side_offset).
+    """
+    if zoom == 1.0:
+        return (c.VISUAL_WIDTH, c.VISUAL_HEIGHT, c.TILE_THICKNESS)
+    return (max(2, round(c.VISUAL_WIDTH * zoom)),
+            max(2, round(c.VISUAL_HEIGHT * zoom)),
+            max(1, round(c.TILE_THICKNESS * zoom)))
+
+
+def _subtract_rect(pieces, cut):
+    """
+    Removes a rectangle from a list of disjoint rectangles.
+
+    Rectangles are (left, top, right, bottom) tuples with exclusive
+    right/bottom edges.
+
+    Returns:
+        list: The disjoint pieces left uncovered by 'cut'.
+    """
+    cl, ct, cr, cb = cut
+    remaining = []
+    for piece in pieces:
+        l, t, r, b = piece
+        if cl >= r or cr <= l or ct >= b or cb <= t:
+            remaining.append(piece)
+            continue
+        if t < ct: remaining.append((l, t, r, ct))
+        if cb < b: remaining.append((l, cb, r, b))
+        mid_t, mid_b = max(t, ct), min(b, cb)
+        if l < cl: remaining.append((l, mid_t, cl, mid_b))
+        if cr < r: remaining.append((cr, mid_t, r, mid_b))
+    return remaining
+
+
+class TileAtlas:
+    """
+    All tile sprites for one zoom level packed into a single surface.
+
+    Attributes:
+        surface (pygame.Surface): The packed sprites (with per-pixel alpha).
+        regions (dict): Maps (face_key, variant) to the sprite's area rect.
+    """
+
+    COLUMNS = 16
+
+    def __init__(self, images, keys, zoom):
+        """
+        Composes every face in every highlight variant at a zoom level.
+
+        Args:
+            images (dict): Card images keyed by face key (see face_key).
+            keys (iterable): Face keys that appear on the board.
+            zoom (float): One of camera.ZOOM_LEVELS.
+        """
+        self.images = images
+        w, h, depth = sprite_geometry(zoom)
+        cell_w, cell_h = w + depth, h + depth
+        
+        entries = [(key, variant) for key in sorted(keys)
+                   for variant in (VARIANT_NORMAL, VARIANT_SELECTED, VARIANT_HINT)]
+        cols = min(self.COLUMNS, max(1, len(entries)))
+        rows = max(1, -(-len(entries) // cols))
+        self.surface = pygame.Surface((cols * cell_w, rows * cell_h), pygame.SRCALPHA)
+        self.regions = {}
+        for n, entry in enumerate(entries):
+            area = pygame.Rect((n % cols) * cell_w, (n // cols) * cell_h, cell_w, cell_h)
+            self.surface.blit(self._compose(entry[0], entry[1], zoom), area)
+            self.regions[entry] = area
+
+    def _compose(self, key, variant, zoom):
+        """Draws a sprite exactly as a tile appears on the table at a zoom level."""
+        w, h, depth = sprite_geometry(zoom)
+        sprite = pygame.Surface((w + depth, h + depth), pygame.SRCALPHA)
+        
+        # 1. Shadow/Side
+        shadow_rect = pygame.Rect(depth, depth, w, h)
+        pygame.draw.rect(sprite, c.COLOR_TILE_SIDE, shadow_rect)
+        pygame.draw.rect(sprite, (0, 0, 0), shadow_rect, 1)
+        
+        # 2. Top Face
+        face_rect = pygame.Rect(0, 0, w, h)
+        pygame.draw.rect(sprite, c.COLOR_TILE_FACE, face_rect)
+        
+        # 3. Card Image and Effects (Highlight / Hint)
+        img = self.images.get(key)
+        if img:
+            if zoom != 1.0:
+                img = pygame.transform.smoothscale(img, (max(1, w - 2), max(1, h - 2)))
+            sprite.blit(img, img.get_rect(center=face_rect.center))
+            if variant != VARIANT_NORMAL:
+                s = pygame.Surface((w, h))
+                s.set_alpha(100)
+                s.fill(c.COLOR_HIGHLIGHT if variant == VARIANT_SELECTED else c.COLOR_HINT)
+                sprite.blit(s, (0, 0))
+        
+        # 4. Border
+        pygame.draw.rect(sprite, c.COLOR_BORDER, face_rect, max(1, round(2 * zoom)))
+        return sprite
+
+
+class AtlasCache:
+    """
+    Least-recently-used cache of tile atlases keyed by zoom level.
+
+    Zooming back to a recently used level reuses its atlas instead of
+    composing every sprite again.
+    """
+
+    def __init__(self, images, keys, max_entries=4):
+        """
+        Args:
+            images (dict): Card images keyed by face key (see face_key).
+            keys (iterable): Face keys that appear on the board.
+            max_entries (int): Maximum number of atlases kept.
+        """
+        self.images = images
+        self.keys = set(keys)
+        self.max_entries = max_entries
+        self.atlases = OrderedDict()
+
+    def get(self, zoom):
+        """
+        Returns the atlas for a zoom level, composing it if needed.
+
+        Args:
+            zoom (float): One of camera.ZOOM_LEVELS.
+
+        Returns:
+            TileAtlas: The atlas for that level.
+        """
+        atlas = self.atlases.get(zoom)
+        if atlas is not None:
+            self.atlases.move_to_end(zoom)
+            return atlas
+        atlas = self.atlases[zoom] = TileAtlas(self.images, self.keys, zoom)
+        if len(self.atlases) > self.max_entries:
+            self.atlases.popitem(last=False)
+        return atlas
+
+
+class BoardRenderer:
+    """
+    Draws the visible part of a board through a pannable, zoomable camera.
+
+    Attributes:
+        camera (Camera): Maps board space to the screen.
+        atlases (AtlasCache): Composed tile sprites per zoom level.
+        index (SpatialIndex): Tile footprints in board space.
+        occlusion (dict): Per zoom level, maps tiles to True when they are
+            fully hidden by tiles drawn after them. Filled lazily and
+            invalidated locally by tiles_changed.
+        draw_list (list): (atlas surface, dest, area) entries in depth order.
+    """
+
+    def __init__(self):
+        """Initializes a renderer with no board attached."""
+        self.camera = Camera()
+        self.atlases = AtlasCache({}, ())
+        self.index = SpatialIndex()
+        self.board = None
+        self.depth = {}
+        self.occlusion = {}
+        
+        # Batched draw sequence and the state it was built for
+        self.draw_list = []
+        self.draw_slots = {}
+        self.highlighted = {}
+        self.list_atlas = None
+        self.list_camera = None
+
+    def set_board(self, board, images):
+        """
+        Attaches a board and rebuilds the spatial index for its tiles.
+
+        Must be called whenever the board's tile objects are replaced
+        (new game or loaded game).
+
+        Args:
+            board (Board): The board to draw.
+            images (dict): Card images keyed by face key.
+        """
+        self.board = board
+        self.atlases = AtlasCache(images, {face_key(t) for t in board.tiles})
+        self.index = SpatialIndex()
+        self.depth = {}
+        self.occlusion = {}
+        self.invalidate()
+        for tile in board.tiles:
+            wx, wy = tile_world_pos(tile)
+            self.index.insert(tile, (wx, wy, SPRITE_WIDTH, SPRITE_HEIGHT))
+            self.depth[tile] = (tile.z, tile.y, tile.x)
+
+    def tiles_changed(self, tiles):
+        """
+        Invalidates occlusion data around tiles that were removed or restored.
+
+        Only tiles drawn before a changed tile can have their coverage
+        affected, so just those entries are dropped.
+
+        Args:
+            tiles (iterable): Tiles whose visibility changed.
+        """
+        self.invalidate()
+        depth = self.depth
+        for tile in tiles:
+            wx, wy = tile_world_pos(tile)
+            affected = [t for t in self.index.query((wx, wy, SPRITE_WIDTH, SPRITE_HEIGHT))
+                        if depth[t] < depth[tile]]
+            for cache in self.occlusion.values():
+                for t in affected: cache.pop(t, None)
+
+    def invalidate(self):
+        """
+        Forces the draw sequence to be rebuilt on the next frame.
+
+        Call this after tile faces change (e.g. a shuffle).
+        """
+        self.list_camera = None
+
+    def is_occluded(self, tile, zoom):
+        """
+        Checks whether a tile is fully covered by the visible tiles drawn after it.
+
+        The test is exact at the given zoom level: both the face and the side
+        rectangle of the tile must be covered by the union of the opaque
+        rectangles of later tiles, in the same rounded pixel grid that
+        drawing uses.
+
+        Args:
+            tile (Tile): The tile to test.
+            zoom (float): The zoom level the result applies to.
+
+        Returns:
+            bool: True if drawing the tile would not change a single pixel.
+        """
+        cache = self.occlusion.setdefault(zoom, {})
+        hidden = cache.get(tile)
+        if hidden is not None: return hidden
+        
+        w, h, d = sprite_geometry(zoom)
+        
+        def opaque_rects(t):
+            wx, wy = tile_world_pos(t)
+            x, y = round(wx * zoom), round(wy * zoom)
+            return ((x, y, x + w, y + h), (x + d, y + d, x + d + w, y + d + h))
+        
+        pieces = list(opaque_rects(tile))
+        my_depth = self.depth[tile]
+        wx, wy = tile_world_pos(tile)
+        for other in self.index.query((wx, wy, SPRITE_WIDTH, SPRITE_HEIGHT)):
+            if not other.is_visible or self.depth[other] <= my_depth: continue
+            for cut in opaque_rects(other):
+                pieces = _subtract_rect(pieces, cut)
+            if not pieces: break
+        
+        hidden = cache[tile] = not pieces
+        return hidden
+
+    def fit_to_board(self, margin_top=30):
+        """Centers the camera on the whole board, zooming out if it does not fit."""
+        tiles = self.board.tiles if self.board else []
+        if not tiles: return
+        xs = [t.x for t in tiles]
+        ys = [t.y for t in tiles]
+        min_x, max_x = min(xs), max(xs)
+        min_y, max_y = min(ys), max(ys)
+        
+        board_width = ((max_x - min_x) * c.TILE_SCALE_X) + c.VISUAL_WIDTH
+        board_height = ((max_y - min_y) * c.TILE_SCALE_Y) + c.VISUAL_HEIGHT
+        bounds = (min_x * c.TILE_SCALE_X, min_y * c.TILE_SCALE_Y, board_width, board_height)
+        self.camera.fit(bounds, margin_top)
+
+    def visible_tiles(self):
+        """
+        Returns the in-play tiles intersecting the viewport, in drawing order.
+
+        Returns:
+            list: Tiles sorted bottom layer first.
+        """
+        wx, wy, ww, wh = self.camera.visible_world_rect()
+        candidates = self.index.query((wx, wy, ww, wh))
+        right, bottom = wx + ww, wy + wh
+        shown = []
+        for tile in candidates:
+            if not tile.is_visible: continue
+            tx, ty = tile_world_pos(tile)
+            if tx < right and tx + SPRITE_WIDTH > wx and ty < bottom and ty + SPRITE_HEIGHT > wy:
+                shown.append(tile)
+        depth = self.depth
+        shown.sort(key=depth.__getitem__)
+        return shown
+
+    def tile_at(self, pos):
+        """
+        Returns the top-most in-play tile whose face contains a screen point.
+
+        Args:
+            pos (tuple): Screen coordinates, e.g. from a mouse event.
+
+        Returns:
+            Tile | None: The tile under the point, if any.
+        """
+        wx, wy = self.camera.screen_to_world(*pos)
+        best = None
+        for tile in self.index.query_point(wx, wy):
+            if not tile.is_visible: continue
+            tx, ty = tile_world_pos(tile)
+            if tx <= wx < tx + c.VISUAL_WIDTH and ty <= wy < ty + c.VISUAL_HEIGHT:
+                if best is None or self.depth[tile] > self.depth[best]:
+                    best = tile
+        return best
+
+    def _variant(self, tile, hint_tiles):
+        """Returns the sprite variant matching a tile's highlight state."""
+        if tile.is_selected: return VARIANT_SELECTED
+        if tile in hint_tiles: return VARIANT_HINT
+        return VARIANT_NORMAL
+
+    def _rebuild_draw_list(self, atlas, hint_tiles):
+        """Builds the blit sequence for every visible, uncovered tile in view."""
+        cam = self.camera
+        zoom = cam.zoom
+        regions = atlas.regions
+        surface = atlas.surface
+        self.draw_list = []
+        self.draw_slots = {}
+        self.highlighted = {}
+        for tile in self.visible_tiles():
+            if self.is_occluded(tile, zoom): continue
+            variant = self._variant(tile, hint_tiles)
+            if variant != VARIANT_NORMAL: self.highlighted[tile] = variant
+            self.draw_slots[tile] = len(self.draw_list)
+            area = regions[(face_key(tile), variant)]
+            self.draw_list.append((surface, cam.world_to_screen(*tile_world_pos(tile)), area))
+        self.list_atlas = atlas
+        self.list_camera = (cam.version, zoom)
+
+    def _refresh_highlights(self, hint_tiles, selected):
+        """Swaps sprite areas for tiles whose selection or hint state changed."""
+        atlas = self.list_atlas
+        changed = set(self.highlighted)
+        changed.update(hint_tiles)
+        if selected is not None: changed.add(selected)
+        for tile in changed:
+            slot = self.draw_slots.get(tile)
+            if slot is None: continue
+            variant = self._variant(tile, hint_tiles)
+            if variant == self.highlighted.get(tile, VARIANT_NORMAL): continue
+            if variant == VARIANT_NORMAL: del self.highlighted[tile]
+            else: self.highlighted[tile] = variant
+            src, dest, _ = self.draw_list[slot]
+            self.draw_list[slot] = (src, dest, atlas.regions[(face_key(tile), variant)])
+
+    def draw(self, surface, hint_tiles, selected=None):
+        """
+        Draws every visible tile that intersects the viewport.
+
+        Args:
+            surface (pygame.Surface): Destination surface (the screen).
+            hint_tiles (list): Tiles currently highlighted by a hint.
+            selected (Tile | None): The tile currently selected by the player.
+        """
+        self.prepare(hint_tiles, selected)
+        surface.blits(self.draw_list, doreturn=False)
+
+    def prepare(self, hint_tiles, selected=None):
+        """
+        Brings the draw sequence up to date without drawing it.
+
+        Returns:
+            list: The current (atlas surface, dest, area) sequence.
+        """
+        cam = self.camera
+        atlas = self.atlases.get(cam.zoom)
+        if self.list_camera != (cam.version, cam.zoom) or self.list_atlas is not atlas:
+            self._rebuild_draw_list(atlas, hint_tiles)
+        else:
+            self._refresh_highlights(hint_tiles, selected)
+        return self.draw_list
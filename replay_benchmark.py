@@ -0,0 +1,125 @@
+"""
+Replay Benchmark Module.
+
+Runs a recorded input stream (see input_recorder.py) through the real game
+loop, headless and as fast as possible, and reports per-frame latency
+percentiles, total wall time and a checksum of the final game state. Two
+runs of the same recording on the same code must produce the same
+checksum; a different checksum means behaviour changed, not just speed.
+
+Usage:
+    python replay_benchmark.py session.json [--runs 3] [--renderer blit]
+"""
+
+import argparse
+import hashlib
+import json
+import os
+import tempfile
+import time
+
+# Headless: no window, no audio device. Must be set before pygame starts.
+os.environ.setdefault("SDL_VIDEODRIVER", "dummy")
+os.environ.setdefault("SDL_AUDIODRIVER", "dummy")
+
+import persistence
+import save_slots
+import stats_store
+from display_backend import BACKENDS
+from frame_profiler import FrameProfiler
+from game_window import GameWindow
+from input_recorder import InputReplay
+
+
+def state_checksum(game):
+    """
+    Hashes everything that defines where a session ended up.
+
+    Args:
+        game (GameWindow): The window after the replay finished.
+
+    Returns:
+        str: Hex SHA-256 digest.
+    """
+    data = {
+        "state": game.state,
+        "game_state": game.game_state,
+        "score": game.score,
+        "total_tiles": game.total_tiles,
+        "board": game.board.get_state() if game.board else None,
+    }
+    return hashlib.sha256(json.dumps(data, sort_keys=True).encode()).hexdigest()
+
+
+def replay_once(path, backend="blit"):
+    """
+    Replays a recording a single time.
+
+    The save file is redirected to a temporary directory (pre-filled with
+    the save that existed when recording started), and so are the stats
+    database and the save slots, so the player's own saves and statistics
+    are never touched and a replayed LOAD screen does not list them.
+
+    Returns:
+        dict: wall time, frame count, latency percentiles and checksum.
+    """
+    replay = InputReplay(path)
+    old_save_file = persistence.SAVE_FILE
+    old_stats_file = stats_store.STATS_FILE
+    old_slot_dir = save_slots.SLOT_DIR
+    with tempfile.TemporaryDirectory() as tmp:
+        persistence.SAVE_FILE = os.path.join(tmp, "savegame.json")
+        stats_store.STATS_FILE = os.path.join(tmp, "stats.db")
+        save_slots.SLOT_DIR = os.path.join(tmp, "saves")
+        if replay.initial_save is not None:
+            with open(persistence.SAVE_FILE, "w") as f:
+                f.write(replay.initial_save)
+        try:
+            replay.start()
+            game = GameWindow(backend=backend, audio=False)
+            game.fps = 0  # no frame-rate cap
+            game.input_replay = replay
+            game.profiler = FrameProfiler(capacity=replay.frames + 1, window=replay.frames + 1)
+            game.profiler.toggle()
+            
+            started = time.perf_counter()
+            game.run()
+            wall = time.perf_counter() - started
+        finally:
+            persistence.SAVE_FILE = old_save_file
+            stats_store.STATS_FILE = old_stats_file
+            save_slots.SLOT_DIR = old_slot_dir
+    
+    return {
+        "frames": game.frame_count,
+        "wall_time": wall,
+        "phases": game.profiler.summary(),
+        "checksum": state_checksum(game),
+    }
+
+
+def main():
+    """Parses arguments, runs the replays and prints a report."""
+    parser = argparse.ArgumentParser(description="Deterministic headless replay benchmark")
+    parser.add_argument("recording", help="file written with game_window.py --record")
+    parser.add_argument("--runs", type=int, default=1, help="number of replays")
+    parser.add_argument("--renderer", choices=BACKENDS, default="blit")
+    args = parser.parse_args()
+    
+    checksums = set()
+    for run in range(1, args.runs + 1):
+        result = replay_once(args.recording, args.renderer)
+        checksums.add(result["checksum"])
+        print(f"--- run {run}: {result['frames']} frames in {result['wall_time']:.3f} s "
+              f"({result['frames'] / max(result['wall_time'], 1e-9):.1f} FPS) ---")
+        print(f"{'phase':<14}{'p50':>9}{'p95':>9}{'p99':>9}  (ms)")
+        for name, p50, p95, p99 in result["phases"]:
+            print(f"{name:<14}{p50:9.3f}{p95:9.3f}{p99:9.3f}")
+        print(f"checksum {result['checksum']}")
+    
+    if len(checksums) > 1:
+        print("WARNING: runs ended in different states; the replay is not deterministic")
+
+
+if __name__ == "__main__":
+    main()
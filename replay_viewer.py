@@ -0,0 +1,249 @@
+"""
+Replay Viewer Module.
+
+This module plays a game back on a board of its own: one step at a time,
+at a chosen speed, or jumping straight to any move. A GameRecord holds the
+starting position and every delta played from it, undos and shuffles
+included (the journal of move_log.MoveLog).
+
+Seeking does not replay from move zero. When a record is opened the viewer
+walks it once and keeps a board snapshot every KEYFRAME_INTERVAL steps
+(O(1) each, see Board.snapshot). A seek restores the nearest keyframe at
+or before the target and applies fewer than KEYFRAME_INTERVAL deltas, so
+jumping costs the same at move 10 of a Turtle game as at move 2000 of a
+huge pyramid.
+"""
+
+from array import array
+from board import Board
+from deal_db import FACES, FACE_IDS
+from move_log import PAIR, SHUFFLE, UNPAIR
+from topology import mask_to_present
+
+# Steps between two keyframes (a seek applies at most this many - 1 deltas)
+KEYFRAME_INTERVAL = 16
+
+# Playback speeds, in steps per second
+SPEEDS = (1, 2, 4, 8, 16, 32)
+
+
+class GameRecord:
+    """
+    The starting position of a game and the deltas played from it.
+
+    Attributes:
+        start (BoardSnapshot): Position the first step applies to.
+        steps (list): (kind, a, b) deltas in play order: PAIR and UNPAIR
+            carry two position indices, SHUFFLE the targets and sources of
+            Board.move_faces.
+    """
+
+    def __init__(self, start, steps=None):
+        self.start = start
+        self.steps = steps if steps is not None else []
+
+    @staticmethod
+    def from_board(board):
+        """Starts an empty record at the board's current position."""
+        return GameRecord(board.snapshot())
+
+    @staticmethod
+    def from_deal(layout, difficulty, seed, steps=()):
+        """
+        Builds the record of a game from its deal seed and its steps.
+
+        Args:
+            layout (str): Layout of the deal.
+            difficulty (str): Difficulty of the deal.
+            seed (int): Seed of the deal (games are dealt solvable).
+            steps (iterable): (kind, a, b) deltas in play order.
+        """
+        board = Board(layout, difficulty, seed=seed, solvable=True)
+        return GameRecord(board.snapshot(), list(steps))
+
+    def build_board(self):
+        """Returns a new board at the starting position."""
+        start = self.start
+        board = Board(start.layout_mode, start.difficulty, positions=start.positions,
+                      seed=start.seed, faces=start.faces)
+        board.restore(start)
+        return board
+
+    # --- SERIALIZATION ---
+
+    def to_data(self):
+        """Returns the record as JSON-friendly values."""
+        start = self.start
+        return {
+            "layout": start.layout_mode,
+            "difficulty": start.difficulty,
+            "seed": start.seed,
+            "shuffle_count": start.shuffle_count,
+            "positions": [list(p) for p in start.positions],
+            "faces": [FACE_IDS[f] for f in start.faces],
+            "mask": start.mask,
+            "steps": [[kind, list(a), list(b)] if kind == SHUFFLE else [kind, a, b]
+                      for kind, a, b in self.steps],
+        }
+
+    @staticmethod
+    def from_data(data):
+        """
+        Rebuilds a record produced by to_data().
+
+        Raises:
+            ValueError: If the data does not describe a valid record.
+        """
+        positions = [tuple(p) for p in data["positions"]]
+        faces = [FACES[f] for f in data["faces"]]
+        if len(faces) != len(positions):
+            raise ValueError("record has a face count that does not match its layout")
+        board = Board(data["layout"], data["difficulty"], positions=positions,
+                      seed=data["seed"], faces=faces)
+        board.shuffle_count = data.get("shuffle_count", 0)
+        present = mask_to_present(data["mask"], len(positions))
+        board.remove_tiles(*(t for t, p in zip(board.tiles, present) if not p))
+
+        size = len(positions)
+        steps = []
+        for kind, a, b in data["steps"]:
+            if kind in (PAIR, UNPAIR):
+                indices = (a, b)
+            elif kind == SHUFFLE:
+                if len(a) != len(b) or sorted(a) != sorted(b):
+                    raise ValueError("shuffle step is not a permutation")
+                indices = a
+                a, b = array("H", a), array("H", b)
+            else:
+                raise ValueError(f"unknown step kind {kind!r}")
+            if not all(isinstance(i, int) and 0 <= i < size for i in indices):
+                raise ValueError("step refers to a position off the board")
+            steps.append((kind, a, b))
+        return GameRecord(board.snapshot(), steps)
+
+
+class ReplayViewer:
+    """
+    Plays a GameRecord back with keyframed seeking.
+
+    The steps are copied when the viewer opens, so the game may go on
+    recording into the same record meanwhile.
+
+    Attributes:
+        board (Board): The replayed position (not the game's board).
+        position (int): Steps applied to the starting position.
+        keyframes (list): keyframes[k] is the board after k * interval steps.
+        playing (bool): Advancing by itself in update().
+        speed (int): Steps per second while playing.
+    """
+
+    def __init__(self, record, keyframe_interval=KEYFRAME_INTERVAL):
+        """
+        Opens a record, paused at its first step.
+
+        Args:
+            record (GameRecord): The game to play back.
+            keyframe_interval (int): Steps between keyframes.
+        """
+        self.steps = list(record.steps)
+        self.interval = keyframe_interval
+        self.board = record.build_board()
+
+        # One pass over the game, keeping a snapshot every 'interval' steps
+        self.keyframes = []
+        for n, step in enumerate(self.steps):
+            if n % self.interval == 0: self.keyframes.append(self.board.snapshot())
+            self._apply(step)
+        if len(self.steps) % self.interval == 0: self.keyframes.append(self.board.snapshot())
+        self.position = len(self.steps)
+
+        self.playing = False
+        self.speed = SPEEDS[2]
+        self.clock = 0.0
+        self.seek(0)
+
+    @property
+    def length(self):
+        """Number of steps in the replay."""
+        return len(self.steps)
+
+    def _apply(self, step, backwards=False):
+        """Applies one step (or reverts it) and returns the tiles it changed."""
+        kind, a, b = step
+        board = self.board
+        if kind == SHUFFLE:
+            return board.move_faces(b, a) if backwards else board.move_faces(a, b)
+        tiles = (board.tiles[a], board.tiles[b])
+        if (kind == PAIR) != backwards: board.remove_tiles(*tiles)
+        else: board.restore_tiles(*tiles)
+        return list(tiles)
+
+    # --- NAVIGATION ---
+
+    def seek(self, target):
+        """
+        Moves to the position after 'target' steps.
+
+        Nearby targets are reached by applying the steps in between;
+        anything further restores the closest keyframe at or before the
+        target first, so no seek applies KEYFRAME_INTERVAL steps or more.
+
+        Args:
+            target (int): Step number, clamped to [0, length].
+
+        Returns:
+            list: The tiles that changed (for the renderer).
+        """
+        target = max(0, min(target, len(self.steps)))
+        changed = []
+        if target == self.position - 1:
+            changed = self._apply(self.steps[target], backwards=True)
+        elif not 0 <= target - self.position < self.interval:
+            base = target // self.interval
+            changed = self.board.restore(self.keyframes[base])
+            self.position = base * self.interval
+        for n in range(self.position, target):
+            changed += self._apply(self.steps[n])
+        self.position = target
+        return changed
+
+    def step(self, count=1):
+        """Moves 'count' steps forward (negative: backward). Returns the changed tiles."""
+        return self.seek(self.position + count)
+
+    def seek_fraction(self, fraction):
+        """Jumps to a point of the game given as a fraction of its length."""
+        return self.seek(round(fraction * len(self.steps)))
+
+    # --- PLAYBACK ---
+
+    def toggle_play(self):
+        """Plays or pauses; playing at the end starts over from the first step."""
+        self.playing = not self.playing
+        self.clock = 0.0
+        if self.playing and self.position == len(self.steps):
+            return self.seek(0)
+        return []
+
+    def change_speed(self, direction):
+        """Selects the next faster (+1) or slower (-1) speed."""
+        k = SPEEDS.index(self.speed) + direction
+        self.speed = SPEEDS[max(0, min(k, len(SPEEDS) - 1))]
+
+    def update(self, dt):
+        """
+        Advances playback by a frame's duration.
+
+        Args:
+            dt (float): Seconds since the previous update.
+
+        Returns:
+            list: The tiles that changed.
+        """
+        if not self.playing: return []
+        self.clock += dt * self.speed
+        count = int(self.clock)
+        self.clock -= count
+        changed = self.step(count) if count else []
+        if self.position == len(self.steps): self.playing = False
+        return changed
@@ -0,0 +1,180 @@
+"""
+Save Slots Module.
+
+This module keeps several saved games side by side, one file per slot.
+Every file starts with a fixed-size header describing the game, so the
+load menu lists all slots by reading a few dozen bytes of each file; the
+board itself is only decoded when a slot is chosen.
+
+File layout (little-endian):
+    header     48 bytes  magic b"MJSLOT\\0\\0", version (u16), layout id (u8),
+                         difficulty id (u8), score (i32), tiles left (u16),
+                         thumbnail width (u16), thumbnail height (u16),
+                         saved at (f64, Unix time), thumbnail offset (u32),
+                         thumbnail size (u32), payload offset (u32),
+                         payload size (u32), 2 reserved bytes
+    thumbnail  raw RGB pixels of a downscaled screenshot (may be empty)
+    payload    zlib-compressed JSON, the data of persistence.capture_game
+"""
+
+import json
+import os
+import struct
+import time
+import zlib
+from deal_db import LAYOUT_IDS, DIFFICULTY_IDS
+
+SLOT_DIR = "saves"
+SLOT_COUNT = 24
+MAGIC = b"MJSLOT\0\0"
+VERSION = 1
+HEADER = struct.Struct("<8sHBBiHHHdIIIIxx")
+UNKNOWN_ID = 255
+
+THUMBNAIL_SIZE = (160, 90)
+
+
+class SlotHeader:
+    """
+    What the load menu shows about a slot, read from its header alone.
+
+    Attributes:
+        slot (int): Slot number.
+        layout (str): Layout mode ("CUSTOM" if not a named layout).
+        difficulty (str): Difficulty ("CUSTOM" if unknown).
+        score (int): Score when saved.
+        tiles_left (int): Tiles still on the board.
+        saved_at (float): Unix time of the save.
+        thumbnail_size (tuple): (width, height) in pixels, (0, 0) if none.
+    """
+
+    def __init__(self, slot, raw):
+        (magic, version, layout, difficulty, self.score, self.tiles_left, width, height,
+         self.saved_at, self.thumbnail_offset, self.thumbnail_bytes,
+         self.payload_offset, self.payload_bytes) = HEADER.unpack(raw)
+        if magic != MAGIC or version != VERSION:
+            raise ValueError("not a save slot file")
+        self.slot = slot
+        self.layout = LAYOUT_IDS[layout] if layout < len(LAYOUT_IDS) else "CUSTOM"
+        self.difficulty = DIFFICULTY_IDS[difficulty] if difficulty < len(DIFFICULTY_IDS) else "CUSTOM"
+        self.thumbnail_size = (width, height)
+
+
+def slot_path(slot):
+    """Returns the file of a slot."""
+    return os.path.join(SLOT_DIR, f"slot_{slot:02d}.mjs")
+
+
+def write_slot(slot, data, thumbnail=None):
+    """
+    Saves a game into a slot, replacing what was there.
+
+    The file is written next to its destination and renamed at the end, so
+    a crash never leaves a half-written slot.
+
+    Args:
+        slot (int): Slot number, 0 to SLOT_COUNT - 1.
+        data (dict): Save data from persistence.capture_game.
+        thumbnail (tuple | None): (width, height, RGB bytes) of a screenshot.
+
+    Returns:
+        bool: True if the slot was written.
+    """
+    width, height, pixels = thumbnail or (0, 0, b"")
+    payload = zlib.compress(json.dumps(data).encode(), 6)
+    layout = data.get("layout")
+    difficulty = data.get("difficulty")
+    header = HEADER.pack(
+        MAGIC, VERSION,
+        LAYOUT_IDS.index(layout) if layout in LAYOUT_IDS else UNKNOWN_ID,
+        DIFFICULTY_IDS.index(difficulty) if difficulty in DIFFICULTY_IDS else UNKNOWN_ID,
+        data.get("score", 0), data.get("total_tiles", 0), width, height, time.time(),
+        HEADER.size, len(pixels), HEADER.size + len(pixels), len(payload))
+    path = slot_path(slot)
+    try:
+        os.makedirs(SLOT_DIR, exist_ok=True)
+        with open(path + ".tmp", "wb") as f:
+            f.write(header)
+            f.write(pixels)
+            f.write(payload)
+        os.replace(path + ".tmp", path)
+        return True
+    except Exception:
+        return False
+
+
+def read_header(slot):
+    """
+    Reads only the header of a slot.
+
+    Returns:
+        SlotHeader | None: The header, or None if the slot is empty or damaged.
+    """
+    try:
+        with open(slot_path(slot), "rb") as f:
+            return SlotHeader(slot, f.read(HEADER.size))
+    except Exception:
+        return None
+
+
+def list_slots():
+    """
+    Lists the used slots from their headers, most recent first.
+
+    Returns:
+        list: SlotHeader objects.
+    """
+    headers = [read_header(slot) for slot in range(SLOT_COUNT)]
+    return sorted((h for h in headers if h), key=lambda h: -h.saved_at)
+
+
+def free_slot():
+    """Returns an unused slot number, or the least recently saved one if all are used."""
+    used = {h.slot: h.saved_at for h in list_slots()}
+    for slot in range(SLOT_COUNT):
+        if slot not in used: return slot
+    return min(used, key=used.get)
+
+
+def read_thumbnail(header):
+    """
+    Reads the screenshot of a slot (a partial read at its offset).
+
+    Returns:
+        tuple | None: (width, height, RGB bytes), or None if there is none.
+    """
+    if not header.thumbnail_bytes: return None
+    try:
+        with open(slot_path(header.slot), "rb") as f:
+            f.seek(header.thumbnail_offset)
+            pixels = f.read(header.thumbnail_bytes)
+    except Exception:
+        return None
+    width, height = header.thumbnail_size
+    if len(pixels) != width * height * 3: return None
+    return width, height, pixels
+
+
+def read_slot(slot):
+    """
+    Decodes the full save data of a slot.
+
+    Returns:
+        dict | None: Data for persistence.restore_game, or None if unreadable.
+    """
+    header = read_header(slot)
+    if header is None: return None
+    try:
+        with open(slot_path(slot), "rb") as f:
+            f.seek(header.payload_offset)
+            return json.loads(zlib.decompress(f.read(header.payload_bytes)))
+    except Exception:
+        return None
+
+
+def delete_slot(slot):
+    """Empties a slot."""
+    try:
+        os.remove(slot_path(slot))
+    except Exception:
+        pass
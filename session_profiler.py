@@ -0,0 +1,131 @@
+"""
+Session Profiler Module.
+
+This module captures cProfile statistics and tracemalloc allocation
+snapshots from a live game session. A capture is started and stopped with
+a hotkey (or started at launch with the MAHJONG_PROFILE environment
+variable) and written to its own timestamped directory:
+
+- session.pstats: raw cProfile data (load with pstats or snakeviz).
+- session.txt: the top functions by cumulative time.
+- tracemalloc_start.txt / tracemalloc_stop.txt: top allocation sites.
+- tracemalloc_diff.txt: allocation growth between start and stop.
+"""
+
+import cProfile
+import io
+import os
+import pstats
+import time
+import tracemalloc
+
+# Environment variable that starts a capture as soon as the game launches
+ENV_VAR = "MAHJONG_PROFILE"
+
+
+class SessionProfiler:
+    """
+    Start/stop wrapper around cProfile and tracemalloc.
+
+    Attributes:
+        base_dir (str): Directory under which captures are written.
+        top_n (int): Number of allocation sites listed per report.
+        active (bool): True while a capture is running.
+    """
+
+    def __init__(self, base_dir="profiles", top_n=30, frames=10):
+        """
+        Args:
+            base_dir (str): Parent directory for timestamped captures.
+            top_n (int): Allocation sites listed in each tracemalloc report.
+            frames (int): Stack depth recorded by tracemalloc.
+        """
+        self.base_dir = base_dir
+        self.top_n = top_n
+        self.frames = frames
+        self.active = False
+        self.profile = None
+        self.start_snapshot = None
+        self.started_tracing = False
+        self.started_at = 0.0
+
+    def start(self):
+        """Begins a capture. Does nothing if one is already running."""
+        if self.active: return
+        if not tracemalloc.is_tracing():
+            tracemalloc.start(self.frames)
+            self.started_tracing = True
+        self.start_snapshot = self._snapshot()
+        self.started_at = time.time()
+        self.profile = cProfile.Profile()
+        self.profile.enable()
+        self.active = True
+        print("Session profiling started")
+
+    def stop(self):
+        """
+        Ends the running capture and writes its reports.
+
+        Returns:
+            str | None: The capture directory, or None if nothing was running.
+        """
+        if not self.active: return None
+        self.profile.disable()
+        stop_snapshot = self._snapshot()
+        if self.started_tracing:
+            tracemalloc.stop()
+            self.started_tracing = False
+        self.active = False
+        
+        # Millisecond names, plus a suffix if two captures still collide
+        stamp = time.strftime("%Y%m%d-%H%M%S", time.localtime(self.started_at))
+        stamp += f".{int(self.started_at * 1000) % 1000:03d}"
+        out_dir = os.path.join(self.base_dir, stamp)
+        n = 1
+        while True:
+            try:
+                os.makedirs(out_dir)
+                break
+            except FileExistsError:
+                n += 1
+                out_dir = os.path.join(self.base_dir, f"{stamp}-{n}")
+        
+        # cProfile
+        self.profile.dump_stats(os.path.join(out_dir, "session.pstats"))
+        text = io.StringIO()
+        pstats.Stats(self.profile, stream=text).sort_stats("cumulative").print_stats(50)
+        self._write(out_dir, "session.txt", text.getvalue())
+        
+        # tracemalloc
+        self._write(out_dir, "tracemalloc_start.txt", self._top(self.start_snapshot.statistics("lineno")))
+        self._write(out_dir, "tracemalloc_stop.txt", self._top(stop_snapshot.statistics("lineno")))
+        self._write(out_dir, "tracemalloc_diff.txt", self._top(stop_snapshot.compare_to(self.start_snapshot, "lineno")))
+        
+        self.profile = None
+        self.start_snapshot = None
+        print(f"Session profile written to {out_dir}")
+        return out_dir
+
+    def toggle(self):
+        """Starts a capture if none is running, otherwise stops it."""
+        if self.active: self.stop()
+        else: self.start()
+
+    def _snapshot(self):
+        """Takes a tracemalloc snapshot without the profiler's own frames."""
+        snapshot = tracemalloc.take_snapshot()
+        return snapshot.filter_traces((
+            tracemalloc.Filter(False, tracemalloc.__file__),
+            tracemalloc.Filter(False, cProfile.__file__),
+            tracemalloc.Filter(False, __file__),
+        ))
+
+    def _top(self, stats):
+        """Formats the first top_n statistics, one per line."""
+        return "\n".join(str(stat) for stat in stats[:self.top_n]) + "\n"
+
+    @staticmethod
+    def _write(out_dir, name, text):
+        """Writes a text report into the capture directory."""
+        with open(os.path.join(out_dir, name), "w") as f:
+            f.write(text)
@@ -0,0 +1,363 @@
+"""
+Solver Module.
+
+This module searches for a way to clear the board from its current
+position. The search is a depth-first walk over tile removals that can be
+paused when its time budget runs out and resumed on the next call, so the
+work can be spread over many frames without dropping any.
+
+Positions proven unwinnable are kept in a transposition table keyed by the
+set of remaining positions. The table stays valid while the faces do not
+change, so it carries over from one move to the next (and across undo);
+it is only cleared when the board is reshuffled or replaced. On layouts
+with mirror symmetries the key is the smallest Zobrist hash over all mirror
+images, so a position and its reflections share one entry.
+"""
+
+import time
+import constants as c
+from topology import present_to_mask, zobrist_key
+
+# --- VERDICTS ---
+WINNABLE = "WINNABLE"  # a complete removal sequence was found
+DEAD = "DEAD"          # every line was explored: the board cannot be cleared
+UNKNOWN = "UNKNOWN"    # still searching
+
+
+def match_class(suit, value):
+    """
+    Returns a key shared by exactly the faces that match each other.
+
+    Args:
+        suit (str): Tile suit.
+        value (str | int): Tile value.
+
+    Returns:
+        tuple: Equal keys for matching faces (any two Jacks, any two Kings,
+        otherwise identical faces).
+    """
+    if suit in (c.TYPE_JACK, c.TYPE_KING): return (suit,)
+    return (suit, value)
+
+
+def surviving_line(line, present):
+    """
+    Reuses a winning line after some of its pairs were played.
+
+    Removing tiles can only free other tiles, so if every pair of the line
+    was either played as a whole or is still fully on the board, the pairs
+    still on the board remain a winning line in their original order. Undo
+    can put back tiles the line had already removed in other pairs, so the
+    remaining pairs must also cover every tile on the board.
+
+    Args:
+        line (list | None): (i, j) position pairs in removal order.
+        present (bytearray): present[i] is 1 while position i holds a tile.
+
+    Returns:
+        list | None: The remaining pairs, or None if the line was broken.
+    """
+    if line is None: return None
+    remaining = []
+    for i, j in line:
+        if present[i] and present[j]:
+            remaining.append((i, j))
+        elif present[i] or present[j]:
+            return None
+    if 2 * len(remaining) != sum(present): return None
+    return remaining
+
+
+class Solver:
+    """
+    Resumable, budgeted search for a winning line.
+
+    Attributes:
+        verdict (str): WINNABLE, DEAD or UNKNOWN for the current root.
+        line (list | None): Winning (i, j) position pairs once WINNABLE.
+        dead (set): Keys of positions proven unwinnable (see _key).
+        nodes (int): Positions expanded since the table was last cleared.
+    """
+
+    def __init__(self, max_table=200000):
+        """
+        Initializes an idle solver.
+
+        Args:
+            max_table (int): Dead positions kept before the table is dropped.
+        """
+        self.max_table = max_table
+        self.top = None
+        self.faces_id = None
+        self.dead = set()
+        self.nodes = 0
+        self.verdict = UNKNOWN
+        self.line = None
+        self.stack = []
+        self.path = []
+
+    # --- ROOT SETUP ---
+
+    def start(self, board):
+        """
+        Makes the board's current position the root of the search.
+
+        Cheap when only a few tiles changed since the previous root: the
+        search state is updated from the tiles removed or put back, the
+        dead-position table is kept, and a known winning line (the last one
+        found, or the board's own solution) is reused when still valid.
+
+        Args:
+            board (Board): The board to analyse. Only read here, never modified.
+        """
+        snapshot = board.snapshot()
+        self.start_position(board.topology, snapshot.faces, snapshot.present(),
+                            faces_id=(board.topology, snapshot.faces), solution=snapshot.solution)
+
+    def start_position(self, topology, faces, present, faces_id=None, solution=None):
+        """
+        Makes an arbitrary position the root of the search.
+
+        Args:
+            topology (LayoutTopology): Neighbour lists of the positions.
+            faces (sequence): (suit, value) of every position.
+            present (bytearray): 1 for positions holding a tile. The solver
+                may take it over and modify it while searching.
+            faces_id (object): Equal for calls sharing the same faces, which
+                keeps the dead-position table. None always starts afresh.
+            solution (list | None): A known winning line from an earlier
+                position with the same faces, reused while it still holds.
+        """
+        if faces_id is None or faces_id != self.faces_id:
+            self._load_faces(topology, faces, faces_id)
+            self._reset_state(present)
+        else:
+            self._move_root(present)
+        for known in (self.line, solution):
+            self.line = surviving_line(known, self.present)
+            if self.line is not None:
+                self.verdict = WINNABLE
+                return
+
+        if self._key() in self.dead:
+            self.verdict = DEAD
+        else:
+            self.verdict = UNKNOWN
+            self.stack = [self._moves()]
+
+    def _move_root(self, present):
+        """
+        Moves the search state to another position with the same faces.
+
+        The search is unwound back to the previous root, then only the
+        positions whose tile was removed or put back since are toggled, so
+        a move costs O(changed tiles) instead of O(board). Large changes
+        (e.g. a loaded game) rebuild the state from scratch.
+        """
+        path = self.path
+        while path:
+            i, j = path.pop()
+            self._restore(j)
+            self._restore(i)
+            self.remaining += 2
+        self.stack = []
+
+        diff = self.mask ^ present_to_mask(present)
+        if bin(diff).count("1") * 64 > len(present):
+            self._reset_state(present)
+            return
+        while diff:
+            low = diff & -diff
+            diff ^= low
+            i = low.bit_length() - 1
+            if present[i]:
+                self._restore(i)
+                self.remaining += 1
+            else:
+                self._remove(i)
+                self.remaining -= 1
+
+    def _load_faces(self, topology, faces, faces_id):
+        """Rebuilds the static tables for a new board or a new set of faces."""
+        self.faces_id = faces_id
+        self.top = topology
+        self.dead = set()
+        self.nodes = 0
+        self.verdict = UNKNOWN
+        self.line = None
+
+        classes = {}
+        self.klass = [classes.setdefault(match_class(suit, value), len(classes))
+                      for suit, value in faces]
+        self.class_count = len(classes)
+        # Moves are tried from the top layers down
+        self.z = [pos[2] for pos in self.top.positions]
+
+        # One Zobrist table per symmetry, over (mirrored position, match class)
+        perms = topology.automorphisms
+        if len(perms) > 1:
+            self.sym_tables = [[zobrist_key(perm[i], k) for i, k in enumerate(self.klass)]
+                               for perm in perms]
+        else:
+            self.sym_tables = None
+
+    def _reset_state(self, present):
+        """Loads a position into the incremental search state."""
+        top = self.top
+        self.present = present
+        self.mask = present_to_mask(present)
+        if self.sym_tables:
+            self.sym_keys = []
+            for table in self.sym_tables:
+                key = 0
+                for i, p in enumerate(present):
+                    if p: key ^= table[i]
+                self.sym_keys.append(key)
+        self.remaining = sum(present)
+        self.stack = []
+        self.path = []
+
+        self.covered = [0] * len(present)
+        for i, p in enumerate(present):
+            if p:
+                for j in top.below[i]: self.covered[j] += 1
+        self.free = {i for i, p in enumerate(present) if p and self._is_free(i)}
+
+        self.left = [0] * self.class_count
+        for i, p in enumerate(present):
+            if p: self.left[self.klass[i]] += 1
+
+    # --- INCREMENTAL MOVES ---
+
+    def _is_free(self, i):
+        """Applies the Board.can_move rule to a present position."""
+        if self.covered[i]: return False
+        top, present = self.top, self.present
+        for j in top.left[i]:
+            if present[j]: break
+        else:
+            return True
+        for j in top.right[i]:
+            if present[j]: return False
+        return True
+
+    def _refresh(self, i):
+        """Updates the free set around position i after it was removed or put back."""
+        top, present, free = self.top, self.present, self.free
+        for k in (i, *top.below[i], *top.left[i], *top.right[i]):
+            if present[k] and self._is_free(k): free.add(k)
+            else: free.discard(k)
+
+    def _moves(self):
+        """
+        Returns an iterator over the pairs worth trying from the current state.
+
+        When every remaining tile of a match class is free, removing two of
+        them cannot hurt any line, so that single move is returned alone.
+        Otherwise pairs are generated lazily, starting from the highest
+        tiles, so a node costs O(free tiles) however many pairs it offers.
+        """
+        klass, z = self.klass, self.z
+        by_class = {}
+        for i in sorted(self.free, key=lambda i: -z[i]):
+            by_class.setdefault(klass[i], []).append(i)
+
+        for k, group in by_class.items():
+            if len(group) > 1 and len(group) == self.left[k]:
+                return iter([(group[0], group[1])])
+        return self._pairs(by_class)
+
+    @staticmethod
+    def _pairs(by_class):
+        """Yields every pair of each class; classes and tiles come highest first."""
+        for group in by_class.values():
+            for a in range(len(group) - 1):
+                for b in range(a + 1, len(group)):
+                    yield group[a], group[b]
+
+    def _key(self):
+        """
+        Transposition key of the current state.
+
+        The bitmask of remaining positions when the layout has no symmetry
+        (exact); otherwise the smallest of the per-symmetry Zobrist hashes.
+        """
+        if self.sym_tables: return min(self.sym_keys)
+        return self.mask
+
+    def _toggle(self, i):
+        self.mask ^= 1 << i
+        if self.sym_tables:
+            keys = self.sym_keys
+            for s, table in enumerate(self.sym_tables):
+                keys[s] ^= table[i]
+
+    def _remove(self, i):
+        self._toggle(i)
+        self.present[i] = 0
+        for j in self.top.below[i]:
+            self.covered[j] -= 1
+        self.left[self.klass[i]] -= 1
+        self._refresh(i)
+
+    def _restore(self, i):
+        for j in self.top.below[i]:
+            self.covered[j] += 1
+        self._toggle(i)
+        self.present[i] = 1
+        self.left[self.klass[i]] += 1
+        self._refresh(i)
+
+    # --- SEARCH ---
+
+    def step(self, budget):
+        """
+        Continues the search for about 'budget' seconds.
+
+        Args:
+            budget (float): Time allowance in seconds.
+
+        Returns:
+            str: The verdict so far (WINNABLE, DEAD or UNKNOWN).
+        """
+        if self.verdict != UNKNOWN or self.top is None: return self.verdict
+        deadline = time.perf_counter() + budget
+        stack, path, dead = self.stack, self.path, self.dead
+
+        while stack:
+            # Checked on every node: a node costs O(free tiles) at most
+            if time.perf_counter() > deadline: break
+
+            move = next(stack[-1], None)
+            if move is None:
+                # Every continuation failed: this position is dead
+                stack.pop()
+                dead.add(self._key())
+                if not path: break
+                i, j = path.pop()
+                self._restore(j)
+                self._restore(i)
+                self.remaining += 2
+                continue
+
+            i, j = move
+            self._remove(i)
+            self._remove(j)
+            self.remaining -= 2
+            path.append((i, j))
+            self.nodes += 1
+
+            if self.remaining == 0:
+                self.verdict = WINNABLE
+                self.line = list(path)
+                return self.verdict
+            if self._key() in dead:
+                stack.append(iter(()))
+            else:
+                stack.append(self._moves())
+
+        if not stack:
+            self.verdict = DEAD
+        if len(dead) > self.max_table:
+            dead.clear()
+        return self.verdict
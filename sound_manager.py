@@ -2,13 +2,14 @@ import pygame
 import os
 
 class SoundManager:
-    def __init__(self):
-        # Inicializar el mezclador de pygame
-        if not pygame.mixer.get_init():
-            pygame.mixer.init()
-        
+    def __init__(self, enabled=True, deferred=False):
+        # Con enabled=False no se toca el mezclador (modo sin audio / headless)
+        # Con deferred=True el mezclador y los efectos esperan a load()
+        # (arranque rápido: se cargan después del primer fotograma)
+        self.enabled = enabled
         self.sounds = {}
         self.music_playing = False
+        self.loaded = False
         
         # Diccionario de archivos esperados
         self.sound_files = {
@@ -22,6 +23,15 @@ class SoundManager:
             "hint": "hint.wav"          # Pista
         }
         
+        if not deferred: self.load()
+
+    def load(self):
+        """Inicializa el mezclador y carga los efectos (solo la primera vez)."""
+        if self.loaded or not self.enabled: return
+        self.loaded = True
+        # Inicializar el mezclador de pygame
+        if not pygame.mixer.get_init():
+            pygame.mixer.init()
         self._load_sounds()
 
     def _load_sounds(self):
@@ -57,6 +67,8 @@ class SoundManager:
         :param filename: Nombre del archivo (ej. 'music.mp3') dentro de assets
         :param volume: Volumen de la música (0.0 a 1.0). Por defecto 0.3 (suave).
         """
+        if not self.enabled: return
+        self.load()
         path = os.path.join("assets", filename)
         
         if os.path.exists(path):
@@ -73,4 +85,4 @@ class SoundManager:
 
     def stop_music(self):
         """Detiene la música."""
-        pygame.mixer.music.stop()
\ No newline at end of file
+        if self.enabled and self.loaded: pygame.mixer.music.stop()
\ No newline at end of file
@@ -0,0 +1,73 @@
+"""
+Spatial Index Module.
+
+This module provides a uniform-grid spatial hash for rectangles in board
+space. The renderer uses it to find the tiles under the viewport or under
+the mouse cursor without scanning the whole board.
+"""
+
+
+class SpatialIndex:
+    """
+    Buckets items by the grid cells their bounding rectangle touches.
+
+    Attributes:
+        cell_size (int): Side length of a grid cell in board-space pixels.
+        buckets (dict): Maps (cell_x, cell_y) to the list of items touching it.
+    """
+
+    def __init__(self, cell_size=128):
+        """
+        Initializes an empty index.
+
+        Args:
+            cell_size (int): Side length of a grid cell. Roughly two tiles
+                wide keeps buckets small without multiplying entries.
+        """
+        self.cell_size = cell_size
+        self.buckets = {}
+
+    def _cells(self, x, y, w, h):
+        """Yields every grid cell touched by the rectangle (x, y, w, h)."""
+        cs = self.cell_size
+        x0, y0 = int(x // cs), int(y // cs)
+        x1, y1 = int((x + w - 1) // cs), int((y + h - 1) // cs)
+        for cx in range(x0, x1 + 1):
+            for cy in range(y0, y1 + 1):
+                yield (cx, cy)
+
+    def insert(self, item, rect):
+        """
+        Adds an item with the given bounding rectangle.
+
+        Args:
+            item: Any hashable object (typically a Tile).
+            rect (tuple): (x, y, width, height) in board space.
+        """
+        for cell in self._cells(*rect):
+            self.buckets.setdefault(cell, []).append(item)
+
+    def query(self, rect):
+        """
+        Returns the items whose cells overlap a rectangle.
+
+        The result may include items that are close to, but not inside, the
+        rectangle; callers needing exact hits should test the item bounds.
+
+        Args:
+            rect (tuple): (x, y, width, height) in board space.
+
+        Returns:
+            set: Candidate items.
+        """
+        found = set()
+        buckets = self.buckets
+        for cell in self._cells(*rect):
+            bucket = buckets.get(cell)
+            if bucket: found.update(bucket)
+        return found
+
+    def query_point(self, x, y):
+        """Returns the items registered in the cell containing a point."""
+        cs = self.cell_size
+        return list(self.buckets.get((int(x // cs), int(y // cs)), ()))
@@ -0,0 +1,262 @@
+"""
+Stats Store Module.
+
+This module keeps one row per finished game (and optionally its moves) in
+a local SQLite database. The UI thread only queues finished games; a
+background thread writes them in batches, one transaction per batch, with
+the database in WAL mode so the stats screen can read while it writes.
+
+Each batch also updates a small summary table (one row per layout and
+difficulty), so totals and win rates are read from a handful of rows and
+the leaderboard from an index, however many games are stored.
+"""
+
+import sqlite3
+import threading
+import time
+
+# The database file, next to the save file
+STATS_FILE = "stats.db"
+
+# --- OUTCOMES ---
+WON = "WON"
+LOST = "LOST"
+
+SCHEMA = """
+CREATE TABLE IF NOT EXISTS games (
+    id INTEGER PRIMARY KEY,
+    finished_at REAL NOT NULL,
+    layout TEXT NOT NULL,
+    difficulty TEXT NOT NULL,
+    seed INTEGER,
+    score INTEGER NOT NULL,
+    duration REAL NOT NULL,
+    moves INTEGER NOT NULL,
+    hints INTEGER NOT NULL,
+    shuffles INTEGER NOT NULL,
+    outcome TEXT NOT NULL
+);
+CREATE INDEX IF NOT EXISTS games_leaderboard ON games (layout, difficulty, score DESC);
+CREATE INDEX IF NOT EXISTS games_outcome ON games (layout, outcome);
+
+CREATE TABLE IF NOT EXISTS moves (
+    game_id INTEGER NOT NULL,
+    n INTEGER NOT NULL,
+    kind TEXT NOT NULL,
+    a INTEGER,
+    b INTEGER,
+    PRIMARY KEY (game_id, n)
+) WITHOUT ROWID;
+
+CREATE TABLE IF NOT EXISTS summary (
+    layout TEXT NOT NULL,
+    difficulty TEXT NOT NULL,
+    played INTEGER NOT NULL,
+    won INTEGER NOT NULL,
+    best_score INTEGER NOT NULL,
+    total_duration REAL NOT NULL,
+    PRIMARY KEY (layout, difficulty)
+) WITHOUT ROWID;
+"""
+
+
+def connect(path):
+    """
+    Opens the database in WAL mode, creating its tables if needed.
+
+    Args:
+        path (str): Database file.
+
+    Returns:
+        sqlite3.Connection: A connection for the calling thread.
+    """
+    conn = sqlite3.connect(path)
+    conn.execute("PRAGMA journal_mode=WAL")
+    # WAL keeps the database consistent on power loss with NORMAL; only
+    # the last batches could be lost
+    conn.execute("PRAGMA synchronous=NORMAL")
+    conn.executescript(SCHEMA)
+    return conn
+
+
+class StatsStore:
+    """
+    Queue of finished games and the thread that writes them.
+
+    Attributes:
+        path (str): Database file.
+        batch_size (int): Games written per transaction at most.
+        flush_interval (float): Seconds the writer waits for a batch to fill.
+        record_moves (bool): Also store each game's moves.
+    """
+
+    def __init__(self, path=None, batch_size=256, flush_interval=1.0, record_moves=True):
+        """
+        Initializes an idle store. Call start() to launch the writer.
+
+        Args:
+            path (str | None): Database file (STATS_FILE when None).
+            batch_size (int): Games per transaction at most.
+            flush_interval (float): Seconds a partial batch may wait.
+            record_moves (bool): Keep the per-move table.
+        """
+        self.path = path or STATS_FILE
+        self.batch_size = batch_size
+        self.flush_interval = flush_interval
+        self.record_moves = record_moves
+        self.lock = threading.Condition()
+        self.queue = []
+        self.writing = False
+        self.thread = None
+        self.running = False
+        self.reader = None
+
+    def record_game(self, game, moves=None):
+        """
+        Queues a finished game. Never blocks on the disk.
+
+        Args:
+            game (dict): layout, difficulty, seed, score, duration (seconds),
+                moves, hints, shuffles and outcome (WON or LOST).
+            moves (list | None): (kind, a, b) per move, in play order.
+        """
+        row = (time.time(), game["layout"], game["difficulty"], game.get("seed"), game["score"],
+               game["duration"], game["moves"], game["hints"], game["shuffles"], game["outcome"])
+        with self.lock:
+            self.queue.append((row, moves if self.record_moves else None))
+            self.lock.notify_all()
+
+    def flush(self):
+        """Waits until every queued game is written (the writer must be running)."""
+        with self.lock:
+            while self.running and (self.queue or self.writing):
+                self.lock.wait()
+
+    # --- BACKGROUND WRITER ---
+
+    def start(self):
+        """Starts the writer thread (a daemon, so it never blocks exit)."""
+        if self.thread: return
+        self.running = True
+        self.thread = threading.Thread(target=self._worker, name="stats-store", daemon=True)
+        self.thread.start()
+
+    def stop(self):
+        """Writes what is still queued, then stops the writer thread."""
+        if not self.thread: return
+        with self.lock:
+            self.running = False
+            self.lock.notify_all()
+        self.thread.join()
+        self.thread = None
+
+    def _worker(self):
+        """Collects queued games into batches and writes each in one transaction."""
+        try:
+            conn = connect(self.path)
+        except sqlite3.Error:
+            # No usable database: statistics are simply not kept
+            with self.lock:
+                self.running = False
+                self.queue = []
+                self.lock.notify_all()
+            return
+        while True:
+            with self.lock:
+                while self.running and not self.queue:
+                    self.lock.wait()
+                # Give a partial batch a moment to fill up
+                deadline = time.monotonic() + self.flush_interval
+                while self.running and len(self.queue) < self.batch_size:
+                    remaining = deadline - time.monotonic()
+                    if remaining <= 0: break
+                    self.lock.wait(remaining)
+                if not self.queue and not self.running: break
+                batch = self.queue[:self.batch_size]
+                del self.queue[:self.batch_size]
+                self.writing = True
+            try:
+                self._write(conn, batch)
+            except sqlite3.Error:
+                pass
+            with self.lock:
+                self.writing = False
+                self.lock.notify_all()
+        conn.close()
+
+    @staticmethod
+    def _write(conn, batch):
+        # The summary rows are updated once per batch, not once per game
+        totals = {}
+        for row, _ in batch:
+            _, layout, difficulty, _, score, duration, _, _, _, outcome = row
+            played, won, best, total = totals.get((layout, difficulty), (0, 0, score, 0.0))
+            totals[(layout, difficulty)] = (played + 1, won + (outcome == WON),
+                                            max(best, score), total + duration)
+        with conn:
+            for row, moves in batch:
+                cur = conn.execute(
+                    "INSERT INTO games (finished_at, layout, difficulty, seed, score, duration, "
+                    "moves, hints, shuffles, outcome) VALUES (?, ?, ?, ?, ?, ?, ?, ?, ?, ?)", row)
+                if moves:
+                    game_id = cur.lastrowid
+                    conn.executemany("INSERT INTO moves (game_id, n, kind, a, b) VALUES (?, ?, ?, ?, ?)",
+                                     [(game_id, n, kind, a, b) for n, (kind, a, b) in enumerate(moves)])
+            conn.executemany(
+                "INSERT INTO summary (layout, difficulty, played, won, best_score, total_duration) "
+                "VALUES (?, ?, ?, ?, ?, ?) "
+                "ON CONFLICT (layout, difficulty) DO UPDATE SET played = played + excluded.played, "
+                "won = won + excluded.won, best_score = max(best_score, excluded.best_score), "
+                "total_duration = total_duration + excluded.total_duration",
+                [key + value for key, value in totals.items()])
+
+    # --- QUERIES (UI thread) ---
+
+    def _read(self, sql, params=()):
+        try:
+            if self.reader is None: self.reader = connect(self.path)
+            return self.reader.execute(sql, params).fetchall()
+        except sqlite3.Error:
+            return []
+
+    def summary(self):
+        """
+        Totals per layout and difficulty, from the summary table.
+
+        Returns:
+            list: (layout, difficulty, played, won, best_score, average
+            duration in seconds) tuples.
+        """
+        return [(layout, difficulty, played, won, best, total / played if played else 0.0)
+                for layout, difficulty, played, won, best, total in self._read(
+                    "SELECT layout, difficulty, played, won, best_score, total_duration "
+                    "FROM summary ORDER BY layout, difficulty")]
+
+    def leaderboard(self, layout, difficulty, limit=10):
+        """
+        Best scores of one layout and difficulty, read through the leaderboard index.
+
+        Returns:
+            list: (score, duration, moves, outcome, finished_at) tuples, best first.
+        """
+        return self._read(
+            "SELECT score, duration, moves, outcome, finished_at FROM games "
+            "WHERE layout = ? AND difficulty = ? ORDER BY score DESC LIMIT ?",
+            (layout, difficulty, limit))
+
+    def win_rate(self, layout):
+        """
+        Share of won games on a layout, all difficulties together.
+
+        Returns:
+            float | None: Between 0 and 1, or None if no game was played.
+        """
+        rows = self._read("SELECT sum(played), sum(won) FROM summary WHERE layout = ?", (layout,))
+        if not rows or not rows[0][0]: return None
+        return rows[0][1] / rows[0][0]
+
+    def close(self):
+        """Closes the UI thread's connection."""
+        if self.reader is not None:
+            self.reader.close()
+            self.reader = None
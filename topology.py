@@ -0,0 +1,426 @@
+"""
+Topology Module.
+
+This module precomputes, for a list of (x, y, z) tile positions, which
+positions lie directly above, below, left and right of each other, using
+the same overlap rules as Board.can_move. With these neighbour lists the
+'is this tile free' question costs a handful of lookups instead of a scan
+over the whole board.
+
+It also builds solvable deals by reverse construction: positions are
+filled two at a time, bottom-up and from the ends of each row inwards,
+so that every newly placed pair would be free at that moment. Played
+backwards, the placement order is a complete solution.
+
+Finally, it detects the mirror symmetries of a layout, so that states
+which are mirror images of each other can share one canonical key.
+"""
+
+import hashlib
+import constants as c
+
+# Zobrist keys, derived from the key itself so they agree across processes
+_ZOBRIST_KEYS = {}
+
+
+def zobrist_key(index, *label):
+    """
+    Returns the 64-bit Zobrist key of a label (e.g. a face) on a position.
+
+    Args:
+        index (int): Position index.
+        *label: What sits on the position, e.g. (suit, value).
+
+    Returns:
+        int: A pseudo-random 64-bit integer, the same in every run.
+    """
+    key = (index,) + label
+    z = _ZOBRIST_KEYS.get(key)
+    if z is None:
+        digest = hashlib.blake2b(repr(key).encode(), digest_size=8).digest()
+        z = _ZOBRIST_KEYS[key] = int.from_bytes(digest, "little")
+    return z
+
+
+# Position masks: bit i of an int is set while position i holds a tile.
+# Conversions go through base-2 digit strings, which CPython handles in
+# linear time; shifting the mask once per position is quadratic.
+_TO_DIGITS = bytes.maketrans(b"\0\1", b"01")
+_FROM_DIGITS = bytes.maketrans(b"01", b"\0\1")
+
+
+def mask_to_present(mask, size):
+    """
+    Unpacks a position mask.
+
+    Args:
+        mask (int): Bit i set while position i holds a tile.
+        size (int): Number of positions.
+
+    Returns:
+        bytearray: present[i] is 1 while position i holds a tile.
+    """
+    return bytearray(format(mask, "b").zfill(size)[::-1].encode().translate(_FROM_DIGITS))[:size]
+
+
+def present_to_mask(present):
+    """Packs a present array (see mask_to_present) into a position mask."""
+    if not present: return 0
+    return int(bytes(present)[::-1].translate(_TO_DIGITS), 2)
+
+
+class LayoutTopology:
+    """
+    Neighbour lists for a fixed set of positions, indexed like the position list.
+
+    Attributes:
+        positions (list): The (x, y, z) coordinates, in board order.
+        above (list): For each position, indices overlapping it on layer z + 1.
+        below (list): For each position, indices overlapping it on layer z - 1.
+        left (list): For each position, same-layer indices touching its left edge.
+        right (list): For each position, same-layer indices touching its right edge.
+    """
+
+    def __init__(self, positions):
+        """
+        Builds the neighbour lists.
+
+        Args:
+            positions (list): (x, y, z) integer grid coordinates.
+        """
+        self.positions = list(positions)
+        self._automorphisms = None
+        n = len(self.positions)
+        self.above = [[] for _ in range(n)]
+        self.below = [[] for _ in range(n)]
+        self.left = [[] for _ in range(n)]
+        self.right = [[] for _ in range(n)]
+
+        index = {pos: i for i, pos in enumerate(self.positions)}
+        w, h = c.TILE_WIDTH, c.TILE_HEIGHT
+
+        for i, (x, y, z) in enumerate(self.positions):
+            for dy in range(1 - h, h):
+                # Overlapping tiles one layer up
+                for dx in range(1 - w, w):
+                    j = index.get((x + dx, y + dy, z + 1))
+                    if j is not None:
+                        self.above[i].append(j)
+                        self.below[j].append(i)
+                # Edge-to-edge neighbour on the right
+                j = index.get((x + w, y + dy, z))
+                if j is not None:
+                    self.right[i].append(j)
+                    self.left[j].append(i)
+
+    def __len__(self):
+        return len(self.positions)
+
+    def is_free(self, i, present):
+        """
+        Applies the Board.can_move rule to position i.
+
+        Args:
+            i (int): Position index.
+            present (list): present[j] is True while position j holds a tile.
+
+        Returns:
+            bool: True if nothing is above and at least one side is open.
+        """
+        for j in self.above[i]:
+            if present[j]: return False
+        for j in self.left[i]:
+            if present[j]: break
+        else:
+            return True
+        for j in self.right[i]:
+            if present[j]: return False
+        return True
+
+    # --- SYMMETRY ---
+
+    @property
+    def automorphisms(self):
+        """
+        Position permutations that map the layout onto itself.
+
+        Only the left/right mirror, the top/bottom mirror and their
+        combination are tried; the free-tile rule treats left and right
+        alike, so each one also preserves which tiles block which.
+        Computed on first use.
+
+        Returns:
+            list: Tuples perm with perm[i] the image of position i. The
+            identity always comes first.
+        """
+        if self._automorphisms is None:
+            n = len(self.positions)
+            found = [tuple(range(n))]
+            if n:
+                index = {pos: i for i, pos in enumerate(self.positions)}
+                xs = [x for x, _, _ in self.positions]
+                ys = [y for _, y, _ in self.positions]
+                cx, cy = min(xs) + max(xs), min(ys) + max(ys)
+                for fx, fy in ((True, False), (False, True), (True, True)):
+                    perm = []
+                    for x, y, z in self.positions:
+                        j = index.get((cx - x if fx else x, cy - y if fy else y, z))
+                        if j is None: break
+                        perm.append(j)
+                    else:
+                        found.append(tuple(perm))
+            self._automorphisms = found
+        return self._automorphisms
+
+    def canonical_key(self, labels):
+        """
+        Hashes a state so that all its mirror images get the same key.
+
+        Args:
+            labels (list): One label tuple per position (e.g. (suit, value)),
+                or None for empty positions.
+
+        Returns:
+            int: The smallest Zobrist hash over the layout's automorphisms.
+        """
+        keys = []
+        for perm in self.automorphisms:
+            key = 0
+            for i, label in enumerate(labels):
+                if label is not None: key ^= zobrist_key(perm[i], *label)
+            keys.append(key)
+        return min(keys)
+
+    # --- REVERSE CONSTRUCTION ---
+
+    def solvable_pairing(self, rng, subset=None, max_restarts=20):
+        """
+        Splits positions into pairs that can be removed in sequence.
+
+        Builds the board backwards: each step places two positions whose
+        supports are already placed and that would both be free once placed,
+        growing every horizontal run as a single block so no empty position
+        is ever trapped between placed ones. Dead ends near the end of the
+        construction are resolved by taking back a few pairs, so the
+        expected cost stays linear in the number of positions.
+
+        Args:
+            rng (random.Random): Source of randomness.
+            subset (iterable | None): Position indices to pair, e.g. the tiles
+                still on the board. Positions outside it count as empty.
+                All positions when None.
+            max_restarts (int): Fresh attempts before giving up.
+
+        Returns:
+            list | None: (i, j) index pairs in removal order (the first pair
+            is free right now), or None if no full pairing was found.
+        """
+        members = list(range(len(self.positions))) if subset is None else sorted(subset)
+        if len(members) % 2: return None
+
+        for _ in range(max_restarts):
+            pairs = _Construction(self, members, rng).run()
+            if pairs is not None:
+                pairs.reverse()
+                return pairs
+        return None
+
+
+class _Construction:
+    """
+    State of one reverse-construction attempt.
+
+    'candidates' holds exactly the positions that may be placed next as far
+    as supports and run growth are concerned; placing a tile only updates
+    its neighbours, and every step can be taken back.
+    """
+
+    def __init__(self, topology, members, rng):
+        self.top = topology
+        self.rng = rng
+        self.total = len(members)
+        n = len(topology)
+        self.in_set = [False] * n
+        for i in members: self.in_set[i] = True
+        self.placed = [False] * n
+
+        # Supports still missing under each member
+        self.missing = [0] * n
+        for i in members:
+            self.missing[i] = sum(1 for j in topology.below[i] if self.in_set[j])
+
+        # Horizontal runs (same layer, joined edge to edge). Each run is
+        # filled as one growing block: two separate blocks in a run would
+        # trap the empty positions between them.
+        self.run_of = [-1] * n
+        self.runs = []
+        for i in members:
+            if self.run_of[i] >= 0: continue
+            self.run_of[i] = len(self.runs)
+            block, stack = [i], [i]
+            while stack:
+                k = stack.pop()
+                for j in topology.left[k] + topology.right[k]:
+                    if self.in_set[j] and self.run_of[j] < 0:
+                        self.run_of[j] = len(self.runs)
+                        block.append(j)
+                        stack.append(j)
+            self.runs.append(block)
+        self.seeded_by = [None] * len(self.runs)
+
+        self.left_in_run = [len(block) for block in self.runs]
+
+        # Longest chain of members stacked on each position. Tall stacks and
+        # long runs can only shrink one tile per pair, so they must not be
+        # left for the end.
+        self.height = [0] * n
+        for i in sorted(members, key=lambda k: -topology.positions[k][2]):
+            self.height[i] = 1 + max((self.height[j] for j in topology.above[i] if self.in_set[j]), default=0)
+
+        self.candidates = []
+        self.slot = {}
+        for i in members:
+            if self._eligible(i): self._add(i)
+
+    # --- CANDIDATE SET ---
+
+    def _add(self, i):
+        self.slot[i] = len(self.candidates)
+        self.candidates.append(i)
+
+    def _drop(self, i):
+        # O(1) removal: the last entry takes the freed slot
+        k = self.slot.pop(i)
+        last = self.candidates.pop()
+        if last != i:
+            self.candidates[k] = last
+            self.slot[last] = k
+
+    def _touches_block(self, i):
+        top, placed = self.top, self.placed
+        for j in top.left[i]:
+            if placed[j]: return True
+        for j in top.right[i]:
+            if placed[j]: return True
+        return False
+
+    def _eligible(self, i):
+        if not self.in_set[i] or self.placed[i] or self.missing[i]: return False
+        return self.seeded_by[self.run_of[i]] is None or self._touches_block(i)
+
+    def _refresh(self, i):
+        """Brings i's candidate membership in line with _eligible."""
+        if self._eligible(i):
+            if i not in self.slot: self._add(i)
+        elif i in self.slot:
+            self._drop(i)
+
+    # --- PLACEMENT ---
+
+    def _side_taken(self, side):
+        for j in side:
+            if self.placed[j]: return True
+        return False
+
+    def _placeable(self, i, partner):
+        """Checks the horizontal rule for placing i (after 'partner', if any)."""
+        top, side_taken = self.top, self._side_taken
+        # i itself must keep an open side...
+        if side_taken(top.left[i]) and side_taken(top.right[i]): return False
+        # ...and must not close the last open side of an empty neighbour or
+        # of the tile it is paired with
+        for j in top.left[i]:
+            if (j == partner or self.in_set[j] and not self.placed[j]) and side_taken(top.left[j]):
+                return False
+        for j in top.right[i]:
+            if (j == partner or self.in_set[j] and not self.placed[j]) and side_taken(top.right[j]):
+                return False
+        return True
+
+    def _pick(self, partner):
+        # A few random probes, keeping the one under the tallest stack;
+        # a full pass from a random start if none of them fits
+        candidates, rng = self.candidates, self.rng
+        count = len(candidates)
+        if count == 0: return None
+        best = None
+        for _ in range(4):
+            i = candidates[rng.randrange(count)]
+            if i != partner and self._placeable(i, partner):
+                if best is None or self._urgency(i) > self._urgency(best): best = i
+        if best is not None: return best
+        start = rng.randrange(count)
+        for k in range(count):
+            i = candidates[(start + k) % count]
+            if i != partner and self._placeable(i, partner): return i
+        return None
+
+    def _urgency(self, i):
+        return self.height[i] + self.left_in_run[self.run_of[i]]
+
+    def _place(self, i):
+        top = self.top
+        self.placed[i] = True
+        self.left_in_run[self.run_of[i]] -= 1
+        self._drop(i)
+        run = self.run_of[i]
+        if self.seeded_by[run] is None:
+            self.seeded_by[run] = i
+            for j in self.runs[run]: self._refresh(j)
+        for j in top.left[i]: self._refresh(j)
+        for j in top.right[i]: self._refresh(j)
+        for j in top.above[i]:
+            if self.in_set[j]:
+                self.missing[j] -= 1
+                self._refresh(j)
+
+    def _unplace(self, i):
+        top = self.top
+        self.placed[i] = False
+        self.left_in_run[self.run_of[i]] += 1
+        for j in top.above[i]:
+            if self.in_set[j]:
+                self.missing[j] += 1
+                self._refresh(j)
+        run = self.run_of[i]
+        if self.seeded_by[run] == i:
+            self.seeded_by[run] = None
+            for j in self.runs[run]: self._refresh(j)
+        for j in top.left[i]: self._refresh(j)
+        for j in top.right[i]: self._refresh(j)
+        self._refresh(i)
+
+    def run(self):
+        """
+        Places every member, two at a time.
+
+        Returns:
+            list | None: Pairs in placement order, or None on a dead end
+            the take-back budget could not resolve.
+        """
+        pairs = []
+        budget = self.total
+        while 2 * len(pairs) < self.total:
+            first = self._pick(None)
+            second = None
+            if first is not None:
+                self._place(first)
+                # Tiles unlocked by 'first' may not be its partner: they
+                # would sit on top of it
+                above = [j for j in self.top.above[first] if j in self.slot]
+                for j in above: self._drop(j)
+                second = self._pick(first)
+                for j in above: self._add(j)
+                if second is None: self._unplace(first)
+            if second is None:
+                # Dead end: take back a few pairs and try another way
+                if budget <= 0 or not pairs: return None
+                for _ in range(min(len(pairs), self.rng.randint(1, 3))):
+                    a, b = pairs.pop()
+                    budget -= 1
+                    self._unplace(b)
+                    self._unplace(a)
+                continue
+            self._place(second)
+            pairs.append((first, second))
+        return pairs